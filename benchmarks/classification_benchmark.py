@@ -0,0 +1,81 @@
+"""
+Events per second classified from a stream mixing 8 event types, by trying
+`may_be` of every type, by an EventTypeRegistry, and when decoding stored json.
+"""
+
+import time
+from typing import Callable, Dict, List, Literal, Type
+
+from cloudevents.conversion import from_json
+from pydantic import BaseModel, create_model
+
+from venty.classification import EventTypeRegistry, may_be
+from venty.cloudevent import CloudEvent, dump_structured_json
+
+_TYPES = 8
+_EVENTS = 20_000
+
+
+class Order(BaseModel):
+    order: int
+    amount: float
+
+
+def _event_type(i: int) -> Type[CloudEvent]:
+    type_ = f"order.event-{i}"
+    return create_model(
+        f"OrderEvent{i}",
+        __base__=CloudEvent,
+        type=(Literal[type_], type_),
+        data=(Order, ...),
+    )
+
+
+_EVENT_TYPES = [_event_type(i) for i in range(_TYPES)]
+
+
+def _legacy_may_be(type_: Type[CloudEvent], value: CloudEvent):
+    if value.type == type_.__fields__["type"].default:
+        return type_.parse_obj(value.dict())
+    return None
+
+
+def _measure(name: str, classify: Callable[[object], object], values: List) -> None:
+    start = time.perf_counter()
+    for value in values:
+        classify(value)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {len(values) / elapsed:>10.0f} events/s")
+
+
+def _first(values) -> object:
+    return next(v for v in values if v is not None)
+
+
+def main() -> None:
+    events = [
+        CloudEvent.create(
+            {"type": f"order.event-{i % _TYPES}", "source": "orders"},
+            {"order": i, "amount": i * 1.5},
+        )
+        for i in range(_EVENTS)
+    ]
+    encoded = [dump_structured_json(e) for e in events]
+    registry = EventTypeRegistry(_EVENT_TYPES)
+    _measure(
+        "legacy may_be",
+        lambda e: _first(_legacy_may_be(t, e) for t in _EVENT_TYPES),
+        events,
+    )
+    _measure("may_be", lambda e: _first(may_be(t, e) for t in _EVENT_TYPES), events)
+    _measure("registry classify", registry.classify, events)
+    _measure(
+        "from_json + classify",
+        lambda v: registry.classify(from_json(CloudEvent, v)),
+        encoded,
+    )
+    _measure("registry decode", registry.decode, encoded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Events per second serialized to json by the single pass serializers, against
+the cloudevents conversion and the pydantic serialization they replaced.
+"""
+
+import json
+import time
+from typing import Callable
+
+import pydantic_core
+from cloudevents.conversion import to_json
+
+from venty import cloudevent
+from venty.cloudevent import CloudEvent, dump_event_json, dump_structured_json
+
+_EVENTS = 20_000
+
+
+def _event(i: int) -> CloudEvent:
+    return CloudEvent.create(
+        {"type": "order.created", "source": "orders", "subject": f"order-{i}"},
+        {"order": i, "items": [{"sku": "a", "quantity": 2, "price": 9.99}] * 5},
+    )
+
+
+def _legacy_event_json(event: CloudEvent) -> str:
+    return pydantic_core.to_json(json.loads(to_json(event))).decode()
+
+
+def _measure(name: str, serialize: Callable[[CloudEvent], object]) -> None:
+    events = [_event(i) for i in range(_EVENTS)]
+    start = time.perf_counter()
+    for event in events:
+        serialize(event)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {_EVENTS / elapsed:>10.0f} events/s")
+
+
+def main() -> None:
+    _measure("to_json", to_json)
+    _measure("dump_structured_json", dump_structured_json)
+    _measure("legacy event json", _legacy_event_json)
+    _measure("dump_event_json", dump_event_json)
+    try:
+        import orjson
+    except ImportError:
+        return
+    cloudevent.orjson = orjson
+    cloudevent.JSON_BACKEND = "orjson"
+    _measure("dump_event_json orjson", dump_event_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Records per second of the VentyFormatter, against the formatting it replaced
+which round tripped every record through json three times.
+"""
+
+import logging
+import time
+from logging import LogRecord
+from typing import Callable
+
+from pythonjsonlogger.jsonlogger import JsonFormatter
+
+from venty.event_logger import VentyFormatter
+from venty.event_logger_test import legacy_format
+from venty.event_producer import SimpleEventProducer
+
+_RECORDS = 20_000
+
+
+def _record(i: int) -> LogRecord:
+    result = LogRecord(
+        "service.requests", logging.INFO, __file__, 1, "handled %s", (i,), None
+    )
+    result.__dict__.update(
+        {"path": "/orders", "status": 200, "duration_ms": 12.5, "user": {"id": i}}
+    )
+    return result
+
+
+def _measure(name: str, format_: Callable[[LogRecord], str]) -> None:
+    records = [_record(i) for i in range(_RECORDS)]
+    start = time.perf_counter()
+    for record in records:
+        format_(record)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} {_RECORDS / elapsed:>10.0f} records/s")
+
+
+def main() -> None:
+    producer = SimpleEventProducer(source="benchmark")
+    formatter = JsonFormatter()
+    _measure("legacy", lambda r: legacy_format(formatter, producer, r))
+    _measure("direct", VentyFormatter(event_producer=producer).format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Events per second of producing a batch of events one by one, against producing
+them together with `produce_events`.
+"""
+
+import time
+from typing import Callable, Dict, List, Literal
+
+from venty.cloudevent import CloudEvent
+from venty.event_producer import SimpleEventProducer
+
+_EVENTS = 50_000
+
+
+class OrderCreated(CloudEvent):
+    type: Literal["order.created"] = "order.created"
+    data: Dict[str, int]
+
+
+def _measure(name: str, produce: Callable[[List[Dict[str, int]]], list]) -> None:
+    datas = [{"order": i, "amount": i * 10} for i in range(_EVENTS)]
+    start = time.perf_counter()
+    produce(datas)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<11} {_EVENTS / elapsed:>10.0f} events/s")
+
+
+def main() -> None:
+    producer = SimpleEventProducer(
+        source="benchmark", default_attributes={"subject": "orders"}
+    )
+    _measure(
+        "one by one",
+        lambda datas: [producer.produce_event(OrderCreated, d) for d in datas],
+    )
+    _measure("bulk", lambda datas: producer.produce_events(OrderCreated, datas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Per event overhead of producing through an EventProducerStack, with every
+thread inside its own scope, against calling the scoped producer directly.
+"""
+
+import threading
+import time
+from typing import Literal
+
+from venty.cloudevent import CloudEvent
+from venty.event_producer import EventProducer, SimpleEventProducer
+from venty.event_producer_stack import EventProducerStack
+
+_THREADS = (1, 4, 16)
+_EVENTS = 20_000
+_LOOKUPS = 1_000_000
+
+
+class OrderCreated(CloudEvent):
+    type: Literal["order.created"] = "order.created"
+
+
+def _produce(producer: EventProducer, events: int) -> None:
+    for i in range(events):
+        producer.produce_event(OrderCreated, i)
+
+
+def _scoped(stack: EventProducerStack, events: int) -> None:
+    with stack.scoped_event_producer(SimpleEventProducer(source="scoped")):
+        _produce(stack, events)
+
+
+def _measure(name: str, threads: int, target, producer) -> float:
+    workers = [
+        threading.Thread(target=target, args=(producer, _EVENTS // threads))
+        for _ in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<6} {threads:>3} threads {_EVENTS / elapsed:>10.0f} events/s")
+    return elapsed / _EVENTS
+
+
+def main() -> None:
+    stack = EventProducerStack(SimpleEventProducer(source="default"))
+    for threads in _THREADS:
+        direct = _measure("direct", threads, _produce, SimpleEventProducer())
+        scoped = _measure("stack", threads, _scoped, stack)
+        print(f"overhead {(scoped - direct) * 1e6:>6.2f} us/event")
+    with stack.scoped_event_producer(SimpleEventProducer(source="scoped")):
+        start = time.perf_counter()
+        for _ in range(_LOOKUPS):
+            stack.event_producer
+        elapsed = time.perf_counter() - start
+    print(f"top of stack {elapsed / _LOOKUPS * 1e9:>6.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
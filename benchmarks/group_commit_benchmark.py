@@ -0,0 +1,82 @@
+"""
+Append latency and throughput of many threads appending single events to a
+SQLite backed SqlEventStore, directly and through a GroupCommitEventStore.
+"""
+
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from venty.cloudevent import CloudEvent
+from venty.event_store import EventStore, StreamState, append_events
+from venty.group_commit_event_store import GroupCommitEventStore
+from venty.sql_event_store import Base, SqlEventStore
+from venty.strong_types import StreamName
+
+_THREADS = (1, 2, 4, 8, 16, 32, 64)
+_APPENDS = 1_000
+
+
+def _appender(store: EventStore, thread: int, appends: int, latencies: List[float]):
+    stream_name = StreamName(f"stream-{thread}")
+    for i in range(appends):
+        event = CloudEvent.create(
+            {"type": "order.created", "source": "benchmark"}, {"order": i}
+        )
+        start = time.perf_counter()
+        append_events(
+            store, stream_name, expected_version=StreamState.ANY, events=[event]
+        )
+        latencies.append(time.perf_counter() - start)
+
+
+def _measure(name: str, threads: int, directory: Path) -> None:
+    engine = create_engine(
+        f"sqlite:///{directory / f'{name}-{threads}.db'}",
+        connect_args={"timeout": 60},
+        pool_size=threads,
+    )
+    Base.metadata.create_all(engine)
+    store: EventStore = SqlEventStore(sessionmaker(engine), CloudEvent)
+    if name == "group":
+        store = GroupCommitEventStore(store)
+    latencies: List[float] = []
+    workers = [
+        threading.Thread(
+            target=_appender, args=(store, i, _APPENDS // threads, latencies)
+        )
+        for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    if isinstance(store, GroupCommitEventStore):
+        store.close()
+    engine.dispose()
+    percentiles = statistics.quantiles(latencies, n=100)
+    p50, p99 = percentiles[49], percentiles[98]
+    print(
+        f"{name:<7} {threads:>3} threads "
+        f"{len(latencies) / elapsed:>8.0f} appends/s "
+        f"p50 {p50 * 1e3:>7.2f} ms p99 {p99 * 1e3:>7.2f} ms"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in _THREADS:
+            for name in ("direct", "group"):
+                _measure(name, threads, Path(directory))
+
+
+if __name__ == "__main__":
+    main()
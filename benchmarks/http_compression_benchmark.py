@@ -0,0 +1,86 @@
+"""
+Bytes on the wire and cpu cost per event of the HttpEventChannel compression,
+for repetitive json payloads.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from venty.cloudevent import CloudEvent
+from venty.event_channel import publish_events
+from venty.http_event_channel import ContentEncoding, HttpChannelMode, HttpEventChannel
+
+_EVENTS = 10_000
+_BATCH_EVENTS = 100
+
+
+class _Response:
+    def raise_for_status(self) -> None:
+        return None
+
+
+class _CountingSession:
+    """
+    Stands in for `requests.Session`, so only the encoding cost is measured.
+    """
+
+    def __init__(self):
+        self.sent_bytes = 0
+
+    def post(self, url: str, body: bytes, headers: Dict[str, str]) -> _Response:
+        self.sent_bytes += len(body)
+        return _Response()
+
+
+def _events(amount: int) -> List[CloudEvent]:
+    return [
+        CloudEvent.create(
+            {"type": "order.created", "source": "benchmark", "subject": str(i)},
+            {
+                "customer": {"name": "venty", "tier": "gold"},
+                "lines": [
+                    {"sku": f"sku-{j}", "quantity": 1, "price": 9.99} for j in range(20)
+                ],
+            },
+        )
+        for i in range(amount)
+    ]
+
+
+def _measure(
+    events: List[CloudEvent],
+    mode: HttpChannelMode,
+    encoding: Optional[ContentEncoding],
+    level: int,
+) -> None:
+    session = _CountingSession()
+    channel = HttpEventChannel(
+        "http://localhost",
+        session,
+        mode,
+        max_batch_events=_BATCH_EVENTS,
+        content_encoding=encoding,
+        compression_level=level,
+    )
+    start = time.process_time()
+    publish_events(events, channel)
+    cpu = time.process_time() - start
+    name = "none" if encoding is None else f"{encoding.value}-{level}"
+    print(
+        f"{mode.value:<10} {name:<10} "
+        f"{session.sent_bytes / len(events):>10.1f} bytes/event "
+        f"{cpu / len(events) * 1e6:>10.1f} us/event"
+    )
+
+
+def main() -> None:
+    events = _events(_EVENTS)
+    for mode in (HttpChannelMode.STRUCTURED, HttpChannelMode.BATCH):
+        _measure(events, mode, None, 0)
+        for encoding in ContentEncoding:
+            for level in (1, 6, 9):
+                _measure(events, mode, encoding, level)
+
+
+if __name__ == "__main__":
+    main()
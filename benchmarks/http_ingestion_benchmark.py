@@ -0,0 +1,103 @@
+"""
+Local load test of the IngestionApp: concurrent clients publish over http to a
+threaded WSGI server which group commits into a SQLite backed SqlEventStore.
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import List
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from requests import Session
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from venty.cloudevent import CloudEvent
+from venty.event_channel import publish_events
+from venty.http_event_channel import HttpChannelMode, HttpEventChannel
+from venty.http_ingestion import IngestionApp
+from venty.sql_event_store import Base, SqlEventStore
+from venty.strong_types import StreamName
+
+_CLIENTS = (1, 8, 32)
+_REQUESTS_PER_CLIENT = 100
+_BATCH_EVENTS = 10
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _events(client: int, amount: int) -> List[CloudEvent]:
+    return [
+        CloudEvent.create(
+            {"type": "order.created", "source": "benchmark", "subject": str(client)},
+            {"order": i, "lines": [{"sku": "sku-1", "quantity": 1}]},
+        )
+        for i in range(amount)
+    ]
+
+
+def _client(url: str, client: int, mode: HttpChannelMode) -> None:
+    amount = 1 if mode == HttpChannelMode.STRUCTURED else _BATCH_EVENTS
+    with Session() as session:
+        channel = HttpEventChannel(url, session, mode, max_batch_events=_BATCH_EVENTS)
+        for _ in range(_REQUESTS_PER_CLIENT):
+            publish_events(_events(client, amount), channel)
+
+
+def _measure(clients: int, mode: HttpChannelMode, directory: Path) -> None:
+    engine = create_engine(f"sqlite:///{directory / f'{mode.value}-{clients}.db'}")
+    Base.metadata.create_all(engine)
+    app = IngestionApp(
+        SqlEventStore(sessionmaker(engine), CloudEvent),
+        lambda e: StreamName(f"client-{e['subject']}"),
+    )
+    server = make_server(
+        "127.0.0.1",
+        0,
+        app,
+        server_class=_ThreadingWSGIServer,
+        handler_class=_QuietHandler,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    threads = [
+        threading.Thread(target=_client, args=(url, i, mode)) for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+    app.close()
+    requests = clients * _REQUESTS_PER_CLIENT
+    events = requests * (1 if mode == HttpChannelMode.STRUCTURED else _BATCH_EVENTS)
+    print(
+        f"{mode.value:<10} {clients:>3} clients "
+        f"{requests / elapsed:>8.0f} requests/s "
+        f"{events / elapsed:>8.0f} events/s"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in (HttpChannelMode.STRUCTURED, HttpChannelMode.BATCH):
+            for clients in _CLIENTS:
+                _measure(clients, mode, Path(directory))
+
+
+if __name__ == "__main__":
+    main()
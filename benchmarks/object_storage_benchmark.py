@@ -0,0 +1,56 @@
+"""
+Put and get latency of FsObjectStorage filled with many objects, in the flat and
+the sharded layout.
+
+The amount of objects is the first argument, 10^6 by default, which needs about
+4 GB of disk space for the file system blocks of each layout.
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from venty.object_storage import FsLayout, FsObjectStorage
+
+_GETS = 10_000
+_VALUE = b"x" * 100
+
+
+def _percentiles(name: str, latencies: List[float]) -> None:
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<12} p50 {percentiles[49] * 1e6:>8.1f} us "
+        f"p99 {percentiles[98] * 1e6:>8.1f} us"
+    )
+
+
+def _measure(layout: FsLayout, objects: int, directory: Path) -> None:
+    storage = FsObjectStorage(directory / layout.value, layout=layout)
+    puts = []
+    for i in range(objects):
+        start = time.perf_counter()
+        storage.put(f"key-{i}", _VALUE)
+        puts.append(time.perf_counter() - start)
+    gets = []
+    for i in random.sample(range(objects), min(_GETS, objects)):
+        start = time.perf_counter()
+        storage.get(f"key-{i}")
+        gets.append(time.perf_counter() - start)
+    print(f"{layout.value} with {objects} objects")
+    _percentiles("put", puts)
+    _percentiles("random get", gets)
+
+
+def main() -> None:
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    with tempfile.TemporaryDirectory() as directory:
+        for layout in FsLayout:
+            _measure(layout, objects, Path(directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Memory and time of hashing a large object of FsObjectStorage read with get,
+compared with open_read mapping it, written with put_stream.
+
+The object size in MiB is the first argument, 1024 by default.
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from hashlib import sha256
+from pathlib import Path
+
+from venty.object_storage import FsObjectStorage
+
+_CHUNK = b"x" * (1024 * 1024)
+
+
+def _measure(name: str, read) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    read()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {elapsed:>7.3f} s, peak allocation {peak / 2**20:>8.1f} MiB")
+
+
+def main() -> None:
+    mebibytes = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    with tempfile.TemporaryDirectory() as directory:
+        storage = FsObjectStorage(Path(directory))
+        _measure(
+            "put_stream",
+            lambda: storage.put_stream("big", (_CHUNK for _ in range(mebibytes))),
+        )
+
+        def _open_read():
+            with storage.open_read("big") as view:
+                sha256(view).hexdigest()
+
+        _measure("get", lambda: sha256(storage.get("big")).hexdigest())
+        _measure("open_read", _open_read)
+
+
+if __name__ == "__main__":
+    main()
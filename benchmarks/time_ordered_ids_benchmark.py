@@ -0,0 +1,49 @@
+"""
+Rows per second inserted into an indexed SQLite column, with random uuid4 ids
+against time ordered UUIDv7 and ULID ids. Random keys land all over the index,
+time ordered keys are appended to its right edge.
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from venty.event_producer import bulk_uuid4
+from venty.time_ordered_ids import ulid, uuid7
+
+_ROWS = 1_000_000
+_BATCH = 1_000
+
+
+def _measure(name: str, ids: Callable[[int], List[str]], directory: Path) -> None:
+    connection = sqlite3.connect(directory / f"{name}.db")
+    # a small page cache, as when the index outgrows the memory of the database
+    connection.execute("PRAGMA cache_size = -2000")
+    connection.execute("CREATE TABLE events (id TEXT NOT NULL, data TEXT)")
+    connection.execute("CREATE UNIQUE INDEX events_id ON events (id)")
+    start = time.perf_counter()
+    for _ in range(_ROWS // _BATCH):
+        with connection:
+            connection.executemany(
+                "INSERT INTO events VALUES (?, ?)",
+                ((id_, "{}") for id_ in ids(_BATCH)),
+            )
+    elapsed = time.perf_counter() - start
+    connection.close()
+    print(f"{name:<6} {_ROWS / elapsed:>10.0f} rows/s")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for name, ids in (
+            ("uuid4", bulk_uuid4),
+            ("uuid7", uuid7.bulk),
+            ("ulid", ulid.bulk),
+        ):
+            _measure(name, ids, Path(directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import timedelta
+from multiprocessing import Manager
+from queue import Empty, Queue
+from typing import Callable, Iterable, List, Optional, Type
+
+from venty.aggregate_root import AggregateRoot, AggregateUUID
+from venty.aggregate_store import AggregateStore, _aggregate_stream
+from venty.event_store import EventStore, key_partition
+
+_PROGRESS_POLL_INTERVAL = timedelta(seconds=0.1)
+
+
+@dataclass(frozen=True)
+class RebuildProgress:
+    partition: int
+    aggregates: int
+    events: int
+    elapsed: timedelta
+    done: bool = False
+
+    @property
+    def events_per_second(self) -> float:
+        seconds = self.elapsed.total_seconds()
+        if seconds == 0:
+            return 0.0
+        return self.events / seconds
+
+
+def _partition_uuids(
+    uuids: Iterable[AggregateUUID], partitions: int
+) -> List[List[AggregateUUID]]:
+    result: List[List[AggregateUUID]] = [[] for _ in range(partitions)]
+    for uuid in uuids:
+        result[key_partition(_aggregate_stream(uuid), partitions)].append(uuid)
+    return result
+
+
+def _ignore_aggregate(_: AggregateRoot) -> None:
+    return None
+
+
+def _ignore_progress(_: RebuildProgress) -> None:
+    return None
+
+
+def _rebuild_partition(
+    partition: int,
+    uuids: List[AggregateUUID],
+    store_factory: Callable[[], EventStore],
+    aggregate_cls: Type[AggregateRoot],
+    on_rebuilt: Callable[[AggregateRoot], None],
+    page_size: Optional[int],
+    progress_queue: "Queue[RebuildProgress]",
+    progress_every: int,
+) -> RebuildProgress:
+    # every worker process opens its own connection to the event store
+    aggregate_store = AggregateStore(store_factory(), page_size=page_size)
+    start = time.monotonic()
+    aggregates = 0
+    events = 0
+
+    def _progress(done: bool) -> RebuildProgress:
+        return RebuildProgress(
+            partition=partition,
+            aggregates=aggregates,
+            events=events,
+            elapsed=timedelta(seconds=time.monotonic() - start),
+            done=done,
+        )
+
+    for uuid in uuids:
+        aggregate = aggregate_store.load(aggregate_cls, uuid)
+        on_rebuilt(aggregate)
+        aggregates += 1
+        events += aggregate.aggregate_version() + 1
+        if aggregates % progress_every == 0:
+            progress_queue.put(_progress(done=False))
+    result = _progress(done=True)
+    progress_queue.put(result)
+    return result
+
+
+def _drain(
+    progress_queue: "Queue[RebuildProgress]",
+    on_progress: Callable[[RebuildProgress], None],
+) -> None:
+    while True:
+        try:
+            on_progress(progress_queue.get_nowait())
+        except Empty:
+            return
+
+
+def rebuild_aggregates(
+    store_factory: Callable[[], EventStore],
+    aggregate_cls: Type[AggregateRoot],
+    uuids: Iterable[AggregateUUID],
+    *,
+    on_rebuilt: Callable[[AggregateRoot], None] = _ignore_aggregate,
+    on_progress: Callable[[RebuildProgress], None] = _ignore_progress,
+    partitions: Optional[int] = None,
+    page_size: Optional[int] = None,
+    progress_every: int = 1000,
+) -> List[RebuildProgress]:
+    """
+    Rehydrates every given aggregate, partitioning the aggregate streams by hash
+    across a process pool.
+
+    :param store_factory: called once inside every worker process to open its own
+        event store connection. Must be picklable, for example a module level
+        function or a `functools.partial` of one.
+    :param on_rebuilt: called inside the worker process with every loaded
+        aggregate, use it to validate the aggregate or rebuild derived state.
+        Must be picklable.
+    :param on_progress: called in the calling process every `progress_every`
+        aggregates of a partition, and once when a partition is done.
+    :param partitions: amount of worker processes, defaults to the cpu count.
+    :param page_size: see `AggregateStore`.
+    :return: the final progress of every non-empty partition.
+    """
+    if partitions is None:
+        partitions = os.cpu_count() or 1
+    partitioned = _partition_uuids(uuids, partitions)
+    with Manager() as manager, ProcessPoolExecutor(partitions) as executor:
+        progress_queue = manager.Queue()
+        futures = [
+            executor.submit(
+                _rebuild_partition,
+                partition,
+                partition_uuids,
+                store_factory,
+                aggregate_cls,
+                on_rebuilt,
+                page_size,
+                progress_queue,
+                progress_every,
+            )
+            for partition, partition_uuids in enumerate(partitioned)
+            if partition_uuids
+        ]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=_PROGRESS_POLL_INTERVAL.total_seconds())
+            _drain(progress_queue, on_progress)
+        return [future.result() for future in futures]
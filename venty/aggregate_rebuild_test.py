@@ -0,0 +1,84 @@
+from datetime import timedelta
+from functools import partial
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from venty.aggregate_rebuild import (
+    RebuildProgress,
+    _partition_uuids,
+    rebuild_aggregates,
+)
+from venty.aggregate_store import AggregateStore
+from venty.aggregate_store_test import Book, _book_uuid
+from venty.cloudevent import CloudEvent
+from venty.sql_event_store import Base, SqlEventStore
+
+
+def _sqlite_event_store(url: str) -> SqlEventStore:
+    return SqlEventStore(sessionmaker(create_engine(url)), CloudEvent)
+
+
+def _assert_checked_out(book: Book) -> None:
+    assert book.checked_out_by == "Alice"
+
+
+def _titles(amount: int):
+    return [f"book-{i}" for i in range(amount)]
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'events.db'}"
+    Base.metadata.create_all(create_engine(url))
+    library = AggregateStore(_sqlite_event_store(url))
+    for title in _titles(20):
+        book = Book.create(title)
+        book.check_out("Alice")
+        library.store(book)
+    return url
+
+
+def test_partition_uuids_must_keep_every_uuid_exactly_once():
+    uuids = [_book_uuid(title) for title in _titles(100)]
+    partitioned = _partition_uuids(uuids, 4)
+    assert len(partitioned) == 4
+    assert sorted(u for p in partitioned for u in p) == sorted(uuids)
+
+
+def test_rebuild_aggregates_from_sqlite_file(sqlite_url):
+    progress = []
+    results = rebuild_aggregates(
+        partial(_sqlite_event_store, sqlite_url),
+        Book,
+        [_book_uuid(title) for title in _titles(20)],
+        on_rebuilt=_assert_checked_out,
+        on_progress=progress.append,
+        partitions=2,
+        page_size=1,
+        progress_every=5,
+    )
+    assert sum(r.aggregates for r in results) == 20
+    assert sum(r.events for r in results) == 40
+    assert all(r.done for r in results)
+    assert {p for p in progress if p.done} == set(results)
+    assert any(not p.done for p in progress)
+
+
+def test_rebuild_errors_must_propagate(sqlite_url):
+    with pytest.raises(AssertionError):
+        rebuild_aggregates(
+            partial(_sqlite_event_store, sqlite_url),
+            Book,
+            [_book_uuid("never-checked-out")],
+            on_rebuilt=_assert_checked_out,
+            partitions=1,
+        )
+
+
+def test_events_per_second():
+    assert (
+        RebuildProgress(0, 1, 10, elapsed=timedelta(seconds=2)).events_per_second == 5
+    )
+    assert RebuildProgress(0, 0, 0, elapsed=timedelta(0)).events_per_second == 0
@@ -1,12 +1,17 @@
 from contextlib import contextmanager
-from typing import Type
+from itertools import chain
+from typing import Type, Optional, Iterable
 from uuid import UUID, uuid5
 
 from venty.cloudevent import CloudEvent
 from pydantic import Field
 
 from venty import EventStore
-from venty.event_store import append_events, read_stream_no_metadata
+from venty.event_store import (
+    append_events,
+    read_stream_no_metadata,
+    read_stream_pages,
+)
 from venty.aggregate_root import AggregateRoot, AggregateUUID, AggregateRootT
 from venty.strong_types import StreamName
 
@@ -16,8 +21,14 @@ def _aggregate_stream(uuid: AggregateUUID) -> StreamName:
 
 
 class AggregateStore:
-    def __init__(self, event_store: EventStore):
+    def __init__(self, event_store: EventStore, *, page_size: Optional[int] = None):
+        """
+        :param page_size: when given, aggregates are loaded in pages of this many
+            events, so loading a large aggregate has a fixed memory ceiling.
+            Otherwise, the whole stream is read at once.
+        """
         self._event_store = event_store
+        self._page_size = page_size
 
     def store(self, aggregate: AggregateRoot):
         if uncommitted_changes := aggregate.uncommitted_changes():
@@ -29,17 +40,26 @@ class AggregateStore:
             )
             aggregate.mark_changes_as_committed()
 
-    def load(
-        self, aggregate_cls: Type[AggregateRootT], uuid: AggregateUUID
-    ) -> AggregateRootT:
-        result: AggregateRoot = aggregate_cls()
-        result.load_from_history(
-            read_stream_no_metadata(
+    def _history(self, uuid: AggregateUUID) -> Iterable[CloudEvent]:
+        if self._page_size is None:
+            return read_stream_no_metadata(
                 self._event_store,
                 _aggregate_stream(uuid),
                 stream_position=None,
             )
+        return chain.from_iterable(
+            read_stream_pages(
+                self._event_store,
+                _aggregate_stream(uuid),
+                page_size=self._page_size,
+            )
         )
+
+    def load(
+        self, aggregate_cls: Type[AggregateRootT], uuid: AggregateUUID
+    ) -> AggregateRootT:
+        result: AggregateRoot = aggregate_cls()
+        result.load_from_history(self._history(uuid))
         return result
 
 
@@ -1,11 +1,17 @@
 from typing import Optional
 from uuid import UUID, uuid5
 
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
 from venty.cloudevent import CloudEvent
 
 from venty.aggregate_store import AggregateStore
 from venty.aggregate_root import AggregateUUID, AggregateRoot
+from venty.event_store import EventStore
 from venty.in_memory_event_store import InMemoryEventStore
+from venty.sql_event_store import Base, SqlEventStore
 
 _BOOKS_NAMESPACE = UUID("c3ec5a4e-5e4f-44bf-ac40-bfb6c52cbdf6")
 
@@ -65,3 +71,30 @@ def test_store_integration():
     second_load = library.load(Book, _book_uuid(the_idiot))
 
     assert second_load.checked_out_by == "Alice"
+
+
+@pytest.fixture(params=["in-memory", "sql"])
+def event_store(request, tmp_path) -> EventStore:
+    if request.param == "in-memory":
+        return InMemoryEventStore()
+    # a file, as pages are read from another thread than an in memory sqlite
+    engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+    Base.metadata.create_all(engine)
+    return SqlEventStore(sessionmaker(engine), CloudEvent)
+
+
+def test_paged_load_must_apply_the_whole_history(event_store):
+    the_idiot = "The Idiot"
+    book = Book.create(the_idiot)
+    for patron in ("Alice", "Bob", "Carol", "Dave"):
+        book.check_out(patron)
+        book.return_book()
+    book.check_out("Eve")
+    AggregateStore(event_store).store(book)
+
+    loaded_book = AggregateStore(event_store, page_size=3).load(
+        Book, _book_uuid(the_idiot)
+    )
+    assert loaded_book.name == the_idiot
+    assert loaded_book.checked_out_by == "Eve"
+    assert loaded_book.aggregate_version() == 9
@@ -1,4 +1,4 @@
-from typing import Optional, Any, Type, Dict
+from typing import Optional, Any, Type, Dict, Iterable, List
 from venty.event_producer import EventProducer, AttributeValue
 from venty.strong_types import CloudEventT
 
@@ -16,10 +16,28 @@ class AuthEventProducer(EventProducer):
         *,
         attributes: Optional[Dict[str, AttributeValue]] = None
     ) -> CloudEventT:
+        return self._parent.produce_event(
+            type_, data, attributes=self._with_auth(attributes)
+        )
+
+    def produce_events(
+        self,
+        type_: Type[CloudEventT],
+        datas: Iterable[Optional[Any]],
+        *,
+        attributes: Optional[Dict[str, AttributeValue]] = None
+    ) -> List[CloudEventT]:
+        return self._parent.produce_events(
+            type_, datas, attributes=self._with_auth(attributes)
+        )
+
+    def _with_auth(
+        self, attributes: Optional[Dict[str, AttributeValue]]
+    ) -> Dict[str, AttributeValue]:
         if attributes is None:
             attributes = {}
         if ("authid" not in attributes) and ("authtype" not in attributes):
             # https://github.com/cloudevents/spec/blob/main/cloudevents/extensions/authcontext.md
             attributes["authid"] = self._authid
             attributes["authtype"] = self._authtype
-        return self._parent.produce_event(type_, data, attributes=attributes)
+        return attributes
@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+from typing import Callable, Deque, Iterable, List, Optional
+
+from cloudevents.abstract import CloudEvent
+
+from venty.event_channel import EventChannel, _ignore_error, _report_error
+
+
+class OverflowPolicy(Enum):
+    """
+    What to do with a published event when the buffer is full.
+    """
+
+    BLOCK = "BLOCK"
+    DROP_OLDEST = "DROP_OLDEST"
+    DROP_NEWEST = "DROP_NEWEST"
+    RAISE = "RAISE"
+
+
+class BufferFull(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class BufferedChannelMetrics:
+    queue_depth: int
+    published_events: int
+    dropped_events: int
+    flushes: int
+    failed_flushes: int
+    last_flush_latency: Optional[timedelta]
+    max_flush_latency: Optional[timedelta]
+
+
+def _as_timedelta(seconds: Optional[float]) -> Optional[timedelta]:
+    if seconds is None:
+        return None
+    return timedelta(seconds=seconds)
+
+
+class BufferedEventChannel(EventChannel):
+    """
+    Publishes to the wrapped channel from a background worker, so a slow channel
+    does not add to the latency of the publisher.
+
+    A batch is published once `max_batch_size` events are buffered, or once the
+    first buffered event waited for `linger`.
+    Errors of the wrapped channel are passed to `on_error` and the failed batch is
+    dropped.
+    Call `close` to publish the remaining events and stop the worker.
+    """
+
+    def __init__(
+        self,
+        channel: EventChannel,
+        *,
+        max_batch_size: int = 100,
+        linger: timedelta = timedelta(milliseconds=50),
+        max_queue_size: int = 10000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        on_error: Callable[[Exception], None] = _ignore_error,
+    ):
+        if max_batch_size <= 0 or max_queue_size <= 0:
+            raise ValueError("venty.InvalidBufferSize")
+        self._channel = channel
+        self._max_batch_size = max_batch_size
+        self._linger = linger.total_seconds()
+        self._max_queue_size = max_queue_size
+        self._overflow_policy = overflow_policy
+        self._on_error = on_error
+
+        self._queue: Deque[CloudEvent] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._flush_requests = 0
+        self._closed = False
+
+        self._published_events = 0
+        self._dropped_events = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._last_flush_latency: Optional[float] = None
+        self._max_flush_latency: Optional[float] = None
+
+        self._worker = threading.Thread(
+            target=self._run, name="venty-buffered-channel", daemon=True
+        )
+        self._worker.start()
+
+    def _assert_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("venty.ChannelClosed")
+
+    def _enqueue(self, event: CloudEvent) -> None:
+        while len(self._queue) >= self._max_queue_size:
+            if self._overflow_policy == OverflowPolicy.DROP_OLDEST:
+                self._queue.popleft()
+                self._dropped_events += 1
+            elif self._overflow_policy == OverflowPolicy.DROP_NEWEST:
+                self._dropped_events += 1
+                return
+            elif self._overflow_policy == OverflowPolicy.RAISE:
+                raise BufferFull()
+            else:
+                self._condition.wait()
+                self._assert_open()
+        self._queue.append(event)
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        with self._condition:
+            self._assert_open()
+            for event in events:
+                self._enqueue(event)
+                if len(self._queue) in (1, self._max_batch_size):
+                    # wake the worker to start lingering or to publish a batch
+                    self._condition.notify_all()
+
+    def _batch_ready(self, deadline: Optional[float]) -> bool:
+        return (
+            self._closed
+            or self._flush_requests > 0
+            or len(self._queue) >= self._max_batch_size
+            or (deadline is not None and time.monotonic() >= deadline)
+        )
+
+    def _next_batch(self) -> Optional[List[CloudEvent]]:
+        with self._condition:
+            deadline: Optional[float] = None
+            while not (self._queue and self._batch_ready(deadline)):
+                if self._closed and not self._queue:
+                    return None
+                if not self._queue:
+                    deadline = None
+                    self._condition.wait()
+                    continue
+                if deadline is None:
+                    deadline = time.monotonic() + self._linger
+                self._condition.wait(max(deadline - time.monotonic(), 0))
+            amount = min(len(self._queue), self._max_batch_size)
+            batch = [self._queue.popleft() for _ in range(amount)]
+            self._in_flight = len(batch)
+            # wake publishers blocked on a full buffer
+            self._condition.notify_all()
+            return batch
+
+    def _publish_batch(self, batch: List[CloudEvent]) -> None:
+        start = time.perf_counter()
+        try:
+            self._channel.publish(batch)
+        except Exception as e:
+            failed = True
+            _report_error(self._on_error, e)
+        else:
+            failed = False
+        latency = time.perf_counter() - start
+        with self._condition:
+            self._flushes += 1
+            if failed:
+                self._failed_flushes += 1
+            else:
+                self._published_events += len(batch)
+            self._last_flush_latency = latency
+            self._max_flush_latency = max(self._max_flush_latency or 0, latency)
+            self._in_flight = 0
+            # wake `flush` callers
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            self._publish_batch(batch)
+
+    def flush(self, timeout: Optional[timedelta] = None) -> bool:
+        """
+        Blocks until every event buffered before the call was published.
+
+        :return: False if the timeout was reached first.
+        """
+        with self._condition:
+            self._flush_requests += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(
+                    lambda: not self._queue and self._in_flight == 0,
+                    None if timeout is None else timeout.total_seconds(),
+                )
+            finally:
+                self._flush_requests -= 1
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+
+    @property
+    def metrics(self) -> BufferedChannelMetrics:
+        with self._condition:
+            return BufferedChannelMetrics(
+                queue_depth=len(self._queue),
+                published_events=self._published_events,
+                dropped_events=self._dropped_events,
+                flushes=self._flushes,
+                failed_flushes=self._failed_flushes,
+                last_flush_latency=_as_timedelta(self._last_flush_latency),
+                max_flush_latency=_as_timedelta(self._max_flush_latency),
+            )
@@ -0,0 +1,204 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Iterable
+
+import pytest
+from cloudevents.abstract import CloudEvent
+
+from venty.buffered_event_channel import (
+    BufferedEventChannel,
+    BufferFull,
+    OverflowPolicy,
+)
+from venty.event_channel import EventChannel
+from venty.in_memory_event_channel import InMemoryEventChannel
+from venty.strong_types_test import dummy_events
+
+
+class _GatedEventChannel(InMemoryEventChannel):
+    """
+    Blocks every publish until the gate is opened.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.batches = []
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        self.gate.wait()
+        events = list(events)
+        self.batches.append(events)
+        super().publish(events)
+
+
+class _FailingEventChannel(EventChannel):
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        raise ConnectionError("sink is down")
+
+
+def test_flush_must_publish_all_buffered_events():
+    sink = InMemoryEventChannel()
+    channel = BufferedEventChannel(sink, linger=timedelta(hours=1))
+    events = list(dummy_events(10))
+    channel.publish(events)
+    assert channel.flush()
+    assert list(sink.published_events) == events
+    assert channel.metrics.published_events == 10
+    assert channel.metrics.queue_depth == 0
+    channel.close()
+
+
+def test_must_publish_once_linger_passed():
+    sink = InMemoryEventChannel()
+    channel = BufferedEventChannel(sink, linger=timedelta(milliseconds=10))
+    events = list(dummy_events(3))
+    channel.publish(events)
+    deadline = time.monotonic() + 5
+    while len(sink.published_events) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert list(sink.published_events) == events
+    channel.close()
+
+
+def test_must_publish_in_batches_of_max_batch_size():
+    sink = _GatedEventChannel()
+    channel = BufferedEventChannel(sink, max_batch_size=4, linger=timedelta(hours=1))
+    channel.publish(dummy_events(10))
+    sink.gate.set()
+    channel.close()
+    assert [len(batch) for batch in sink.batches] == [4, 4, 2]
+
+
+def test_close_must_publish_remaining_events_and_reject_new_ones():
+    sink = InMemoryEventChannel()
+    channel = BufferedEventChannel(sink, linger=timedelta(hours=1))
+    channel.publish(dummy_events(5))
+    channel.close()
+    assert len(sink.published_events) == 5
+    with pytest.raises(RuntimeError, match="venty.ChannelClosed"):
+        channel.publish(dummy_events(1))
+
+
+def test_raise_policy_must_raise_when_buffer_is_full():
+    sink = _GatedEventChannel()
+    channel = BufferedEventChannel(
+        sink,
+        max_batch_size=1,
+        max_queue_size=2,
+        overflow_policy=OverflowPolicy.RAISE,
+    )
+    channel.publish(dummy_events(1))  # taken by the worker which is now blocked
+    while channel.metrics.queue_depth:
+        time.sleep(0.01)
+    channel.publish(dummy_events(2))
+    with pytest.raises(BufferFull):
+        channel.publish(dummy_events(1))
+    sink.gate.set()
+    channel.close()
+    assert len(sink.published_events) == 3
+
+
+def test_drop_oldest_policy_must_drop_oldest_events():
+    sink = _GatedEventChannel()
+    channel = BufferedEventChannel(
+        sink,
+        max_batch_size=1,
+        max_queue_size=2,
+        overflow_policy=OverflowPolicy.DROP_OLDEST,
+    )
+    events = list(dummy_events(5))
+    channel.publish(events[:1])
+    while channel.metrics.queue_depth:
+        time.sleep(0.01)
+    channel.publish(events[1:])
+    assert channel.metrics.dropped_events == 2
+    sink.gate.set()
+    channel.close()
+    assert list(sink.published_events) == [events[0], events[3], events[4]]
+
+
+def test_drop_newest_policy_must_drop_events_published_to_a_full_buffer():
+    sink = _GatedEventChannel()
+    channel = BufferedEventChannel(
+        sink,
+        max_batch_size=1,
+        max_queue_size=2,
+        overflow_policy=OverflowPolicy.DROP_NEWEST,
+    )
+    events = list(dummy_events(5))
+    channel.publish(events[:1])
+    while channel.metrics.queue_depth:
+        time.sleep(0.01)
+    channel.publish(events[1:])
+    assert channel.metrics.dropped_events == 2
+    sink.gate.set()
+    channel.close()
+    assert list(sink.published_events) == events[:3]
+
+
+def test_block_policy_must_block_publisher_until_buffer_has_room():
+    sink = _GatedEventChannel()
+    channel = BufferedEventChannel(sink, max_batch_size=1, max_queue_size=1)
+    channel.publish(dummy_events(1))
+    while channel.metrics.queue_depth:
+        time.sleep(0.01)
+    channel.publish(dummy_events(1))
+    publisher = threading.Thread(target=channel.publish, args=(dummy_events(1),))
+    publisher.start()
+    publisher.join(timeout=0.1)
+    assert publisher.is_alive()
+    sink.gate.set()
+    publisher.join(timeout=5)
+    assert not publisher.is_alive()
+    channel.close()
+    assert len(sink.published_events) == 3
+
+
+def test_errors_must_be_reported_and_counted():
+    errors = []
+    channel = BufferedEventChannel(_FailingEventChannel(), on_error=errors.append)
+    channel.publish(dummy_events(3))
+    channel.flush()
+    assert len(errors) == 1
+    assert channel.metrics.failed_flushes == 1
+    assert channel.metrics.published_events == 0
+    channel.close()
+
+
+def test_raising_error_handler_must_not_stop_the_worker():
+    def _on_error(error: Exception) -> None:
+        raise RuntimeError("handler failed")
+
+    channel = BufferedEventChannel(_FailingEventChannel(), on_error=_on_error)
+    for _ in range(2):
+        channel.publish(dummy_events(3))
+        assert channel.flush(timeout=timedelta(seconds=5))
+    assert channel.metrics.failed_flushes == 2
+    channel.close()
+
+
+def test_flush_latency_must_be_measured():
+    sink = InMemoryEventChannel()
+    channel = BufferedEventChannel(sink)
+    assert channel.metrics.last_flush_latency is None
+    channel.publish(dummy_events(3))
+    channel.flush()
+    assert channel.metrics.last_flush_latency is not None
+    assert channel.metrics.max_flush_latency >= channel.metrics.last_flush_latency
+    channel.close()
+
+
+def test_flush_may_time_out():
+    sink = _GatedEventChannel()
+    channel = BufferedEventChannel(sink)
+    channel.publish(dummy_events(1))
+    assert not channel.flush(timeout=timedelta(milliseconds=50))
+    sink.gate.set()
+    channel.close()
+
+
+def test_buffer_sizes_must_be_positive():
+    with pytest.raises(ValueError, match="venty.InvalidBufferSize"):
+        BufferedEventChannel(InMemoryEventChannel(), max_queue_size=0)
@@ -0,0 +1,241 @@
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import timedelta
+from hashlib import sha256
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import pydantic_core
+from cloudevents.abstract import CloudEvent
+from pydantic import BaseModel, PrivateAttr
+
+from venty.cloudevent import CloudEvent as PydanticCloudEvent
+from venty.event_store import (
+    AppendRequest,
+    EventStore,
+    ExpectedVersion,
+    ReadInstruction,
+    RecordedEvent,
+    StreamState,
+)
+from venty.object_storage import ObjectStorage
+from venty.strong_types import CommitPosition, StreamName, StreamVersion
+
+# the object storage key of the offloaded data
+CLAIM_CHECK_EXTENSION = "claimcheck"
+# how the offloaded data is encoded, json or binary
+CLAIM_CHECK_ENCODING_EXTENSION = "claimcheckencoding"
+_JSON = "json"
+_BINARY = "binary"
+
+
+def _encode_data(data: Any) -> Tuple[bytes, str]:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data), _BINARY
+    if isinstance(data, BaseModel):
+        return data.model_dump_json(exclude_none=True).encode(), _JSON
+    return pydantic_core.to_json(data, inf_nan_mode="null"), _JSON
+
+
+def _extension(event: CloudEvent, name: str) -> Any:
+    if isinstance(event, BaseModel):
+        # item access of pydantic events builds all of their attributes
+        return (event.__pydantic_extra__ or {}).get(name)
+    return event.get(name)
+
+
+def _decode_data(payload: bytes, encoding: str) -> Any:
+    if encoding == _BINARY:
+        return payload
+    return pydantic_core.from_json(payload)
+
+
+class ClaimCheckedCloudEvent(PydanticCloudEvent):
+    """
+    An event whose data is loaded from the object storage the first time it is
+    accessed.
+    """
+
+    _load_data: Optional[Callable[[], Any]] = PrivateAttr(default=None)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called while the data is not loaded, it is missing from __dict__
+        if name == "data" and self._load_data is not None:
+            self.__dict__["data"] = self._load_data()
+            return self.__dict__["data"]
+        return super().__getattr__(name)
+
+    @property
+    def is_data_loaded(self) -> bool:
+        return "data" in self.__dict__
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        self.get_data()
+        return super().model_dump(**kwargs)
+
+    def __eq__(self, other: Any) -> bool:
+        self.get_data()
+        if isinstance(other, ClaimCheckedCloudEvent):
+            other.get_data()
+        return super().__eq__(other)
+
+
+class _PayloadCache:
+    """
+    The most recently used payloads, up to `max_bytes` bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._payloads: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if (result := self._payloads.get(key)) is not None:
+                self._payloads.move_to_end(key)
+            return result
+
+    def put(self, key: str, payload: bytes) -> None:
+        if len(payload) > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._payloads:
+                return
+            self._payloads[key] = payload
+            self._size += len(payload)
+            while self._size > self._max_bytes:
+                _, evicted = self._payloads.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class ClaimCheckEventStore(EventStore):
+    """
+    Offloads the data of events bigger than `threshold_bytes` to an object
+    storage, under the sha256 of the encoded data, appending the event with only
+    a `claimcheck` extension referencing it. Identical data is stored once.
+
+    Read events which were offloaded are `ClaimCheckedCloudEvent`s loading their
+    data when it is accessed, so reads which do not touch the data never load it.
+    The wrapped event store must be able to read events without data, such as a
+    `SqlEventStore` of the generic `CloudEvent`.
+
+    :param cache_max_bytes: the loaded payloads kept in memory, 0 disables the
+        cache.
+    """
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        storage: ObjectStorage,
+        *,
+        threshold_bytes: int = 256 * 1024,
+        cache_max_bytes: int = 0,
+    ):
+        if threshold_bytes < 0 or cache_max_bytes < 0:
+            raise ValueError("venty.InvalidClaimCheckLimits")
+        self._event_store = event_store
+        self._storage = storage
+        self._threshold_bytes = threshold_bytes
+        self._cache = _PayloadCache(cache_max_bytes) if cache_max_bytes else None
+
+    def _offload(self, event: CloudEvent) -> CloudEvent:
+        data = event.get_data()
+        if data is None:
+            return event
+        payload, encoding = _encode_data(data)
+        if len(payload) <= self._threshold_bytes:
+            return event
+        key = f"sha256:{sha256(payload).hexdigest()}"
+        if not self._storage.exists(key):
+            self._storage.put(key, payload)
+        claim_check = {
+            CLAIM_CHECK_EXTENSION: key,
+            CLAIM_CHECK_ENCODING_EXTENSION: encoding,
+        }
+        if isinstance(event, BaseModel):
+            # not validated, so event types requiring data can be offloaded
+            return event.model_copy(update={"data": None, **claim_check})
+        return type(event).create({**event._get_attributes(), **claim_check}, None)
+
+    def _load(self, key: str, encoding: str) -> Any:
+        payload = None if self._cache is None else self._cache.get(key)
+        if payload is None:
+            payload = self._storage.get(key)
+            if self._cache is not None:
+                self._cache.put(key, payload)
+        return _decode_data(payload, encoding)
+
+    def _claim_checked(self, event: CloudEvent) -> CloudEvent:
+        key = _extension(event, CLAIM_CHECK_EXTENSION)
+        if key is None or event.get_data() is not None:
+            return event
+        encoding = _extension(event, CLAIM_CHECK_ENCODING_EXTENSION) or _JSON
+        result = ClaimCheckedCloudEvent.create(event._get_attributes(), None)
+        del result.__dict__["data"]
+        result._load_data = lambda: self._load(key, encoding)
+        return result
+
+    def attempt_append_events(
+        self,
+        stream_name: StreamName,
+        *,
+        expected_version: ExpectedVersion,
+        events: Iterable[CloudEvent],
+        timeout: Optional[timedelta] = None,
+    ) -> Optional[CommitPosition]:
+        return self._event_store.attempt_append_events(
+            stream_name,
+            expected_version=expected_version,
+            events=[self._offload(event) for event in events],
+            timeout=timeout,
+        )
+
+    def attempt_append_batch(
+        self,
+        requests: Sequence[AppendRequest],
+        *,
+        timeout: Optional[timedelta] = None,
+    ) -> List[Optional[CommitPosition]]:
+        return self._event_store.attempt_append_batch(
+            [
+                replace(request, events=[self._offload(e) for e in request.events])
+                for request in requests
+            ],
+            timeout=timeout,
+        )
+
+    def read_streams(
+        self,
+        instructions: Dict[StreamName, ReadInstruction],
+        *,
+        backwards: bool = False,
+        timeout: Optional[timedelta] = None,
+    ) -> Iterable[RecordedEvent]:
+        for recorded in self._event_store.read_streams(
+            instructions, backwards=backwards, timeout=timeout
+        ):
+            event = self._claim_checked(recorded.event)
+            yield (
+                recorded if event is recorded.event else replace(recorded, event=event)
+            )
+
+    def commit_position(self) -> CommitPosition:
+        return self._event_store.commit_position()
+
+    def current_version(
+        self, stream_name: StreamName, *, timeout: Optional[timedelta] = None
+    ) -> Optional[Union[StreamVersion, Literal[StreamState.NO_STREAM]]]:
+        return self._event_store.current_version(stream_name, timeout=timeout)
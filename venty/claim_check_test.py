@@ -0,0 +1,153 @@
+from typing import Dict, List, Literal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from venty.claim_check import (
+    CLAIM_CHECK_EXTENSION,
+    ClaimCheckEventStore,
+    ClaimCheckedCloudEvent,
+)
+from venty.cloudevent import CloudEvent
+from venty.event_store import StreamState, append_events, read_stream_no_metadata
+from venty.in_memory_event_store import InMemoryEventStore
+from venty.object_storage import FsObjectStorage, ObjectStorage
+from venty.sql_event_store import Base, SqlEventStore
+from venty.strong_types_test import MY_STREAM_NAME, YOUR_STREAM_NAME
+
+
+class _RecordingObjectStorage(ObjectStorage):
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+        self.puts: List[str] = []
+        self.gets: List[str] = []
+
+    def put(self, key: str, value: bytes):
+        self.puts.append(key)
+        self.objects[key] = value
+
+    def get(self, key: str) -> bytes:
+        self.gets.append(key)
+        return self.objects[key]
+
+    def exists(self, key: str) -> bool:
+        return key in self.objects
+
+    def delete(self, key: str) -> None:
+        self.objects.pop(key, None)
+
+
+class BigOrder(CloudEvent):
+    type: Literal["order.big"] = "order.big"
+    data: Dict[str, str]
+
+
+def _event(data, **attributes) -> CloudEvent:
+    return CloudEvent.create({"type": "order", "source": "s", **attributes}, data)
+
+
+def _append(store, *events, stream_name=MY_STREAM_NAME):
+    append_events(
+        store, stream_name, expected_version=StreamState.ANY, events=list(events)
+    )
+
+
+def _read(store, stream_name=MY_STREAM_NAME):
+    return list(read_stream_no_metadata(store, stream_name, stream_position=None))
+
+
+def test_small_events_must_be_appended_as_they_are():
+    inner = InMemoryEventStore()
+    storage = _RecordingObjectStorage()
+    store = ClaimCheckEventStore(inner, storage, threshold_bytes=100)
+    small = _event({"a": "b"})
+    _append(store, small)
+    assert _read(inner) == [small]
+    assert _read(store)[0] is small
+    assert storage.puts == []
+
+
+def test_big_data_must_be_offloaded_and_loaded_on_access():
+    inner = InMemoryEventStore()
+    storage = _RecordingObjectStorage()
+    store = ClaimCheckEventStore(inner, storage, threshold_bytes=100)
+    big = _event({"payload": "x" * 200}, subject="order-1")
+    _append(store, big)
+
+    (stored,) = _read(inner)
+    assert stored.data is None
+    assert storage.objects[stored[CLAIM_CHECK_EXTENSION]] == (
+        b'{"payload":"' + b"x" * 200 + b'"}'
+    )
+
+    (read,) = _read(store)
+    assert isinstance(read, ClaimCheckedCloudEvent)
+    assert (read.id, read.subject) == (big.id, "order-1")
+    assert not read.is_data_loaded
+    assert storage.gets == []
+    assert read.data == big.data
+    assert read.is_data_loaded
+    assert read.model_dump()["data"] == big.data
+
+
+def test_binary_and_typed_data_must_be_offloaded():
+    inner = InMemoryEventStore()
+    store = ClaimCheckEventStore(inner, _RecordingObjectStorage(), threshold_bytes=10)
+    binary = _event(b"\x00" * 20)
+    typed = BigOrder.create({"source": "s"}, {"payload": "x" * 20})
+    _append(store, binary, typed)
+    assert [e.data for e in _read(inner)] == [None, None]
+    assert [e.get_data() for e in _read(store)] == [binary.data, typed.data]
+
+
+def test_identical_data_must_be_stored_once():
+    storage = _RecordingObjectStorage()
+    store = ClaimCheckEventStore(InMemoryEventStore(), storage, threshold_bytes=10)
+    _append(store, _event({"payload": "x" * 20}))
+    _append(store, _event({"payload": "x" * 20}), stream_name=YOUR_STREAM_NAME)
+    assert len(storage.puts) == 1
+
+
+def test_cache_must_keep_the_most_recently_loaded_payloads():
+    storage = _RecordingObjectStorage()
+    store = ClaimCheckEventStore(
+        InMemoryEventStore(), storage, threshold_bytes=10, cache_max_bytes=70
+    )
+    first = _event({"payload": "a" * 20})
+    second = _event({"payload": "b" * 20})
+    _append(store, first, second)
+    for _ in range(2):
+        assert [e.data for e in _read(store)] == [first.data, second.data]
+    assert len(storage.gets) == 2
+    third = _event({"payload": "c" * 20})
+    _append(store, third)
+    assert [e.data for e in _read(store)][-1] == third.data
+    assert _read(store)[0].data == first.data  # evicted by the third payload
+    assert len(storage.gets) == 4
+
+
+def test_sql_event_store_must_keep_only_the_reference(tmp_path):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    store = ClaimCheckEventStore(
+        SqlEventStore(sessionmaker(engine), CloudEvent),
+        FsObjectStorage(tmp_path),
+        threshold_bytes=1024,
+    )
+    big = _event({"payload": "x" * 10_000})
+    _append(store, big)
+    with engine.connect() as connection:
+        (row,) = connection.exec_driver_sql(
+            "SELECT event FROM venty_recorded_events_v2"
+        )
+    assert len(row[0]) < 1024
+    (read,) = _read(store)
+    assert read.data == big.data
+
+
+def test_limits_must_not_be_negative():
+    with pytest.raises(ValueError, match="venty.InvalidClaimCheckLimits"):
+        ClaimCheckEventStore(
+            InMemoryEventStore(), _RecordingObjectStorage(), threshold_bytes=-1
+        )
@@ -1,17 +1,42 @@
-from typing import Optional, TypeVar, Any, Type, List
+from functools import lru_cache
+from typing import Optional, TypeVar, Any, Type, List, Dict, Iterable, Mapping, Union
 
-from venty.cloudevent import CloudEvent
+import pydantic_core
+from cloudevents.abstract import CloudEvent as AbstractCloudEvent
+from cloudevents.conversion import from_dict
+from pydantic import BaseModel
 
+from venty.cloudevent import CloudEvent, from_structured_dict
+from venty.strong_types import CloudEventT
 
 T = TypeVar("T")
 
 
+@lru_cache(maxsize=None)
+def _event_type_string(type_: Type[CloudEvent]) -> Any:
+    return type_.model_fields["type"].default
+
+
+def _convert(type_: Type[CloudEventT], value: AbstractCloudEvent) -> CloudEventT:
+    """
+    Validates the fields of `value` as a `type_`, without dumping it first.
+    """
+    if not isinstance(value, BaseModel):
+        return from_dict(type_, {**value._get_attributes(), "data": value.get_data()})
+    fields = dict(value.__dict__)
+    if value.__pydantic_extra__:
+        fields.update(value.__pydantic_extra__)
+    if isinstance(fields["data"], BaseModel):
+        fields["data"] = fields["data"].model_dump()
+    return type_.model_validate(fields)
+
+
 def may_be(type_: Type[T], value: Any) -> Optional[T]:
     if isinstance(value, type_):
         return value
     if issubclass(type_, CloudEvent):
-        if value.type == type_.__fields__["type"].default:
-            return type_.parse_obj(value.dict())
+        if value.type == _event_type_string(type_):
+            return _convert(type_, value)
     return None
 
 
@@ -28,3 +53,62 @@ def must_be_list_of(type_: Type[T], value: Any) -> List[T]:
 
 def is_any_instance_of(type_: Type[T], values: List[Any]) -> bool:
     return any(isinstance(value, type_) for value in values)
+
+
+class EventTypeRegistry:
+    """
+    Maps event type strings to the CloudEvent subclasses whose `type` field
+    defaults to them, such as `type: Literal["order.created"] = "order.created"`.
+
+    Events of types which are not registered are decoded as `default_event_type`.
+    """
+
+    def __init__(
+        self,
+        event_types: Iterable[Type[CloudEvent]] = (),
+        *,
+        default_event_type: Type[CloudEvent] = CloudEvent,
+    ):
+        self._event_types: Dict[str, Type[CloudEvent]] = {}
+        self._default_event_type = default_event_type
+        for event_type in event_types:
+            self.register(event_type)
+
+    def register(self, event_type: Type[CloudEventT]) -> Type[CloudEventT]:
+        """
+        Can also be used as a class decorator.
+        """
+        type_ = _event_type_string(event_type)
+        if not isinstance(type_, str):
+            raise ValueError("venty.MissingEventTypeDefault")
+        if self._event_types.setdefault(type_, event_type) is not event_type:
+            raise ValueError("venty.DuplicateEventType")
+        return event_type
+
+    def event_type_of(self, type_: Optional[str]) -> Type[CloudEvent]:
+        return self._event_types.get(type_, self._default_event_type)
+
+    def classify(self, event: AbstractCloudEvent) -> AbstractCloudEvent:
+        """
+        :return: the event as its registered subclass, or as is when its type is
+            not registered.
+        """
+        # item access of pydantic events builds all of their attributes
+        type_ = event.type if isinstance(event, BaseModel) else event["type"]
+        event_type = self._event_types.get(type_)
+        if event_type is None or isinstance(event, event_type):
+            return event
+        return _convert(event_type, event)
+
+    def from_dict(self, value: Mapping[str, Any]) -> CloudEvent:
+        """
+        Decodes a structured content mode dict as its registered subclass.
+        """
+        return from_structured_dict(self.event_type_of(value.get("type")), value)
+
+    def decode(self, value: Union[str, bytes]) -> CloudEvent:
+        """
+        Decodes structured content mode json as its registered subclass, can be
+        used as the `event_decoder` of a `SqlEventStore`.
+        """
+        return self.from_dict(pydantic_core.from_json(value))
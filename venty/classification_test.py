@@ -1,10 +1,17 @@
 from typing import Literal
 
 import pytest
-from venty.cloudevent import CloudEvent
+from cloudevents.conversion import from_json
+from venty.cloudevent import CloudEvent, dump_structured_json
 from pydantic import BaseModel
 
-from venty.classification import may_be, must_be, must_be_list_of, is_any_instance_of
+from venty.classification import (
+    EventTypeRegistry,
+    may_be,
+    must_be,
+    must_be_list_of,
+    is_any_instance_of,
+)
 
 
 class MyData(BaseModel):
@@ -50,3 +57,58 @@ def test_is_any_instance_of():
     assert is_any_instance_of(int, [1, 2, 3])
     assert is_any_instance_of(int, [1, 2, "3"])
     assert not is_any_instance_of(str, [1, 2, 3.0])
+
+
+class YourEvent(CloudEvent):
+    type: Literal["your_event"] = "your_event"
+
+
+_REGISTRY = EventTypeRegistry([MyEvent, YourEvent])
+
+
+def test_may_be_must_equal_validating_the_dumped_event():
+    event = CloudEvent.create(
+        {"type": "my_event", "source": "my-source", "subject": "s", "ext": "e"},
+        {"x": "42"},
+    )
+    assert may_be(MyEvent, event) == MyEvent.parse_obj(event.dict())
+    assert may_be(YourEvent, event) is None
+
+
+def test_registry_must_classify_by_type():
+    mine = CloudEvent.create({"type": "my_event", "source": "s"}, {"x": "1"})
+    other = CloudEvent.create({"type": "other", "source": "s"}, None)
+    classified = _REGISTRY.classify(mine)
+    assert isinstance(classified, MyEvent)
+    assert classified.data == MyData(x=1)
+    assert _REGISTRY.classify(classified) is classified
+    assert _REGISTRY.classify(other) is other
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        MyEvent.create({"source": "s", "ext": "e"}, MyData(x=1)),
+        CloudEvent.create({"type": "your_event", "source": "s"}, b"\x00binary"),
+        CloudEvent.create({"type": "other", "source": "s"}, {"y": 2}),
+    ],
+)
+def test_registry_must_decode_json_as_the_registered_type(event):
+    encoded = dump_structured_json(event)
+    expected_type = _REGISTRY.event_type_of(event["type"])
+    decoded = _REGISTRY.decode(encoded)
+    assert type(decoded) is expected_type
+    assert decoded == from_json(expected_type, encoded)
+    assert _REGISTRY.decode(encoded.decode()) == decoded
+
+
+def test_registry_must_reject_ambiguous_types():
+    class MyOtherEvent(CloudEvent):
+        type: Literal["my_event"] = "my_event"
+
+    registry = EventTypeRegistry([MyEvent])
+    registry.register(MyEvent)
+    with pytest.raises(ValueError, match="venty.DuplicateEventType"):
+        registry.register(MyOtherEvent)
+    with pytest.raises(ValueError, match="venty.MissingEventTypeDefault"):
+        registry.register(CloudEvent)
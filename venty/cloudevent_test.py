@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import pydantic_core
+import pytest
+from cloudevents.conversion import to_json
+from cloudevents.http import CloudEvent as HttpCloudEvent
+from pydantic import BaseModel
+
+from venty import cloudevent
+from venty.cloudevent import (
+    CloudEvent,
+    dump_event_json,
+    dump_structured_json,
+    structured_dict,
+)
+
+
+class Order(BaseModel):
+    order: int
+    note: Optional[str] = None
+
+
+def _event(data: Any, **attributes: Any) -> CloudEvent:
+    return CloudEvent.create(
+        {
+            "type": "order.created",
+            "source": "orders",
+            "id": "1",
+            "time": datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+            **attributes,
+        },
+        data,
+    )
+
+
+_JSON_EVENTS = [
+    _event(None),
+    _event({"order": 1, "items": [{"sku": "a", "price": 9.99}], "paid": True}),
+    _event("plain text", datacontenttype="text/plain"),
+    _event([1, 2.5, None, 1e16, -0.0], subject="order-1", dataschema="urn:order"),
+    _event({"note": "é </script>   \x00"}, partitionkey="p", sequence=7),
+    _event(b"\x00\x01binary"),
+    _event({"order": 1}, time=datetime(2024, 1, 1)),
+    HttpCloudEvent({"type": "order.created", "source": "orders"}, {"order": 1}),
+]
+
+
+def _legacy_model_dump_json(event: CloudEvent) -> str:
+    """
+    `CloudEvent.model_dump_json()` before it was serialized in a single pass.
+    """
+    if isinstance(event.data, BaseModel):
+        event = event.copy()
+        event.data = json.loads(event.data.json(exclude_none=True))
+    return pydantic_core.to_json(json.loads(to_json(event))).decode()
+
+
+@pytest.mark.parametrize("event", _JSON_EVENTS)
+def test_structured_json_must_equal_to_json(event):
+    assert dump_structured_json(event) == to_json(event)
+
+
+@pytest.mark.parametrize("event", _JSON_EVENTS)
+def test_event_json_must_equal_the_legacy_model_dump_json(event):
+    if not isinstance(event, CloudEvent):
+        event = CloudEvent.create(event._get_attributes(), event.get_data())
+    expected = _legacy_model_dump_json(event)
+    assert dump_event_json(event) == expected
+    assert event.model_dump_json() == expected
+    assert event.json(exclude_none=True) == expected
+
+
+def test_model_data_must_be_dumped_without_none_fields():
+    event = _event(Order(order=1))
+    expected = _legacy_model_dump_json(event)
+    assert dump_event_json(event) == expected
+    assert event.model_dump_json() == expected
+    assert structured_dict(event)["data"] == {"order": 1}
+
+
+def test_orjson_backend_must_match_except_for_large_exponents(monkeypatch):
+    orjson = pytest.importorskip("orjson")
+    monkeypatch.setattr(cloudevent, "orjson", orjson, raising=False)
+    monkeypatch.setattr(cloudevent, "JSON_BACKEND", "orjson")
+    event = _event({"order": 1, "price": 9.99, "big": 2**70, "note": "é"})
+    assert dump_event_json(event) == _legacy_model_dump_json(event)
+    huge: Dict[str, Any] = {"amount": 1e16}
+    assert json.loads(dump_event_json(_event(huge)))["data"] == huge
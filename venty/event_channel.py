@@ -1,3 +1,4 @@
+import logging
 from typing import Iterable, Callable
 
 from cloudevents.abstract import CloudEvent
@@ -27,6 +28,17 @@ def _ignore_error(_: Exception):
     return None
 
 
+def _report_error(on_error: Callable[[Exception], None], error: Exception) -> None:
+    """
+    Passes an error of a background worker to `on_error`, which must not stop the
+    worker by raising itself.
+    """
+    try:
+        on_error(error)
+    except Exception:
+        logging.getLogger(__name__).exception("venty.OnErrorFailed")
+
+
 def best_effort_publish_events(
     events: Iterable[CloudEvent],
     channel: EventChannel,
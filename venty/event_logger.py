@@ -1,12 +1,20 @@
 import logging
+import queue
+import sys
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from logging import Formatter, LogRecord, StreamHandler
-from typing import Any, Dict, TypeVar, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, TypeVar
 
-from venty.cloudevent import CloudEvent
+from cloudevents.abstract import CloudEvent as AbstractCloudEvent
+
+from venty.cloudevent import CloudEvent, dump_event_json
 from pythonjsonlogger.jsonlogger import JsonFormatter
 import json
+from venty.buffered_event_channel import OverflowPolicy
+from venty.event_channel import EventChannel, _ignore_error, _report_error
 from venty.event_producer import EventProducer
 
 # https://github.com/cloudevents/spec/blob/main/cloudevents/extensions/severity.md
@@ -42,7 +50,7 @@ def _severity_text(severity_num: int) -> str:
     return _TRACE_SEVERITY_TEXT
 
 
-def __severity_number(level: int) -> int:
+def _severity_number(level: int) -> int:
     if logging.NOTSET <= level < logging.DEBUG:
         return _TRACE_SEVERITY
     if logging.DEBUG <= level < logging.INFO:
@@ -118,7 +126,7 @@ def _record_time(record: LogRecord) -> datetime:
 
 
 def _event_attributes(record: LogRecord, data: Dict[str, Any]) -> Dict[str, Any]:
-    severity_number = __severity_number(record.levelno)
+    severity_number = _severity_number(record.levelno)
     return {
         "type": _record_event_type(data),
         "time": _record_time(record).isoformat(),
@@ -127,29 +135,61 @@ def _event_attributes(record: LogRecord, data: Dict[str, Any]) -> Dict[str, Any]
     }
 
 
+def _is_json_native(value: Any) -> bool:
+    """
+    Whether a json round trip would return the value as is.
+    """
+    if value is None or type(value) in (str, int, float, bool):
+        return True
+    if type(value) is list:
+        return all(_is_json_native(v) for v in value)
+    if type(value) is dict:
+        return all(type(k) is str and _is_json_native(v) for k, v in value.items())
+    return False
+
+
+class _DictJsonFormatter(JsonFormatter):
+    """
+    Formats a record into the fields `JsonFormatter` would serialize, without
+    serializing them.
+    """
+
+    def serialize_log_record(self, log_data: Dict[str, Any]) -> Any:
+        return log_data
+
+
 class VentyFormatter(Formatter):
     def __init__(self, *args, event_producer: EventProducer, **kwargs):
         super().__init__(*args, **kwargs)
-        self._data_formatter = JsonFormatter(*args, **kwargs)
+        self._data_formatter = _DictJsonFormatter(*args, **kwargs)
         self._event_producer = event_producer
 
-    def format(self, record: LogRecord):
+    def _data(self, record: LogRecord) -> Dict[str, Any]:
+        data = self._data_formatter.format(record)
+        if _is_json_native(data):
+            return data
+        # values such as datetimes are converted the way the json formatter does
+        return json.loads(self._data_formatter.jsonify_log_record(data))
+
+    def format_event(self, record: LogRecord) -> CloudEvent:
         with _no_logging():
-            data = json.loads(self._data_formatter.format(record))
+            data = self._data(record)
             if _is_dict_cloudevent(data):
                 _pop_if_exists(data, "message")
-                result = CloudEvent.parse_obj(data)
+                return CloudEvent.parse_obj(data)
             elif _is_string_cloudevent(
                 _log_message(data)
             ):  # an event was given in the message
                 message = _log_message(data)
                 assert message is not None
-                result = CloudEvent.parse_raw(message)
+                return CloudEvent.parse_raw(message)
             else:
-                result = self._event_producer.produce_event(
+                return self._event_producer.produce_event(
                     CloudEvent, data, attributes=_event_attributes(record, data)
                 )
-            return result.json(exclude_none=True)
+
+    def format(self, record: LogRecord):
+        return dump_event_json(self.format_event(record))
 
 
 def venty_log_handler(
@@ -160,3 +200,181 @@ def venty_log_handler(
     result.setFormatter(VentyFormatter(event_producer=event_producer))
     result.setLevel(level)
     return result
+
+
+class _StreamEventChannel(EventChannel):
+    """
+    Writes events as json lines, the way `venty_log_handler` does.
+    """
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        self._stream.write("".join(dump_event_json(e) + "\n" for e in events))
+        self._stream.flush()
+
+
+class _BatchingQueueListener(QueueListener):
+    """
+    Formats the queued records and publishes them in batches of up to
+    `max_batch_size` records, taking whatever is queued without waiting for more.
+    """
+
+    def __init__(
+        self,
+        queue_: "queue.Queue[Any]",
+        formatter: VentyFormatter,
+        channel: EventChannel,
+        max_batch_size: int,
+        on_error: Callable[[Exception], None],
+    ):
+        super().__init__(queue_)
+        self._formatter = formatter
+        self._channel = channel
+        self._max_batch_size = max_batch_size
+        self._on_error = on_error
+        self._stopping = False
+
+    def dequeue(self, block: bool) -> Any:
+        if self._stopping:
+            return self._sentinel
+        first = self.queue.get(block)
+        if first is self._sentinel:
+            return first
+        batch = [first]
+        while len(batch) < self._max_batch_size:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is self._sentinel:
+                # publish what was taken, and stop on the next dequeue
+                self._stopping = True
+                break
+            self.queue.task_done()
+            batch.append(record)
+        return batch
+
+    def _report_error(self, error: Exception) -> None:
+        # an error of on_error is not logged, it could be queued to this listener
+        with _no_logging():
+            _report_error(self._on_error, error)
+
+    def handle(self, batch: List[LogRecord]) -> None:
+        events = []
+        # a record failing to format does not drop the others of its batch
+        for record in batch:
+            try:
+                events.append(self._formatter.format_event(record))
+            except Exception as e:
+                self._report_error(e)
+        if not events:
+            return
+        try:
+            self._channel.publish(events)
+        except Exception as e:
+            self._report_error(e)
+
+    def enqueue_sentinel(self) -> None:
+        # waits for room, so the records queued before stopping are published
+        self.queue.put(self._sentinel)
+
+
+class VentyQueueHandler(QueueHandler):
+    """
+    Only puts records in a bounded queue, a background listener formats them and
+    publishes them in batches. When the queue is full, records are handled
+    according to `overflow_policy`, which can not be `RAISE` since logging must
+    not raise into the code logging.
+
+    Records are formatted after `emit` returned, so their arguments must not be
+    mutated after logging them.
+    Closing the handler, which `logging.shutdown` does at exit, publishes every
+    queued record.
+    """
+
+    def __init__(
+        self,
+        formatter: VentyFormatter,
+        channel: EventChannel,
+        *,
+        max_queue_size: int = 10000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+        max_batch_size: int = 100,
+        on_error: Callable[[Exception], None] = _ignore_error,
+    ):
+        if max_queue_size <= 0 or max_batch_size <= 0:
+            raise ValueError("venty.InvalidBufferSize")
+        if overflow_policy == OverflowPolicy.RAISE:
+            # emit would only report the error of every record to stderr
+            raise ValueError("venty.UnsupportedOverflowPolicy")
+        super().__init__(queue.Queue(maxsize=max_queue_size))
+        self._overflow_policy = overflow_policy
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._listener: Optional[_BatchingQueueListener] = _BatchingQueueListener(
+            self.queue, formatter, channel, max_batch_size, on_error
+        )
+        self._listener.start()
+
+    def _record_dropped(self) -> None:
+        with self._dropped_lock:
+            self._dropped += 1
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        if self._overflow_policy == OverflowPolicy.BLOCK:
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                if self._overflow_policy == OverflowPolicy.DROP_NEWEST:
+                    self._record_dropped()
+                    return
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self._record_dropped()
+            except queue.Empty:
+                pass
+
+    @property
+    def dropped_records(self) -> int:
+        return self._dropped
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        super().close()
+
+
+def venty_queue_log_handler(
+    event_producer: EventProducer,
+    level: int = logging.INFO,
+    *,
+    channel: Optional[EventChannel] = None,
+    stream: Optional[TextIO] = None,
+    **kwargs: Any,
+) -> VentyQueueHandler:
+    """
+    Like `venty_log_handler`, without formatting or writing in the logging thread.
+
+    :param channel: receives the log events, by default they are written to
+        `stream` as json lines.
+    :param stream: defaults to `sys.stderr`, like `venty_log_handler`.
+    :param kwargs: passed to `VentyQueueHandler`.
+    """
+    if channel is None:
+        channel = _StreamEventChannel(sys.stderr if stream is None else stream)
+    result = VentyQueueHandler(
+        VentyFormatter(event_producer=event_producer), channel, **kwargs
+    )
+    result.setLevel(level)
+    return result
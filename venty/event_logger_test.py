@@ -0,0 +1,243 @@
+import io
+import json
+import logging
+import sys
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+from logging import LogRecord
+
+import pytest
+from pythonjsonlogger.jsonlogger import JsonFormatter
+
+from venty.buffered_event_channel import OverflowPolicy
+from venty.cloudevent import CloudEvent
+from venty.event_logger import (
+    VentyFormatter,
+    VentyQueueHandler,
+    _event_attributes,
+    _is_dict_cloudevent,
+    _is_string_cloudevent,
+    _log_message,
+    _no_logging,
+    _pop_if_exists,
+    venty_queue_log_handler,
+)
+from venty.event_producer import EventProducer, fake_event_producer
+from venty.in_memory_event_channel import InMemoryEventChannel
+
+
+class _GatedEventChannel(InMemoryEventChannel):
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.batches = []
+
+    def publish(self, events):
+        self.entered.set()
+        self.gate.wait(timeout=5)
+        events = list(events)
+        self.batches.append(len(events))
+        super().publish(events)
+
+
+def legacy_format(
+    formatter: JsonFormatter, event_producer: EventProducer, record: LogRecord
+) -> str:
+    """
+    The formatting of `VentyFormatter` before it had a direct path.
+    """
+    with _no_logging():
+        data = json.loads(formatter.format(record))
+        if _is_dict_cloudevent(data):
+            _pop_if_exists(data, "message")
+            result = CloudEvent.parse_obj(data)
+        elif _is_string_cloudevent(_log_message(data)):
+            result = CloudEvent.parse_raw(_log_message(data))
+        else:
+            result = event_producer.produce_event(
+                CloudEvent, data, attributes=_event_attributes(record, data)
+            )
+        return result.json(exclude_none=True)
+
+
+def _record(msg, *args, level=logging.INFO, exc_info=None, **extra) -> LogRecord:
+    result = LogRecord("my.logger", level, "/my/file.py", 7, msg, args, exc_info)
+    result.created = 1704067200.25
+    result.__dict__.update(extra)
+    return result
+
+
+def _exc_info():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        return sys.exc_info()
+
+
+_EVENT = CloudEvent.create(
+    {"type": "order.created", "source": "shop", "id": "1", "subject": "order-1"},
+    {"price": 9.5},
+)
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        _record("hello %s", "world"),
+        _record('unicode é ✓   "quoted" \\ <tag>', level=logging.WARNING),
+        _record("numbers", f=1e16, small=1e-7, nan=float("nan"), big=2**70),
+        _record("nested", extra_dict={"a": [1, None, True, {"b": "c"}]}),
+        _record("types", type="order.logged", level=logging.DEBUG),
+        _record("non native", when=datetime(2024, 1, 1), amount=Decimal("1.5")),
+        _record("tuples", pair=(1, 2), keys={1: "one"}),
+        _record("failed", level=logging.ERROR, exc_info=_exc_info()),
+        _record({"dict": "message", "n": 1}),
+        _record(_EVENT.json(exclude_none=True)),
+        _record(
+            {
+                "specversion": "1.0",
+                "type": "dict.event",
+                "source": "s",
+                "id": "2",
+                "time": "2024-01-01T00:00:00+00:00",
+                "data": {"x": 1},
+            }
+        ),
+        _record("critical", level=logging.CRITICAL, stack_info="Stack (most recent)"),
+    ],
+)
+def test_direct_formatting_must_match_the_legacy_formatting(record):
+    expected = legacy_format(
+        JsonFormatter(),
+        fake_event_producer(default_attributes={"zext": "z", "aext": 1}),
+        record,
+    )
+    formatter = VentyFormatter(
+        event_producer=fake_event_producer(default_attributes={"zext": "z", "aext": 1})
+    )
+    assert formatter.format(record) == expected
+
+
+def test_formatting_must_produce_a_log_event():
+    formatter = VentyFormatter(event_producer=fake_event_producer())
+    event = json.loads(formatter.format(_record("hello", level=logging.WARNING)))
+    assert event["type"] == "venty.LogRecorded"
+    assert event["severitytext"] == "WARNING"
+    assert event["severitynumber"] == 13
+    assert event["data"] == {"message": "hello"}
+    assert (
+        event["time"]
+        == datetime(2024, 1, 1, 0, 0, 0, 250000, tzinfo=timezone.utc).isoformat()
+    )
+
+
+def _messages(channel: InMemoryEventChannel):
+    return [e.data["message"] for e in channel.published_events]
+
+
+def test_queue_handler_must_publish_queued_records_in_batches_on_close():
+    channel = _GatedEventChannel()
+    handler = venty_queue_log_handler(
+        fake_event_producer(), channel=channel, max_batch_size=3
+    )
+    handler.handle(_record("first"))
+    assert channel.entered.wait(timeout=5)
+    for i in range(5):
+        handler.handle(_record(f"record {i}"))
+    channel.gate.set()
+    handler.close()
+    assert _messages(channel) == ["first"] + [f"record {i}" for i in range(5)]
+    assert channel.batches == [1, 3, 2]
+    assert handler.dropped_records == 0
+
+
+def test_queue_handler_must_write_json_lines_to_a_stream_by_default():
+    stream = io.StringIO()
+    handler = venty_queue_log_handler(fake_event_producer(), stream=stream)
+    handler.handle(_record("hello"))
+    handler.close()
+    expected = VentyFormatter(event_producer=fake_event_producer()).format(
+        _record("hello")
+    )
+    assert stream.getvalue() == expected + "\n"
+
+
+@pytest.mark.parametrize(
+    "policy, published",
+    [
+        (OverflowPolicy.DROP_NEWEST, ["first", "record 0", "record 1"]),
+        (OverflowPolicy.DROP_OLDEST, ["first", "record 3", "record 4"]),
+    ],
+)
+def test_full_queue_must_drop_records_by_policy(policy, published):
+    channel = _GatedEventChannel()
+    handler = VentyQueueHandler(
+        VentyFormatter(event_producer=fake_event_producer()),
+        channel,
+        max_queue_size=2,
+        overflow_policy=policy,
+    )
+    handler.handle(_record("first"))
+    assert channel.entered.wait(timeout=5)
+    for i in range(5):
+        handler.handle(_record(f"record {i}"))
+    assert handler.dropped_records == 3
+    channel.gate.set()
+    handler.close()
+    assert _messages(channel) == published
+
+
+def test_block_policy_must_publish_every_record():
+    channel = InMemoryEventChannel()
+    handler = venty_queue_log_handler(
+        fake_event_producer(),
+        channel=channel,
+        max_queue_size=1,
+        overflow_policy=OverflowPolicy.BLOCK,
+    )
+    for i in range(50):
+        handler.handle(_record(f"record {i}"))
+    handler.close()
+    assert _messages(channel) == [f"record {i}" for i in range(50)]
+
+
+def test_raise_policy_must_be_rejected():
+    with pytest.raises(ValueError, match="venty.UnsupportedOverflowPolicy"):
+        venty_queue_log_handler(
+            fake_event_producer(),
+            channel=InMemoryEventChannel(),
+            overflow_policy=OverflowPolicy.RAISE,
+        )
+
+
+def test_records_failing_to_format_must_not_drop_their_batch():
+    channel = _GatedEventChannel()
+    errors = []
+    handler = venty_queue_log_handler(
+        fake_event_producer(), channel=channel, on_error=errors.append
+    )
+    handler.handle(_record("first"))
+    assert channel.entered.wait(timeout=5)
+    handler.handle(_record("good"))
+    handler.handle(_record("bad %d", "x"))
+    handler.handle(_record("also good"))
+    channel.gate.set()
+    handler.close()
+    assert _messages(channel) == ["first", "good", "also good"]
+    assert [type(e) for e in errors] == [TypeError]
+
+
+def test_raising_error_handler_must_not_stop_the_listener():
+    def _on_error(error: Exception) -> None:
+        raise RuntimeError("handler failed")
+
+    channel = InMemoryEventChannel()
+    handler = venty_queue_log_handler(
+        fake_event_producer(), channel=channel, on_error=_on_error
+    )
+    handler.handle(_record("bad %d", "x"))
+    handler.handle(_record("good"))
+    handler.close()
+    assert _messages(channel) == ["good"]
@@ -1,8 +1,22 @@
+import os
 import sys
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Optional, TypeVar, Type, Union
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Type,
+    Union,
+)
 from uuid import UUID, uuid4, uuid5
 
+from pydantic import PydanticUserError, TypeAdapter
+
 from cloudevents.sdk.event.attribute import (
     default_id_selection_algorithm,
     default_time_selection_algorithm,
@@ -18,6 +32,7 @@ def _ignore_invalid_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
 
 
 IdSelection = Callable[[], str]
+BulkIdSelection = Callable[[int], List[str]]
 TimeSelection = Callable[[], datetime]
 
 AttributeValue = Union[str, int, UUID, bool]
@@ -33,6 +48,21 @@ class EventProducer:
     ) -> CloudEventT:
         raise NotImplementedError()
 
+    def produce_events(
+        self,
+        type_: Type[CloudEventT],
+        datas: Iterable[Optional[Any]],
+        *,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+    ) -> List[CloudEventT]:
+        """
+        Produces an event for every data, all with the same attributes.
+        """
+        return [
+            self.produce_event(type_, data, attributes=dict(attributes or {}))
+            for data in datas
+        ]
+
 
 EventProducerT = TypeVar("EventProducerT", bound=EventProducer)
 
@@ -55,8 +85,62 @@ def deterministic_time_factory() -> Callable[[], datetime]:
     return _next
 
 
+def bulk_uuid4(amount: int) -> List[str]:
+    """
+    Random ids like `default_id_selection_algorithm`, from a single call to the
+    random source.
+    """
+    raw = bytearray(os.urandom(16 * amount))
+    raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])  # version 4
+    raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])  # RFC 4122 variant
+    h = raw.hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-"
+        f"{h[i + 20:i + 32]}"
+        for i in range(0, 32 * amount, 32)
+    ]
+
+
+def _repeat_algorithm(algorithm: IdSelection) -> BulkIdSelection:
+    return lambda amount: [algorithm() for _ in range(amount)]
+
+
+_ANY_DATA = (Any, Optional[Any])
+
+
+@lru_cache(maxsize=None)
+def _data_validator(
+    type_: Type[CloudEventT],
+) -> Optional[Callable[[Any], Any]]:
+    """
+    Validates the data of an event without validating the whole event, or None
+    when the validators of the event type may depend on more than its data.
+    """
+    decorators = type_.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+    ):
+        return None
+    field = type_.model_fields["data"]
+    if field.metadata:
+        return None
+    if field.annotation in _ANY_DATA:
+        return lambda data: data
+    try:
+        adapter = TypeAdapter(field.annotation, config=type_.model_config)
+    except PydanticUserError as e:
+        if e.code != "type-adapter-config-unused":
+            return None
+        # models, dataclasses and typed dicts bring their own config
+        adapter = TypeAdapter(field.annotation)
+    return adapter.validate_python
+
+
 def _normalize_attributes(
-    attributes: Dict[str, AttributeValue]
+    attributes: Dict[str, AttributeValue],
 ) -> Dict[str, Union[str, int, bool]]:
     return {
         k: v if isinstance(v, (str, int, bool)) else str(v)
@@ -72,7 +156,14 @@ class SimpleEventProducer(EventProducer):
         default_attributes: Optional[Dict[str, Any]] = None,
         id_selection_algorithm: IdSelection = default_id_selection_algorithm,
         time_selection_algorithm: TimeSelection = default_time_selection_algorithm,
+        bulk_id_selection_algorithm: Optional[BulkIdSelection] = None,
     ):
+        """
+        :param bulk_id_selection_algorithm: allocates the ids of `produce_events`.
+            Defaults to the `bulk` method of `id_selection_algorithm` when it has
+            one, such as `venty.time_ordered_ids.uuid7`, else to calling it for
+            every event, or to `bulk_uuid4` for the default id selection algorithm.
+        """
         if source is None:
             source = EventSource(str(uuid4()))
         self._source = source
@@ -81,6 +172,13 @@ class SimpleEventProducer(EventProducer):
         self._default_attributes = _ignore_invalid_attributes(default_attributes)
         self._id_selection_algorithm = id_selection_algorithm
         self._time_selection_algorithm = time_selection_algorithm
+        if bulk_id_selection_algorithm is None:
+            bulk_id_selection_algorithm = getattr(
+                id_selection_algorithm, "bulk", None
+            ) or _repeat_algorithm(id_selection_algorithm)
+            if id_selection_algorithm is default_id_selection_algorithm:
+                bulk_id_selection_algorithm = bulk_uuid4
+        self._bulk_id_selection_algorithm = bulk_id_selection_algorithm
 
     def produce_event(
         self,
@@ -98,6 +196,58 @@ class SimpleEventProducer(EventProducer):
         actual_attributes.update(attributes)
         return type_.create(_normalize_attributes(actual_attributes), data)
 
+    def _times(self, amount: int) -> List[datetime]:
+        if self._time_selection_algorithm is default_time_selection_algorithm:
+            # events produced together share the time they were produced at
+            return [self._time_selection_algorithm()] * amount
+        return [self._time_selection_algorithm() for _ in range(amount)]
+
+    def produce_events(
+        self,
+        type_: Type[CloudEventT],
+        datas: Iterable[Optional[Any]],
+        *,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+    ) -> List[CloudEventT]:
+        """
+        The first event is validated as a whole, the rest are copies of it with
+        their own id, time and validated data.
+        """
+        datas = list(datas)
+        if not datas:
+            return []
+        if attributes is None:
+            attributes = {}
+        shared = self._default_attributes.copy()
+        shared["source"] = self._source
+        shared.update(attributes)
+        amount = len(datas)
+        ids = None if "id" in shared else self._bulk_id_selection_algorithm(amount)
+        times = None if "time" in shared else self._times(amount)
+        first = type_.create(
+            _normalize_attributes(
+                {
+                    **shared,
+                    **({} if ids is None else {"id": ids[0]}),
+                    **({} if times is None else {"time": times[0]}),
+                }
+            ),
+            datas[0],
+        )
+        # attributes given explicitly are shared by all the events
+        ids = ids or [first.id] * amount
+        times = times or [first.time] * amount
+        validate_data = _data_validator(type_)
+        result = [first]
+        for id_, time_, data in zip(ids[1:], times[1:], datas[1:]):
+            if validate_data is None or not isinstance(time_, datetime):
+                attributes_ = {**shared, "id": id_, "time": time_}
+                result.append(type_.create(_normalize_attributes(attributes_), data))
+            else:
+                update = {"id": str(id_), "time": time_, "data": validate_data(data)}
+                result.append(first.model_copy(update=update))
+        return result
+
 
 def fake_event_producer(
     *,
@@ -1,34 +1,37 @@
-from typing import Dict, Any, Optional, ContextManager, Type
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, ContextManager, Type, Iterable, List, Tuple
 from venty.event_producer import (
     EventProducer,
     EventProducerT,
     AttributeValue,
 )
 from venty.strong_types import CloudEventT
-from collections import OrderedDict
-from uuid import uuid4, UUID
+from uuid import uuid4
 from contextlib import contextmanager
-import sys
 
-if sys.version_info < (3, 9):
-    from typing import OrderedDict as OrderedDictType
+# a linked stack, the top producer and the rest of the stack
+_Scope = Tuple[EventProducer, Optional["_Scope"]]
 
-    EventProducers = OrderedDictType[UUID, Optional[EventProducer]]
-else:
-    EventProducers = OrderedDict[UUID, Optional[EventProducer]]
 
+class EventProducerStack(EventProducer):
+    """
+    Produces events with the most recently scoped event producer.
 
-def _last(event_producers: EventProducers) -> EventProducer:
-    # it is O(1)
-    # https://stackoverflow.com/questions/9917178/last-element-in-ordereddict
-    _, last_value = next(reversed(event_producers.items()))
-    return last_value
-
+    Scopes belong to the context they were entered in, so concurrent threads and
+    asyncio tasks each see their own scopes. A new thread starts with only the
+    default event producer, an asyncio task starts with the scopes of the code
+    which created it.
+    """
 
-class EventProducerStack(EventProducer):
     def __init__(self, default_event_producer: EventProducer):
-        self._event_producers: EventProducers = OrderedDict()
-        self._event_producers[uuid4()] = default_event_producer
+        self._scope: ContextVar[_Scope] = ContextVar(
+            f"venty.event_producer_stack.{uuid4()}",
+            default=(default_event_producer, None),
+        )
+
+    @property
+    def event_producer(self) -> EventProducer:
+        return self._scope.get()[0]
 
     def produce_event(
         self,
@@ -37,17 +40,25 @@ class EventProducerStack(EventProducer):
         *,
         attributes: Optional[Dict[str, AttributeValue]] = None,
     ) -> CloudEventT:
-        return _last(self._event_producers).produce_event(
+        return self._scope.get()[0].produce_event(
             type_, data=data, attributes=attributes
         )
 
+    def produce_events(
+        self,
+        type_: Type[CloudEventT],
+        datas: Iterable[Optional[Any]],
+        *,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+    ) -> List[CloudEventT]:
+        return self._scope.get()[0].produce_events(type_, datas, attributes=attributes)
+
     @contextmanager
     def scoped_event_producer(
         self, event_producer: EventProducerT
     ) -> ContextManager[EventProducerT]:
-        scoped_uuid = uuid4()
-        self._event_producers[scoped_uuid] = event_producer
+        token = self._scope.set((event_producer, self._scope.get()))
         try:
             yield event_producer
         finally:
-            self._event_producers.pop(scoped_uuid)
+            self._scope.reset(token)
@@ -1,4 +1,8 @@
-from typing import Literal
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal
 
 import pytest
 from venty.cloudevent import CloudEvent
@@ -44,3 +48,76 @@ def test_event_producer_stack_should_pop_on_exception():
             raise ValueError("boom")
     c = stack.produce_event(MyType, None)
     assert c.source == "my-source"
+
+
+def test_event_producer_stack_must_produce_events_with_the_scoped_producer():
+    stack = EventProducerStack(SimpleEventProducer(source=EventSource("my-source")))
+    your_producer = SimpleEventProducer(source=EventSource("your-source"))
+    with stack.scoped_event_producer(your_producer):
+        events = stack.produce_events(MyType, [1, 2])
+    assert [e.source for e in events] == ["your-source", "your-source"]
+
+
+def _source_producer(source: str) -> SimpleEventProducer:
+    return SimpleEventProducer(source=EventSource(source))
+
+
+def test_event_producer_stack_must_restore_nested_scopes():
+    stack = EventProducerStack(_source_producer("default"))
+    with stack.scoped_event_producer(_source_producer("outer")):
+        with stack.scoped_event_producer(_source_producer("inner")):
+            assert stack.produce_event(MyType, None).source == "inner"
+        assert stack.produce_event(MyType, None).source == "outer"
+    assert stack.produce_event(MyType, None).source == "default"
+
+
+def test_event_producer_stack_scopes_must_not_leak_across_threads():
+    stack = EventProducerStack(_source_producer("default"))
+    entered = threading.Barrier(4)
+    results = {}
+
+    def _request(i: int):
+        with stack.scoped_event_producer(_source_producer(f"request-{i}")):
+            entered.wait(timeout=5)
+            results[i] = stack.produce_event(MyType, None).source
+            entered.wait(timeout=5)
+
+    threads = [threading.Thread(target=_request, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: f"request-{i}" for i in range(4)}
+    assert stack.produce_event(MyType, None).source == "default"
+
+
+def test_event_producer_stack_scopes_must_not_leak_across_asyncio_tasks():
+    stack = EventProducerStack(_source_producer("default"))
+
+    async def _request(i: int) -> List[str]:
+        result = []
+        with stack.scoped_event_producer(_source_producer(f"request-{i}")):
+            for _ in range(3):
+                await asyncio.sleep(0)  # lets the other requests run
+                result.append(stack.produce_event(MyType, None).source)
+        result.append(stack.produce_event(MyType, None).source)
+        return result
+
+    async def _main():
+        with stack.scoped_event_producer(_source_producer("parent")):
+            return await asyncio.gather(*(_request(i) for i in range(3)))
+
+    assert asyncio.run(_main()) == [[f"request-{i}"] * 3 + ["parent"] for i in range(3)]
+
+
+def test_event_producer_stack_thread_pool_must_see_only_the_default_producer():
+    stack = EventProducerStack(_source_producer("default"))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with stack.scoped_event_producer(_source_producer("request")):
+            future = executor.submit(lambda: stack.produce_event(MyType, None))
+            copied = executor.submit(
+                contextvars.copy_context().run,
+                lambda: stack.produce_event(MyType, None),
+            )
+    assert future.result().source == "default"
+    assert copied.result().source == "request"
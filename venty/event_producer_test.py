@@ -1,10 +1,20 @@
 from datetime import datetime
-from typing import Literal
+from typing import Dict, Literal
+from uuid import RFC_4122, UUID
 
+import pytest
 from cloudevents.conversion import to_dict
+from pydantic import ConfigDict, ValidationError, field_validator
+from venty.auth_event_producer import AuthEventProducer
 from venty.cloudevent import CloudEvent
 
-from venty.event_producer import SimpleEventProducer, fake_event_producer
+from venty.event_producer import (
+    SimpleEventProducer,
+    bulk_uuid4,
+    deterministic_id_factory,
+    deterministic_time_factory,
+    fake_event_producer,
+)
 from venty.strong_types import EventSource
 
 
@@ -49,3 +59,99 @@ def test_fake_event_producer():
         "time": "1970-01-01T00:00:00+00:00",
         "type": "my-type",
     }
+
+
+class MyTypedType(CloudEvent):
+    type: Literal["my-typed-type"] = "my-typed-type"
+    data: Dict[str, int]
+
+
+def _producer(seed: int = 0) -> SimpleEventProducer:
+    return SimpleEventProducer(
+        source=EventSource("my-source"),
+        id_selection_algorithm=deterministic_id_factory(seed),
+        time_selection_algorithm=deterministic_time_factory(),
+        default_attributes={"subject": "hello"},
+    )
+
+
+@pytest.mark.parametrize("type_", [MyType, MyTypedType])
+def test_produce_events_must_equal_producing_one_by_one(type_):
+    datas = [{"a": i} for i in range(5)]
+    attributes = {"partitionkey": "p"}
+    one_by_one = _producer()
+    expected = [
+        one_by_one.produce_event(type_, data, attributes=attributes) for data in datas
+    ]
+    result = _producer().produce_events(type_, datas, attributes=attributes)
+    assert [to_dict(e) for e in result] == [to_dict(e) for e in expected]
+    assert [e.data for e in result] == datas
+
+
+class _Opaque:
+    pass
+
+
+class MyArbitraryType(CloudEvent):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    type: Literal["my-arbitrary-type"] = "my-arbitrary-type"
+    data: _Opaque
+
+
+class MyValidatedType(CloudEvent):
+    type: Literal["my-validated-type"] = "my-validated-type"
+    data: Dict[str, int]
+
+    @field_validator("data")
+    @classmethod
+    def _double(cls, value: Dict[str, int]) -> Dict[str, int]:
+        return {k: v * 2 for k, v in value.items()}
+
+
+def test_produce_events_must_use_the_config_of_the_event_type():
+    datas = [_Opaque(), _Opaque()]
+    result = _producer().produce_events(MyArbitraryType, datas)
+    assert [e.data for e in result] == datas
+
+
+def test_produce_events_must_run_the_validators_of_the_event_type():
+    result = _producer().produce_events(MyValidatedType, [{"a": 1}, {"a": 2}])
+    assert [e.data for e in result] == [{"a": 2}, {"a": 4}]
+
+
+def test_produce_events_must_validate_every_data():
+    with pytest.raises(ValidationError):
+        _producer().produce_events(MyTypedType, [{"a": 1}, {"a": "not a number"}])
+
+
+def test_produce_events_must_share_explicit_attributes():
+    result = _producer().produce_events(
+        MyType, [1, 2], attributes={"id": "same", "time": "2024-01-01T00:00:00Z"}
+    )
+    assert [e.id for e in result] == ["same", "same"]
+    assert result[0].time == result[1].time
+    assert _producer().produce_events(MyType, []) == []
+
+
+def test_default_produce_events_must_share_the_production_time():
+    result = SimpleEventProducer().produce_events(MyType, range(3))
+    assert len({e.time for e in result}) == 1
+    assert len({e.id for e in result}) == 3
+
+
+def test_bulk_uuid4_must_be_random_uuid4():
+    ids = bulk_uuid4(100)
+    assert len(set(ids)) == 100
+    for id_ in ids:
+        parsed = UUID(id_)
+        assert str(parsed) == id_
+        assert parsed.version == 4
+        assert parsed.variant == RFC_4122
+
+
+def test_auth_event_producer_must_add_auth_context_to_every_event():
+    producer = AuthEventProducer("user-1", "app_user", _producer())
+    events = producer.produce_events(MyType, [1, 2])
+    assert [(e["authid"], e["authtype"]) for e in events] == [
+        ("user-1", "app_user")
+    ] * 2
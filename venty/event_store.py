@@ -1,7 +1,17 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import timedelta
 from enum import Enum
-from typing import Iterable, Optional, Dict, Union, Literal, Callable, Sequence
+from typing import (
+    Iterable,
+    Optional,
+    Dict,
+    Union,
+    Literal,
+    Callable,
+    Sequence,
+    List,
+)
 from cloudevents.abstract import CloudEvent
 from venty.strong_types import (
     StreamVersion,
@@ -10,6 +20,7 @@ from venty.strong_types import (
     NO_EVENT_VERSION,
 )
 import sys
+import zlib
 
 
 @dataclass(frozen=True)
@@ -41,6 +52,13 @@ class StreamState(Enum):
 ExpectedVersion = Union[StreamVersion, StreamState]
 
 
+@dataclass(frozen=True)
+class AppendRequest:
+    stream_name: StreamName
+    expected_version: ExpectedVersion
+    events: Sequence[CloudEvent]
+
+
 def is_stream_version_correct(
     expected_version: Union[StreamVersion, StreamState],
     stream_version: Callable[[], Union[StreamVersion, Literal[StreamState.NO_STREAM]]],
@@ -88,6 +106,32 @@ class EventStore:
         """
         raise NotImplementedError()
 
+    def attempt_append_batch(
+        self,
+        requests: Sequence[AppendRequest],
+        *,
+        timeout: Optional[timedelta] = None,
+    ) -> List[Optional[CommitPosition]]:
+        """
+        Attempts every append request in order, as if `attempt_append_events` was
+        called for each of them. Every expected version is checked against the
+        stream version left by the requests before it.
+
+        Implementations SHOULD commit all the successful requests together, which is
+        cheaper than committing each of them on its own.
+
+        :return: the result of every request, in the order of the requests.
+        """
+        return [
+            self.attempt_append_events(
+                request.stream_name,
+                expected_version=request.expected_version,
+                events=request.events,
+                timeout=timeout,
+            )
+            for request in requests
+        ]
+
     def read_streams(
         self,
         instructions: Dict[StreamName, ReadInstruction],
@@ -234,3 +278,65 @@ def read_stream_no_metadata(
             timeout=timeout,
         )
     )
+
+
+def _read_page(
+    event_store: EventStore,
+    stream_name: StreamName,
+    stream_position: Optional[StreamVersion],
+    page_size: int,
+    timeout: Optional[timedelta],
+) -> List[RecordedEvent]:
+    return list(
+        read_stream(
+            event_store,
+            stream_name,
+            stream_position=stream_position,
+            limit=page_size,
+            timeout=timeout,
+        )
+    )
+
+
+def read_stream_pages(
+    event_store: EventStore,
+    stream_name: StreamName,
+    *,
+    page_size: int,
+    stream_position: Optional[StreamVersion] = None,
+    timeout: Optional[timedelta] = None,
+) -> Iterable[List[CloudEvent]]:
+    """
+    Reads the stream forwards in pages of at most `page_size` events.
+
+    The next page is fetched in a background thread while the caller consumes the
+    current one, so at most two pages are held in memory at any time.
+    """
+    if page_size <= 0:
+        raise ValueError("venty.InvalidPageSize")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_page: Optional[Future] = executor.submit(
+            _read_page, event_store, stream_name, stream_position, page_size, timeout
+        )
+        while next_page is not None:
+            page = next_page.result()
+            next_page = None
+            if len(page) == page_size:
+                next_page = executor.submit(
+                    _read_page,
+                    event_store,
+                    stream_name,
+                    StreamVersion(page[-1].stream_position + 1),
+                    page_size,
+                    timeout,
+                )
+            if page:
+                yield [recorded.event for recorded in page]
+
+
+def key_partition(key: str, partitions: int) -> int:
+    """
+    The partition of `key` among `partitions`, such as of a stream name. Stable
+    across processes, unlike the builtin `hash` of a string.
+    """
+    return zlib.crc32(key.encode()) % partitions
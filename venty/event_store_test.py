@@ -0,0 +1,79 @@
+import pytest
+
+from venty.event_store import (
+    AppendRequest,
+    EventStore,
+    StreamState,
+    append_events,
+    key_partition,
+    read_stream_pages,
+)
+from venty.in_memory_event_store import InMemoryEventStore
+from venty.strong_types import StreamVersion
+from venty.strong_types_test import MY_STREAM_NAME, dummy_events
+
+
+@pytest.fixture
+def store():
+    return InMemoryEventStore()
+
+
+def test_read_stream_pages_must_split_the_stream_into_pages(store):
+    events = list(dummy_events(5))
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.NO_STREAM, events=events
+    )
+    assert list(read_stream_pages(store, MY_STREAM_NAME, page_size=2)) == [
+        events[:2],
+        events[2:4],
+        events[4:],
+    ]
+
+
+def test_read_stream_pages_must_not_yield_an_empty_last_page(store):
+    events = list(dummy_events(4))
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.NO_STREAM, events=events
+    )
+    assert list(read_stream_pages(store, MY_STREAM_NAME, page_size=2)) == [
+        events[:2],
+        events[2:],
+    ]
+
+
+def test_read_stream_pages_may_start_from_a_stream_position(store):
+    events = list(dummy_events(5))
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.NO_STREAM, events=events
+    )
+    assert list(
+        read_stream_pages(
+            store, MY_STREAM_NAME, page_size=2, stream_position=StreamVersion(3)
+        )
+    ) == [events[3:]]
+
+
+def test_read_stream_pages_of_non_existing_stream_must_be_empty(store):
+    assert list(read_stream_pages(store, MY_STREAM_NAME, page_size=2)) == []
+
+
+def test_read_stream_pages_must_reject_non_positive_page_size(store):
+    with pytest.raises(ValueError, match="venty.InvalidPageSize"):
+        list(read_stream_pages(store, MY_STREAM_NAME, page_size=0))
+
+
+def test_default_append_batch_must_append_every_request_in_order(store):
+    events = list(dummy_events(3))
+    assert EventStore.attempt_append_batch(
+        store,
+        [
+            AppendRequest(MY_STREAM_NAME, StreamState.NO_STREAM, events[:2]),
+            AppendRequest(MY_STREAM_NAME, StreamState.NO_STREAM, events[2:]),
+            AppendRequest(MY_STREAM_NAME, StreamVersion(1), events[2:]),
+        ],
+    ) == [1, None, 2]
+
+
+def test_key_partition_is_stable_and_in_range():
+    assert key_partition("my-stream", 4) == key_partition("my-stream", 4)
+    assert all(0 <= key_partition(str(i), 4) < 4 for i in range(100))
@@ -1,21 +1,164 @@
-from typing import Iterable
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from enum import Enum
+from itertools import count
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
 from venty import EventStore, append_events
 from venty.cloudevent import CloudEvent
 from venty.event_channel import EventChannel
-from venty.event_store import StreamState
+from venty.event_store import (
+    ReadInstruction,
+    RecordedEvent,
+    StreamState,
+    key_partition,
+)
 from venty.strong_types import StreamName
 
 
+class PartitionKey(Enum):
+    SUBJECT = "subject"
+    TYPE = "type"
+
+
+PartitionKeySelector = Callable[[CloudEvent], Optional[str]]
+
+
+def partition_stream_name(stream_name: StreamName, partition: int) -> StreamName:
+    return StreamName(f"{stream_name}-{partition}")
+
+
+def partition_stream_names(
+    stream_name: StreamName, partitions: int
+) -> List[StreamName]:
+    """
+    A single partition is the stream itself, so an unpartitioned channel keeps
+    writing to the stream it always wrote to.
+    """
+    if partitions == 1:
+        return [stream_name]
+    return [partition_stream_name(stream_name, i) for i in range(partitions)]
+
+
+def _key_selector(
+    partition_key: Union[PartitionKey, PartitionKeySelector],
+) -> PartitionKeySelector:
+    if isinstance(partition_key, PartitionKey):
+        attribute = partition_key.value
+        return lambda event: event.get(attribute)
+    return partition_key
+
+
 class EventStreamChannel(EventChannel):
-    def __init__(self, event_store: EventStore, stream_name: StreamName):
+    """
+    Appends published events to `stream_name` with `StreamState.ANY`.
+
+    With many `partitions` every event is appended to one of `partitions` streams
+    chosen by hashing its `partition_key`, so concurrent producers no longer
+    collide on a single stream. Events of the same key keep their order, and the
+    partitions of a single publish call are appended in parallel.
+    Events without a key, such as events without a subject by default, have no
+    order to keep: those of a single publish call are appended together, to the
+    next partition in turn.
+    Use `read_partitions` to read all the partitions as a single feed.
+    """
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        stream_name: StreamName,
+        *,
+        partitions: int = 1,
+        partition_key: Union[PartitionKey, PartitionKeySelector] = PartitionKey.SUBJECT,
+        max_workers: Optional[int] = None,
+    ):
+        if partitions <= 0:
+            raise ValueError("venty.InvalidPartitions")
         self._event_store = event_store
         self._stream_name = stream_name
+        self._partitions = partitions
+        self._stream_names = partition_stream_names(stream_name, partitions)
+        self._partition_key = _key_selector(partition_key)
+        self._next_keyless_partition = count()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if partitions > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="venty-partitions"
+            )
 
-    def publish(self, events: Iterable[CloudEvent]) -> None:
+    def _append(self, stream_name: StreamName, events: Iterable[CloudEvent]) -> None:
         append_events(
             event_store=self._event_store,
-            stream_name=self._stream_name,
+            stream_name=stream_name,
             expected_version=StreamState.ANY,
             events=events,
         )
+
+    def _partitioned(
+        self, events: Iterable[CloudEvent]
+    ) -> Dict[StreamName, List[CloudEvent]]:
+        result: Dict[StreamName, List[CloudEvent]] = {}
+        keyless_partition: Optional[int] = None
+        for event in events:
+            key = self._partition_key(event)
+            if key is not None:
+                partition = key_partition(key, self._partitions)
+            else:
+                if keyless_partition is None:
+                    keyless_partition = (
+                        next(self._next_keyless_partition) % self._partitions
+                    )
+                partition = keyless_partition
+            result.setdefault(self._stream_names[partition], []).append(event)
+        return result
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        if self._executor is None:
+            self._append(self._stream_name, events)
+            return
+        partitioned = self._partitioned(events)
+        if len(partitioned) == 1:
+            # no need to pay for a thread switch
+            ((stream_name, partition_events),) = partitioned.items()
+            self._append(stream_name, partition_events)
+            return
+        futures = [
+            self._executor.submit(self._append, stream_name, partition_events)
+            for stream_name, partition_events in partitioned.items()
+        ]
+        # every partition is attempted before the first failure is raised
+        for future in futures:
+            future.exception()
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+def _commit_order(recorded: RecordedEvent) -> int:
+    return recorded.commit_position
+
+
+def read_partitions(
+    event_store: EventStore,
+    stream_name: StreamName,
+    partitions: int,
+    *,
+    timeout: Optional[timedelta] = None,
+) -> Iterable[RecordedEvent]:
+    """
+    Reads all the partitions written by an `EventStreamChannel` with the same
+    `stream_name` and `partitions`, merged into a single feed in commit order.
+    """
+    return heapq.merge(
+        *(
+            event_store.read_streams(
+                {name: ReadInstruction(stream_position=None)}, timeout=timeout
+            )
+            for name in partition_stream_names(stream_name, partitions)
+        ),
+        key=_commit_order,
+    )
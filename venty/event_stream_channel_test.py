@@ -0,0 +1,130 @@
+import threading
+from typing import Iterable, Optional
+
+import pytest
+from cloudevents.abstract import CloudEvent
+
+from venty.event_channel import publish_events
+from venty.event_store import key_partition, read_stream_no_metadata
+from venty.event_stream_channel import (
+    EventStreamChannel,
+    PartitionKey,
+    partition_stream_name,
+    partition_stream_names,
+    read_partitions,
+)
+from venty.in_memory_event_store import InMemoryEventStore
+from venty.strong_types import CommitPosition
+from venty.strong_types_test import MY_STREAM_NAME, dummy_events
+
+
+class _BarrierEventStore(InMemoryEventStore):
+    """
+    Appending completes only once `parties` appends run at the same time.
+    """
+
+    def __init__(self, parties: int):
+        super().__init__()
+        self._barrier = threading.Barrier(parties)
+
+    def attempt_append_events(self, *args, **kwargs) -> Optional[CommitPosition]:
+        self._barrier.wait(timeout=5)
+        return super().attempt_append_events(*args, **kwargs)
+
+
+def _with_subjects(events: Iterable[CloudEvent], *subjects: str):
+    result = list(events)
+    for event, subject in zip(result, subjects):
+        event.subject = subject
+    return result
+
+
+def test_single_partition_must_append_to_the_stream_itself():
+    store = InMemoryEventStore()
+    events = list(dummy_events(3))
+    publish_events(events, EventStreamChannel(store, MY_STREAM_NAME))
+    assert (
+        list(read_stream_no_metadata(store, MY_STREAM_NAME, stream_position=None))
+        == events
+    )
+
+
+def test_events_of_the_same_key_must_keep_their_order_in_one_partition():
+    store = InMemoryEventStore()
+    subjects = [f"order-{i % 5}" for i in range(50)]
+    events = _with_subjects(dummy_events(50), *subjects)
+    channel = EventStreamChannel(store, MY_STREAM_NAME, partitions=4)
+    publish_events(events, channel)
+    for subject in set(subjects):
+        partition = partition_stream_name(MY_STREAM_NAME, key_partition(subject, 4))
+        stored = read_stream_no_metadata(store, partition, stream_position=None)
+        assert [e for e in stored if e["subject"] == subject] == [
+            e for e in events if e["subject"] == subject
+        ]
+    channel.close()
+
+
+def test_partition_key_may_be_the_type_or_a_function():
+    store = InMemoryEventStore()
+    events = list(dummy_events(2, type_="a")) + list(dummy_events(2, type_="b"))
+    by_type = EventStreamChannel(
+        store, MY_STREAM_NAME, partitions=8, partition_key=PartitionKey.TYPE
+    )
+    by_type.publish(events)
+    partition = partition_stream_name(MY_STREAM_NAME, key_partition("a", 8))
+    assert events[:2] == [
+        e
+        for e in read_stream_no_metadata(store, partition, stream_position=None)
+        if e["type"] == "a"
+    ]
+
+    custom = InMemoryEventStore()
+    EventStreamChannel(
+        custom, MY_STREAM_NAME, partitions=2, partition_key=lambda e: e["type"] + "x"
+    ).publish(events)
+    partition = partition_stream_name(MY_STREAM_NAME, key_partition("ax", 2))
+    assert events[:2] == [
+        e
+        for e in read_stream_no_metadata(custom, partition, stream_position=None)
+        if e["type"] == "a"
+    ]
+
+
+def test_events_without_a_key_must_be_spread_over_the_partitions():
+    store = InMemoryEventStore()
+    events = list(dummy_events(6))
+    channel = EventStreamChannel(store, MY_STREAM_NAME, partitions=2)
+    for i in range(0, 6, 2):
+        channel.publish(events[i : i + 2])
+    assert [
+        list(read_stream_no_metadata(store, name, stream_position=None))
+        for name in partition_stream_names(MY_STREAM_NAME, 2)
+    ] == [events[:2] + events[4:], events[2:4]]
+    channel.close()
+
+
+def test_partitions_must_be_appended_in_parallel():
+    store = _BarrierEventStore(parties=2)
+    events = _with_subjects(dummy_events(2), "a", "d")
+    assert key_partition("a", 2) != key_partition("d", 2)
+    channel = EventStreamChannel(store, MY_STREAM_NAME, partitions=2)
+    channel.publish(events)
+    assert store.commit_position() == 1
+    channel.close()
+
+
+def test_read_partitions_must_merge_partitions_in_commit_order():
+    store = InMemoryEventStore()
+    events = _with_subjects(dummy_events(30), *(str(i) for i in range(30)))
+    channel = EventStreamChannel(store, MY_STREAM_NAME, partitions=3)
+    for event in events:
+        channel.publish([event])
+    merged = list(read_partitions(store, MY_STREAM_NAME, 3))
+    assert [r.event for r in merged] == events
+    assert len({r.stream_name for r in merged}) == 3
+    channel.close()
+
+
+def test_partitions_must_be_positive():
+    with pytest.raises(ValueError, match="venty.InvalidPartitions"):
+        EventStreamChannel(InMemoryEventStore(), MY_STREAM_NAME, partitions=0)
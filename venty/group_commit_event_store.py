@@ -0,0 +1,163 @@
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Union
+
+from cloudevents.abstract import CloudEvent
+
+from venty.event_store import (
+    AppendRequest,
+    EventStore,
+    ExpectedVersion,
+    ReadInstruction,
+    RecordedEvent,
+    StreamState,
+)
+from venty.strong_types import CommitPosition, StreamName, StreamVersion
+from venty.timing import assert_timeout_not_supported
+
+
+@dataclass
+class _PendingAppend:
+    request: AppendRequest
+    done: "Future[Optional[CommitPosition]]"
+
+
+class GroupCommitEventStore(EventStore):
+    """
+    Coalesces appends of concurrent callers into a single `attempt_append_batch`
+    of the wrapped event store, so many small appends share one transaction.
+
+    Appends arriving within `window` of the first pending one are committed
+    together, up to `max_batch_size` appends. Every caller receives its own
+    commit position, or None when its expected version was wrong.
+    Reads go to the wrapped event store directly.
+    """
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        *,
+        window: timedelta = timedelta(milliseconds=2),
+        max_batch_size: int = 256,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("venty.InvalidBatchSize")
+        self._event_store = event_store
+        self._window = window.total_seconds()
+        self._max_batch_size = max_batch_size
+        self._pending: List[_PendingAppend] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="venty-group-commit", daemon=True
+        )
+        self._worker.start()
+
+    def submit(
+        self,
+        stream_name: StreamName,
+        *,
+        expected_version: ExpectedVersion,
+        events: Iterable[CloudEvent],
+    ) -> "Future[Optional[CommitPosition]]":
+        """
+        :return: a future of the result `attempt_append_events` would have returned.
+        """
+        (done,) = self._submit_all(
+            [AppendRequest(stream_name, expected_version, list(events))]
+        )
+        return done
+
+    def _submit_all(
+        self, requests: Sequence[AppendRequest]
+    ) -> List["Future[Optional[CommitPosition]]"]:
+        pending = [_PendingAppend(request, Future()) for request in requests]
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("venty.GroupCommitClosed")
+            self._pending.extend(pending)
+            self._condition.notify_all()
+        return [p.done for p in pending]
+
+    def _next_batch(self) -> List[_PendingAppend]:
+        with self._condition:
+            while not self._pending and not self._closed:
+                self._condition.wait()
+            if self._pending and not self._closed:
+                # gives concurrent callers the window to join the batch
+                self._condition.wait_for(
+                    lambda: len(self._pending) >= self._max_batch_size or self._closed,
+                    timeout=self._window,
+                )
+            batch = self._pending[: self._max_batch_size]
+            del self._pending[: self._max_batch_size]
+            return batch
+
+    def _commit(self, batch: List[_PendingAppend]) -> None:
+        try:
+            results = self._event_store.attempt_append_batch(
+                [pending.request for pending in batch]
+            )
+        except Exception as e:
+            for pending in batch:
+                pending.done.set_exception(e)
+        else:
+            for pending, result in zip(batch, results):
+                pending.done.set_result(result)
+
+    def _run(self) -> None:
+        while batch := self._next_batch():
+            self._commit(batch)
+
+    def attempt_append_events(
+        self,
+        stream_name: StreamName,
+        *,
+        expected_version: ExpectedVersion,
+        events: Iterable[CloudEvent],
+        timeout: Optional[timedelta] = None,
+    ) -> Optional[CommitPosition]:
+        assert_timeout_not_supported(timeout)
+        return self.submit(
+            stream_name, expected_version=expected_version, events=events
+        ).result()
+
+    def attempt_append_batch(
+        self,
+        requests: Sequence[AppendRequest],
+        *,
+        timeout: Optional[timedelta] = None,
+    ) -> List[Optional[CommitPosition]]:
+        assert_timeout_not_supported(timeout)
+        # submitted together, the requests join the same batch
+        return [done.result() for done in self._submit_all(requests)]
+
+    def read_streams(
+        self,
+        instructions: Dict[StreamName, ReadInstruction],
+        *,
+        backwards: bool = False,
+        timeout: Optional[timedelta] = None,
+    ) -> Iterable[RecordedEvent]:
+        return self._event_store.read_streams(
+            instructions, backwards=backwards, timeout=timeout
+        )
+
+    def commit_position(self) -> CommitPosition:
+        return self._event_store.commit_position()
+
+    def current_version(
+        self, stream_name: StreamName, *, timeout: Optional[timedelta] = None
+    ) -> Optional[Union[StreamVersion, Literal[StreamState.NO_STREAM]]]:
+        return self._event_store.current_version(stream_name, timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Commits every pending append, then stops the writer.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
@@ -0,0 +1,127 @@
+import threading
+from datetime import timedelta
+from typing import List, Optional, Sequence
+
+import pytest
+
+from venty.event_store import (
+    AppendRequest,
+    StreamState,
+    append_events,
+    read_stream_no_metadata,
+)
+from venty.group_commit_event_store import GroupCommitEventStore
+from venty.in_memory_event_store import InMemoryEventStore
+from venty.strong_types import CommitPosition, StreamVersion
+from venty.strong_types_test import MY_STREAM_NAME, YOUR_STREAM_NAME, dummy_events
+
+
+class _RecordingEventStore(InMemoryEventStore):
+    def __init__(self):
+        super().__init__()
+        self.batches: List[int] = []
+
+    def attempt_append_batch(
+        self, requests: Sequence[AppendRequest], **kwargs
+    ) -> List[Optional[CommitPosition]]:
+        self.batches.append(len(requests))
+        return super().attempt_append_batch(requests, **kwargs)
+
+
+class _FailingEventStore(InMemoryEventStore):
+    def attempt_append_batch(self, *args, **kwargs):
+        raise ConnectionError("database is down")
+
+
+def test_concurrent_appends_must_be_committed_together():
+    inner = _RecordingEventStore()
+    store = GroupCommitEventStore(inner, window=timedelta(seconds=1), max_batch_size=8)
+    events = list(dummy_events(8))
+    barrier = threading.Barrier(8)
+    results = {}
+
+    def _append(i: int):
+        barrier.wait(timeout=5)
+        results[i] = store.attempt_append_events(
+            MY_STREAM_NAME, expected_version=StreamState.ANY, events=[events[i]]
+        )
+
+    threads = [threading.Thread(target=_append, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert inner.batches == [8]
+    assert sorted(results.values()) == list(range(8))
+    stored = list(read_stream_no_metadata(store, MY_STREAM_NAME, stream_position=None))
+    assert [stored[results[i]] for i in range(8)] == events
+    store.close()
+
+
+def test_every_caller_must_receive_its_own_result():
+    inner = _RecordingEventStore()
+    append_events(
+        inner,
+        YOUR_STREAM_NAME,
+        expected_version=StreamState.ANY,
+        events=dummy_events(1),
+    )
+    store = GroupCommitEventStore(inner, window=timedelta(seconds=5), max_batch_size=3)
+    first = store.submit(
+        MY_STREAM_NAME, expected_version=StreamState.NO_STREAM, events=dummy_events(2)
+    )
+    wrong = store.submit(
+        YOUR_STREAM_NAME, expected_version=StreamState.NO_STREAM, events=dummy_events(1)
+    )
+    # checked against the version left by the first append of the batch
+    second = store.submit(
+        MY_STREAM_NAME, expected_version=StreamVersion(1), events=dummy_events(1)
+    )
+    assert (first.result(), wrong.result(), second.result()) == (2, None, 3)
+    assert inner.batches == [3]
+    store.close()
+
+
+def test_append_batch_must_be_committed_together():
+    inner = _RecordingEventStore()
+    store = GroupCommitEventStore(inner, window=timedelta(0))
+    events = list(dummy_events(3))
+    results = store.attempt_append_batch(
+        [
+            AppendRequest(MY_STREAM_NAME, StreamState.NO_STREAM, events[:2]),
+            AppendRequest(YOUR_STREAM_NAME, StreamVersion(0), events[2:]),
+            AppendRequest(MY_STREAM_NAME, StreamVersion(1), events[2:]),
+        ]
+    )
+    assert inner.batches == [3]
+    assert results == [CommitPosition(1), None, CommitPosition(2)]
+    store.close()
+
+
+def test_batch_failure_must_fail_every_caller():
+    store = GroupCommitEventStore(_FailingEventStore())
+    with pytest.raises(ConnectionError):
+        append_events(
+            store,
+            MY_STREAM_NAME,
+            expected_version=StreamState.ANY,
+            events=dummy_events(1),
+        )
+    store.close()
+
+
+def test_close_must_commit_pending_appends():
+    inner = InMemoryEventStore()
+    store = GroupCommitEventStore(inner, window=timedelta(seconds=5))
+    done = store.submit(
+        MY_STREAM_NAME, expected_version=StreamState.ANY, events=dummy_events(2)
+    )
+    store.close()
+    assert done.result(timeout=0) == 1
+    with pytest.raises(RuntimeError, match="venty.GroupCommitClosed"):
+        store.submit(MY_STREAM_NAME, expected_version=StreamState.ANY, events=[])
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError, match="venty.InvalidBatchSize"):
+        GroupCommitEventStore(InMemoryEventStore(), max_batch_size=0)
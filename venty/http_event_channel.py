@@ -1,46 +1,272 @@
+import gzip
+import threading
+import zlib
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
 from enum import Enum
-from typing import Iterable, Callable, Tuple, Dict
+from functools import partial
+from itertools import chain
+from typing import Iterable, Callable, Tuple, Dict, List, Optional
 
 from cloudevents.abstract import CloudEvent
-from cloudevents.conversion import to_structured, to_binary
+from cloudevents.conversion import to_binary
 
 try:
     from requests import Session
+    from requests.adapters import HTTPAdapter
 except ImportError:
     raise RuntimeError(
         "Venty http feature is not installed. Install it "
         "using pip install venty[http]"
     )
+from venty.cloudevent import dump_structured_json
 from venty.event_channel import EventChannel
 
 
 class HttpChannelMode(Enum):
     BINARY = "BINARY"
     STRUCTURED = "STRUCTURED"
+    # https://github.com/cloudevents/spec/blob/main/cloudevents/bindings/http-protocol-binding.md#33-batched-content-mode
+    BATCH = "BATCH"
+
+
+class ContentEncoding(Enum):
+    GZIP = "gzip"
+    # the zlib format, as the http "deflate" content coding defines
+    DEFLATE = "deflate"
+
+
+_BATCH_CONTENT_TYPE = "application/cloudevents-batch+json"
+_DEFAULT_MAX_BATCH_EVENTS = 100
+_DEFAULT_MAX_BATCH_BYTES = 1024 * 1024
+_DEFAULT_COMPRESSION_LEVEL = 6
+_DEFAULT_COMPRESSION_THRESHOLD = 1024
+
+HttpRequest = Tuple[Dict[str, str], bytes]
+
+
+class HttpPublishError(Exception):
+    """
+    Raised once per `publish` call of a concurrent channel, after all of its
+    requests completed, with every error that happened during the call.
+    """
+
+    def __init__(self, errors: List[BaseException]):
+        super().__init__(f"{len(errors)} http requests failed: {errors[0]!r}")
+        self.errors = errors
+
+
+def pooled_session(max_in_flight: int) -> Session:
+    """
+    A session that keeps enough pooled connections per host for a channel with
+    the given `max_in_flight`.
+    """
+    result = Session()
+    adapter = HTTPAdapter(pool_connections=max_in_flight, pool_maxsize=max_in_flight)
+    result.mount("http://", adapter)
+    result.mount("https://", adapter)
+    return result
+
+
+def _to_structured(event: CloudEvent) -> HttpRequest:
+    # same as `to_structured`, with a single serialization pass
+    return {"content-type": "application/cloudevents+json"}, dump_structured_json(event)
 
 
 def _choose_strategy(
     mode: HttpChannelMode,
-) -> Callable[[CloudEvent], Tuple[Dict[str, str], bytes]]:
+) -> Callable[[CloudEvent], HttpRequest]:
     if mode == HttpChannelMode.STRUCTURED:
-        return to_structured
+        return _to_structured
     if mode == HttpChannelMode.BINARY:
         return to_binary
     raise NotImplementedError()
 
 
+def _json_array_size(items: List[bytes]) -> int:
+    brackets = 2
+    commas = max(len(items) - 1, 0)
+    return brackets + commas + sum(len(item) for item in items)
+
+
+def _batches(
+    events: Iterable[CloudEvent], max_events: int, max_bytes: int
+) -> Iterable[List[bytes]]:
+    """
+    An event bigger than `max_bytes` is still sent, alone in its own batch.
+    """
+    batch: List[bytes] = []
+    batch_size = _json_array_size(batch)
+    for event in events:
+        encoded = dump_structured_json(event)
+        if batch and (
+            len(batch) >= max_events or batch_size + 1 + len(encoded) > max_bytes
+        ):
+            yield batch
+            batch = []
+            batch_size = _json_array_size(batch)
+        batch_size += len(encoded) + (1 if batch else 0)
+        batch.append(encoded)
+    if batch:
+        yield batch
+
+
+def _subject_groups(
+    events: Iterable[CloudEvent],
+) -> Tuple[List[List[CloudEvent]], List[CloudEvent]]:
+    """
+    :return: the events of every subject, and the events without a subject, which
+        have no ordering requirements.
+    """
+    groups: Dict[str, List[CloudEvent]] = {}
+    result: List[List[CloudEvent]] = []
+    unordered: List[CloudEvent] = []
+    for event in events:
+        subject = event.get("subject")
+        if subject is None:
+            unordered.append(event)
+            continue
+        if subject not in groups:
+            groups[subject] = []
+            result.append(groups[subject])
+        groups[subject].append(event)
+    return result, unordered
+
+
+def _run_bounded(
+    executor: Executor, tasks: Iterable[Callable[[], None]], max_in_flight: int
+) -> List[BaseException]:
+    in_flight = threading.BoundedSemaphore(max_in_flight)
+    futures = []
+    for task in tasks:
+        in_flight.acquire()
+        future = executor.submit(task)
+        future.add_done_callback(lambda _: in_flight.release())
+        futures.append(future)
+    wait(futures)
+    return [f.exception() for f in futures if f.exception() is not None]
+
+
+def _compress(body: bytes, encoding: ContentEncoding, level: int) -> bytes:
+    if encoding == ContentEncoding.GZIP:
+        # a fixed mtime keeps the output deterministic
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == ContentEncoding.DEFLATE:
+        return zlib.compress(body, level)
+    raise NotImplementedError()
+
+
+def _batch_request(batch: List[bytes]) -> HttpRequest:
+    return {"content-type": _BATCH_CONTENT_TYPE}, b"[" + b",".join(batch) + b"]"
+
+
 class HttpEventChannel(EventChannel):
     def __init__(
         self,
         base_url: str,
         session: Session,
         mode: HttpChannelMode = HttpChannelMode.BINARY,
+        *,
+        max_batch_events: int = _DEFAULT_MAX_BATCH_EVENTS,
+        max_batch_bytes: int = _DEFAULT_MAX_BATCH_BYTES,
+        max_in_flight: int = 1,
+        preserve_subject_order: bool = False,
+        content_encoding: Optional[ContentEncoding] = None,
+        compression_level: int = _DEFAULT_COMPRESSION_LEVEL,
+        compression_threshold: int = _DEFAULT_COMPRESSION_THRESHOLD,
     ):
+        """
+        :param max_batch_events: the maximum amount of events sent in a single
+            request in the batch mode.
+        :param max_batch_bytes: the maximum body size of a single request in the
+            batch mode.
+        :param max_in_flight: the maximum amount of concurrent requests. When
+            bigger than 1, requests are sent from a thread pool, and the session
+            should pool at least as many connections (see `pooled_session`).
+            Errors are then raised together as an `HttpPublishError` once all the
+            requests of the `publish` call completed.
+        :param preserve_subject_order: when sending concurrently, send events of
+            the same subject one after the other, in the order they were given.
+            In the batch mode, every subject is batched separately, and the events
+            without a subject are batched together.
+        :param content_encoding: compress the bodies of the structured and batch
+            modes. The binary mode body is the event data as is, so it is never
+            compressed.
+        :param compression_level: from 1 (fastest) to 9 (smallest).
+        :param compression_threshold: bodies smaller than this amount of bytes are
+            not worth the cpu and are sent uncompressed.
+        """
+        if max_batch_events <= 0 or max_batch_bytes <= 0:
+            raise ValueError("venty.InvalidBatchLimits")
+        if max_in_flight <= 0:
+            raise ValueError("venty.InvalidMaxInFlight")
         self._base_url = base_url
         self._session = session
-        self._strategy = _choose_strategy(mode)
+        self._mode = mode
+        self._max_batch_events = max_batch_events
+        self._max_batch_bytes = max_batch_bytes
+        self._max_in_flight = max_in_flight
+        self._preserve_subject_order = preserve_subject_order
+        self._content_encoding = content_encoding
+        if mode == HttpChannelMode.BINARY:
+            self._content_encoding = None
+        self._compression_level = compression_level
+        self._compression_threshold = compression_threshold
+        self._executor: Optional[Executor] = None
+        if max_in_flight > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_in_flight, thread_name_prefix="venty-http"
+            )
+        if mode != HttpChannelMode.BATCH:
+            self._strategy = _choose_strategy(mode)
+
+    def _uncompressed_requests(
+        self, events: Iterable[CloudEvent]
+    ) -> Iterable[HttpRequest]:
+        if self._mode == HttpChannelMode.BATCH:
+            for batch in _batches(
+                events, self._max_batch_events, self._max_batch_bytes
+            ):
+                yield _batch_request(batch)
+        else:
+            for event in events:
+                yield self._strategy(event)
+
+    def _compressed(self, request: HttpRequest) -> HttpRequest:
+        headers, body = request
+        if self._content_encoding is None or len(body) < self._compression_threshold:
+            return request
+        headers = {**headers, "content-encoding": self._content_encoding.value}
+        return headers, _compress(body, self._content_encoding, self._compression_level)
+
+    def _requests(self, events: Iterable[CloudEvent]) -> Iterable[HttpRequest]:
+        return map(self._compressed, self._uncompressed_requests(events))
+
+    def _post(self, request: HttpRequest) -> None:
+        headers, body = request
+        response = self._session.post(self._base_url, body, headers=headers)
+        response.raise_for_status()
+
+    def _post_all(self, events: Iterable[CloudEvent]) -> None:
+        for request in self._requests(events):
+            self._post(request)
 
     def publish(self, events: Iterable[CloudEvent]) -> None:
-        for event in events:
-            headers, body = self._strategy(event)
-            self._session.post(self._base_url, body, headers=headers)
+        if self._executor is None:
+            self._post_all(events)
+            return
+        if self._preserve_subject_order:
+            groups, unordered = _subject_groups(events)
+            # events without a subject are batched together and sent concurrently
+            tasks: Iterable[Callable[[], None]] = chain(
+                (partial(self._post_all, group) for group in groups),
+                (partial(self._post, r) for r in self._requests(unordered)),
+            )
+        else:
+            tasks = (partial(self._post, r) for r in self._requests(events))
+        errors = _run_bounded(self._executor, tasks, self._max_in_flight)
+        if errors:
+            raise HttpPublishError(errors)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
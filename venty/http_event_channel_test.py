@@ -1,8 +1,27 @@
+import gzip
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+import pytest
+from requests import HTTPError, Session
 from venty.cloudevent import CloudEvent
 from mock import Mock
 
-from venty.event_channel import publish_event
-from venty.http_event_channel import HttpEventChannel, HttpChannelMode
+from venty.event_channel import publish_event, publish_events
+from venty.http_event_channel import (
+    ContentEncoding,
+    HttpEventChannel,
+    HttpChannelMode,
+    HttpPublishError,
+    _batches,
+    _subject_groups,
+    pooled_session,
+)
+from venty.strong_types_test import dummy_events
 
 
 def test_http_channel_with_binary_mode_must_put_all_ce_attributes_in_header():
@@ -58,3 +77,267 @@ def test_http_channel_with_structured_mode_must_put_event_as_json_in_body():
         b'"my-type", "time": "2024-01-01T00:00:00", "data": {"hello": "world"}}',
         headers={"content-type": "application/cloudevents+json"},
     )
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802
+        time.sleep(self.server.delay)
+        body = self.rfile.read(int(self.headers["content-length"]))
+        self.server.received.append((dict(self.headers), body))
+        self.send_response(self.server.status)
+        self.send_header("content-length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RecordingHandler)
+        self.received: List[Tuple[Dict[str, str], bytes]] = []
+        self.status = 200
+        self.delay = 0.0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+
+@pytest.fixture
+def stand_in_server():
+    server = StandInServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_batch_mode_must_send_all_events_in_one_request(stand_in_server):
+    events = list(dummy_events(10))
+    channel = HttpEventChannel(stand_in_server.url, Session(), HttpChannelMode.BATCH)
+    publish_events(events, channel)
+    assert len(stand_in_server.received) == 1
+    headers, body = stand_in_server.received[0]
+    assert headers["content-type"] == "application/cloudevents-batch+json"
+    assert [CloudEvent.parse_obj(e) for e in json.loads(body)] == events
+
+
+def test_batch_mode_must_respect_max_events(stand_in_server):
+    events = list(dummy_events(10))
+    channel = HttpEventChannel(
+        stand_in_server.url, Session(), HttpChannelMode.BATCH, max_batch_events=4
+    )
+    publish_events(events, channel)
+    assert [len(json.loads(body)) for _, body in stand_in_server.received] == [
+        4,
+        4,
+        2,
+    ]
+
+
+def test_batch_mode_must_respect_max_bytes(stand_in_server):
+    events = list(dummy_events(10))
+    max_bytes = 1000
+    channel = HttpEventChannel(
+        stand_in_server.url,
+        Session(),
+        HttpChannelMode.BATCH,
+        max_batch_bytes=max_bytes,
+    )
+    publish_events(events, channel)
+    assert len(stand_in_server.received) > 1
+    assert all(len(body) <= max_bytes for _, body in stand_in_server.received)
+    assert [
+        CloudEvent.parse_obj(e)
+        for _, body in stand_in_server.received
+        for e in json.loads(body)
+    ] == events
+
+
+def test_batches_must_send_an_event_bigger_than_max_bytes_alone():
+    events = list(dummy_events(3))
+    assert [len(batch) for batch in _batches(events, 100, 1)] == [1, 1, 1]
+
+
+def test_batches_of_no_events_must_be_empty():
+    assert list(_batches([], 100, 100)) == []
+
+
+def test_batch_limits_must_be_positive():
+    with pytest.raises(ValueError, match="venty.InvalidBatchLimits"):
+        HttpEventChannel(
+            "https://localhost:1337", Mock(), HttpChannelMode.BATCH, max_batch_events=0
+        )
+
+
+def test_serial_publishing_must_raise_on_error_status(stand_in_server):
+    stand_in_server.status = 500
+    channel = HttpEventChannel(stand_in_server.url, Session())
+    with pytest.raises(HTTPError):
+        publish_events(dummy_events(3), channel)
+    assert len(stand_in_server.received) == 1
+
+
+def test_concurrent_publishing_must_pipeline_requests(stand_in_server):
+    stand_in_server.delay = 0.2
+    channel = HttpEventChannel(
+        stand_in_server.url, pooled_session(10), max_in_flight=10
+    )
+    start = time.monotonic()
+    publish_events(dummy_events(10), channel)
+    assert time.monotonic() - start < 1
+    assert len(stand_in_server.received) == 10
+    channel.close()
+
+
+def test_concurrent_publishing_must_aggregate_all_errors(stand_in_server):
+    stand_in_server.status = 503
+    channel = HttpEventChannel(stand_in_server.url, pooled_session(4), max_in_flight=4)
+    with pytest.raises(HttpPublishError) as e:
+        publish_events(dummy_events(10), channel)
+    assert len(e.value.errors) == 10
+    assert all(isinstance(error, HTTPError) for error in e.value.errors)
+    assert len(stand_in_server.received) == 10
+    channel.close()
+
+
+def _subject_events(subject: str, amount: int):
+    return [
+        CloudEvent.create(
+            {"type": "my-type", "source": "my-source", "subject": subject},
+            {"i": i},
+        )
+        for i in range(amount)
+    ]
+
+
+def test_concurrent_publishing_must_preserve_subject_order(stand_in_server):
+    events = [
+        event
+        for pair in zip(_subject_events("a", 10), _subject_events("b", 10))
+        for event in pair
+    ]
+    channel = HttpEventChannel(
+        stand_in_server.url,
+        pooled_session(4),
+        HttpChannelMode.STRUCTURED,
+        max_in_flight=4,
+        preserve_subject_order=True,
+    )
+    publish_events(events, channel)
+    received = [json.loads(body) for _, body in stand_in_server.received]
+    for subject in ("a", "b"):
+        assert [e["data"]["i"] for e in received if e["subject"] == subject] == list(
+            range(10)
+        )
+    channel.close()
+
+
+def test_subject_groups_must_keep_events_without_subject_apart():
+    a = _subject_events("a", 2)
+    no_subject = list(dummy_events(2))
+    assert _subject_groups([a[0], no_subject[0], a[1], no_subject[1]]) == (
+        [a],
+        no_subject,
+    )
+
+
+def test_events_without_subject_must_be_batched_together(stand_in_server):
+    channel = HttpEventChannel(
+        stand_in_server.url,
+        pooled_session(2),
+        HttpChannelMode.BATCH,
+        max_in_flight=2,
+        preserve_subject_order=True,
+    )
+    publish_events(list(dummy_events(10)) + _subject_events("a", 2), channel)
+    assert sorted(len(json.loads(b)) for _, b in stand_in_server.received) == [2, 10]
+    channel.close()
+
+
+def test_max_in_flight_must_be_positive():
+    with pytest.raises(ValueError, match="venty.InvalidMaxInFlight"):
+        HttpEventChannel("https://localhost:1337", Mock(), max_in_flight=0)
+
+
+def _large_events(amount: int):
+    return [
+        CloudEvent.create(
+            {"type": "my-type", "source": "my-source"},
+            {"rows": [{"name": "venty", "value": i} for i in range(100)]},
+        )
+        for _ in range(amount)
+    ]
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [
+        (ContentEncoding.GZIP, gzip.decompress),
+        (ContentEncoding.DEFLATE, zlib.decompress),
+    ],
+)
+def test_batch_bodies_must_be_compressed(stand_in_server, encoding, decompress):
+    events = _large_events(10)
+    channel = HttpEventChannel(
+        stand_in_server.url,
+        Session(),
+        HttpChannelMode.BATCH,
+        content_encoding=encoding,
+    )
+    publish_events(events, channel)
+    ((headers, body),) = stand_in_server.received
+    assert headers["content-encoding"] == encoding.value
+    assert headers["content-type"] == "application/cloudevents-batch+json"
+    assert [CloudEvent.parse_obj(e) for e in json.loads(decompress(body))] == events
+
+
+def test_structured_bodies_must_be_compressed(stand_in_server):
+    (event,) = _large_events(1)
+    channel = HttpEventChannel(
+        stand_in_server.url,
+        Session(),
+        HttpChannelMode.STRUCTURED,
+        content_encoding=ContentEncoding.GZIP,
+        compression_level=9,
+    )
+    publish_event(event, channel)
+    ((headers, body),) = stand_in_server.received
+    assert headers["content-encoding"] == "gzip"
+    assert CloudEvent.parse_raw(gzip.decompress(body)) == event
+
+
+def test_bodies_below_compression_threshold_must_not_be_compressed(stand_in_server):
+    events = list(dummy_events(1))
+    channel = HttpEventChannel(
+        stand_in_server.url,
+        Session(),
+        HttpChannelMode.STRUCTURED,
+        content_encoding=ContentEncoding.GZIP,
+        compression_threshold=10_000,
+    )
+    publish_events(events, channel)
+    ((headers, body),) = stand_in_server.received
+    assert "content-encoding" not in headers
+    assert CloudEvent.parse_raw(body) == events[0]
+
+
+def test_binary_bodies_must_not_be_compressed():
+    session = Mock()
+    (event,) = _large_events(1)
+    channel = HttpEventChannel(
+        "https://localhost:1337",
+        session,
+        HttpChannelMode.BINARY,
+        content_encoding=ContentEncoding.GZIP,
+        compression_threshold=0,
+    )
+    publish_event(event, channel)
+    assert "content-encoding" not in session.post.call_args.kwargs["headers"]
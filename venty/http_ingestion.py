@@ -0,0 +1,316 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from cloudevents.abstract import CloudEvent
+from cloudevents.conversion import from_http
+
+from venty.cloudevent import CloudEvent as PydanticCloudEvent, from_structured_dict
+from venty.event_store import AppendRequest, EventStore, StreamState
+from venty.strong_types import StreamName
+
+_STRUCTURED_CONTENT_TYPE = "application/cloudevents+json"
+_BATCH_CONTENT_TYPE = "application/cloudevents-batch+json"
+
+StreamSelector = Callable[[CloudEvent], StreamName]
+
+
+class IngestionOverloaded(RuntimeError):
+    pass
+
+
+def decode_cloudevents(
+    headers: Mapping[str, str], body: bytes, event_type: Type[CloudEvent]
+) -> List[CloudEvent]:
+    """
+    Decodes a request of any of the CloudEvents http content modes.
+
+    :param headers: lower case header names.
+    """
+    content_type = headers.get("content-type", "")
+    if content_type.startswith(_BATCH_CONTENT_TYPE):
+        return [from_structured_dict(event_type, e) for e in json.loads(body)]
+    if content_type.startswith(_STRUCTURED_CONTENT_TYPE):
+        return [from_structured_dict(event_type, json.loads(body))]
+    return [from_http(event_type, headers, body)]
+
+
+@dataclass
+class _PendingWrite:
+    events: List[CloudEvent]
+    done: "Future[None]"
+
+
+def _streams(
+    writes: Iterable[_PendingWrite], stream_selector: StreamSelector
+) -> Dict[StreamName, List[CloudEvent]]:
+    result: Dict[StreamName, List[CloudEvent]] = {}
+    for write in writes:
+        for event in write.events:
+            result.setdefault(stream_selector(event), []).append(event)
+    return result
+
+
+class _GroupCommitter:
+    """
+    A single writer thread which appends the events of many concurrent requests
+    together, one append per stream, and completes every request once all of its
+    events were appended.
+    """
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        stream_selector: StreamSelector,
+        max_batch_events: int,
+        max_batch_delay: timedelta,
+        max_queue_size: int,
+        enqueue_timeout: timedelta,
+    ):
+        self._event_store = event_store
+        self._stream_selector = stream_selector
+        self._max_batch_events = max_batch_events
+        self._max_batch_delay = max_batch_delay.total_seconds()
+        self._enqueue_timeout = enqueue_timeout.total_seconds()
+        self._queue: "queue.Queue[Optional[_PendingWrite]]" = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._worker = threading.Thread(
+            target=self._run, name="venty-ingestion", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, events: List[CloudEvent], block: bool = True) -> "Future[None]":
+        """
+        :param block: whether to wait `enqueue_timeout` for room in the queue.
+        """
+        write = _PendingWrite(events=events, done=Future())
+        try:
+            self._queue.put(write, block=block, timeout=self._enqueue_timeout)
+        except queue.Full:
+            raise IngestionOverloaded()
+        return write.done
+
+    def _next_batch(self) -> Tuple[List[_PendingWrite], bool]:
+        """
+        :return: the batch, and whether the committer was closed.
+        """
+        first = self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        events = len(first.events)
+        deadline = time.monotonic() + self._max_batch_delay
+        while events < self._max_batch_events:
+            try:
+                write = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if write is None:
+                return batch, True
+            batch.append(write)
+            events += len(write.events)
+        return batch, False
+
+    def _commit(self, batch: List[_PendingWrite]) -> None:
+        try:
+            self._event_store.attempt_append_batch(
+                [
+                    AppendRequest(stream_name, StreamState.ANY, events)
+                    for stream_name, events in _streams(
+                        batch, self._stream_selector
+                    ).items()
+                ]
+            )
+        except Exception as e:
+            for write in batch:
+                write.done.set_exception(e)
+        else:
+            for write in batch:
+                write.done.set_result(None)
+
+    def _run(self) -> None:
+        closed = False
+        while not closed:
+            batch, closed = self._next_batch()
+            if batch:
+                self._commit(batch)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+
+_Response = Tuple[str, List[Tuple[str, str]], bytes]
+
+
+def _response(status: str, message: str = "") -> _Response:
+    body = message.encode()
+    headers = [("content-type", "text/plain"), ("content-length", str(len(body)))]
+    if status.startswith("503"):
+        headers.append(("retry-after", "1"))
+    return status, headers, body
+
+
+class IngestionApp:
+    """
+    Accepts CloudEvents over http in the binary, structured and batch content
+    modes, and appends them to an event store.
+
+    Events of concurrent requests are group committed by a single writer, in one
+    `attempt_append_batch` with an append per stream chosen by `stream_selector`.
+    A request is answered only after its events were appended. When
+    `max_queue_size` requests are already waiting to be written, new requests are
+    rejected with 503 after waiting `enqueue_timeout` for room. The ASGI
+    application waits for room in a worker thread, never on the event loop.
+
+    The instance is a WSGI application, `asgi` is the equivalent ASGI application.
+    """
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        stream_selector: StreamSelector,
+        *,
+        event_type: Type[CloudEvent] = PydanticCloudEvent,
+        max_batch_events: int = 1000,
+        max_batch_delay: timedelta = timedelta(milliseconds=2),
+        max_queue_size: int = 1000,
+        enqueue_timeout: timedelta = timedelta(seconds=1),
+    ):
+        if max_batch_events <= 0 or max_queue_size <= 0:
+            raise ValueError("venty.InvalidIngestionLimits")
+        self._event_type = event_type
+        self._committer = _GroupCommitter(
+            event_store,
+            stream_selector,
+            max_batch_events=max_batch_events,
+            max_batch_delay=max_batch_delay,
+            max_queue_size=max_queue_size,
+            enqueue_timeout=enqueue_timeout,
+        )
+
+    def _decode(
+        self, headers: Mapping[str, str], body: bytes
+    ) -> Optional[List[CloudEvent]]:
+        try:
+            return decode_cloudevents(headers, body, self._event_type)
+        except Exception:
+            return None
+
+    def _accept(
+        self, method: str, headers: Mapping[str, str], body: bytes
+    ) -> "List[CloudEvent] | _Response":
+        if method != "POST":
+            return _response("405 Method Not Allowed")
+        events = self._decode(headers, body)
+        if events is None:
+            return _response("400 Bad Request", "venty.InvalidCloudEvent")
+        return events
+
+    def _submit(
+        self, events: List[CloudEvent], block: bool = True
+    ) -> "Future[None] | _Response":
+        try:
+            return self._committer.submit(events, block=block)
+        except IngestionOverloaded:
+            return _response("503 Service Unavailable", "venty.IngestionOverloaded")
+
+    @staticmethod
+    def _written(done: "Future[None]") -> _Response:
+        if done.exception() is not None:
+            return _response("500 Internal Server Error")
+        return _response("204 No Content")
+
+    def __call__(
+        self, environ: Dict[str, Any], start_response: Callable
+    ) -> List[bytes]:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        # the body is decoded straight from the bytes read, without copies
+        body = environ["wsgi.input"].read(length) if length else b""
+        submitted = self._accept(
+            environ["REQUEST_METHOD"], _wsgi_headers(environ), body
+        )
+        if isinstance(submitted, list):
+            submitted = self._submit(submitted)
+        if isinstance(submitted, Future):
+            submitted = self._written(submitted)
+        status, headers, response_body = submitted
+        start_response(status, headers)
+        return [response_body]
+
+    async def asgi(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            return
+        body = await _asgi_body(receive)
+        submitted = self._accept(scope["method"], _asgi_headers(scope), body)
+        if isinstance(submitted, list):
+            events = submitted
+            submitted = self._submit(events, block=False)
+            if not isinstance(submitted, Future):
+                # the queue is full, waiting for room must not block the event loop
+                submitted = await asyncio.get_running_loop().run_in_executor(
+                    None, self._submit, events
+                )
+        if isinstance(submitted, Future):
+            # the event loop keeps serving other requests until the write is done
+            await asyncio.wait([asyncio.wrap_future(submitted)])
+            submitted = self._written(submitted)
+        status, headers, response_body = submitted
+        await send(
+            {
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [(k.encode(), v.encode()) for k, v in headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": response_body})
+
+    def close(self) -> None:
+        """
+        Writes every accepted request, then stops the writer.
+        """
+        self._committer.close()
+
+
+def _wsgi_headers(environ: Dict[str, Any]) -> Dict[str, str]:
+    result = {
+        key[5:].lower().replace("_", "-"): value
+        for key, value in environ.items()
+        if key.startswith("HTTP_")
+    }
+    if content_type := environ.get("CONTENT_TYPE"):
+        result["content-type"] = content_type
+    return result
+
+
+def _asgi_headers(scope: Dict[str, Any]) -> Dict[str, str]:
+    return {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+
+
+async def _asgi_body(receive: Callable) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    if len(chunks) == 1:
+        return chunks[0]
+    return b"".join(chunks)
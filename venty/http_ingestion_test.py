@@ -0,0 +1,281 @@
+import asyncio
+import io
+import threading
+from datetime import timedelta
+from socketserver import ThreadingMixIn
+from typing import List, Optional, Tuple
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import pytest
+from cloudevents.abstract import CloudEvent
+from cloudevents.conversion import to_structured
+from requests import Session
+
+from venty.event_channel import publish_events
+from venty.event_store import read_stream_no_metadata
+from venty.http_event_channel import HttpChannelMode, HttpEventChannel
+from venty.http_ingestion import IngestionApp
+from venty.in_memory_event_store import InMemoryEventStore
+from venty.strong_types import CommitPosition, StreamName
+from venty.strong_types_test import MY_STREAM_NAME, YOUR_STREAM_NAME, dummy_events
+
+
+def _my_stream(event: CloudEvent) -> StreamName:
+    return MY_STREAM_NAME
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _BlockingEventStore(InMemoryEventStore):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.appends = 0
+
+    def attempt_append_events(self, *args, **kwargs) -> Optional[CommitPosition]:
+        self.appends += 1
+        self.release.wait(timeout=5)
+        return super().attempt_append_events(*args, **kwargs)
+
+
+class _FailingEventStore(InMemoryEventStore):
+    def attempt_append_events(self, *args, **kwargs) -> Optional[CommitPosition]:
+        raise ConnectionError("database is down")
+
+
+def _call(
+    app: IngestionApp,
+    body: bytes = b"",
+    method: str = "POST",
+    content_type: str = "application/cloudevents+json",
+) -> Tuple[str, bytes]:
+    started = []
+    result = app(
+        {
+            "REQUEST_METHOD": method,
+            "CONTENT_TYPE": content_type,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+        },
+        lambda status, headers: started.append(status),
+    )
+    return started[0], b"".join(result)
+
+
+def _stream(store: InMemoryEventStore, stream_name: StreamName) -> List[CloudEvent]:
+    return list(read_stream_no_metadata(store, stream_name, stream_position=None))
+
+
+def _structured(event: CloudEvent) -> bytes:
+    _, body = to_structured(event)
+    return body
+
+
+@pytest.fixture
+def store():
+    return InMemoryEventStore()
+
+
+@pytest.fixture
+def serve(store):
+    servers = []
+
+    def _serve(app: IngestionApp) -> str:
+        server = make_server(
+            "127.0.0.1",
+            0,
+            app,
+            server_class=_ThreadingWSGIServer,
+            handler_class=_QuietHandler,
+        )
+        threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/"
+
+    yield _serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize(
+    "mode", [HttpChannelMode.BINARY, HttpChannelMode.STRUCTURED, HttpChannelMode.BATCH]
+)
+def test_events_of_every_content_mode_must_be_appended(store, serve, mode):
+    app = IngestionApp(store, _my_stream)
+    events = list(dummy_events(5))
+    with Session() as session:
+        publish_events(events, HttpEventChannel(serve(app), session, mode))
+    # wsgiref reports requests without a content type as text/plain
+    assert [(e["id"], e["time"], e.data) for e in _stream(store, MY_STREAM_NAME)] == [
+        (e["id"], e["time"], e.data) for e in events
+    ]
+    app.close()
+
+
+def test_events_must_be_appended_to_the_selected_streams(store):
+    events = list(dummy_events(4))
+    mine = {e["id"] for e in events[1::2]}
+    app = IngestionApp(
+        store, lambda e: MY_STREAM_NAME if e["id"] in mine else YOUR_STREAM_NAME
+    )
+    for event in events:
+        assert _call(app, _structured(event))[0] == "204 No Content"
+    assert _stream(store, MY_STREAM_NAME) == events[1::2]
+    assert _stream(store, YOUR_STREAM_NAME) == events[::2]
+    app.close()
+
+
+def test_concurrent_requests_must_be_group_committed():
+    store = _BlockingEventStore()
+    app = IngestionApp(store, _my_stream)
+    events = list(dummy_events(11))
+    statuses: List[str] = []
+    threads = [
+        threading.Thread(
+            target=lambda e=e: statuses.append(_call(app, _structured(e))[0])
+        )
+        for e in events
+    ]
+    threads[0].start()
+    while not store.appends:
+        threading.Event().wait(0.001)
+    # the writer is busy with the first request, so the rest are queued together
+    for thread in threads[1:]:
+        thread.start()
+    while app._committer._queue.qsize() < 10:
+        threading.Event().wait(0.001)
+    store.release.set()
+    for thread in threads:
+        thread.join()
+    assert statuses == ["204 No Content"] * 11
+    assert store.appends == 2
+    assert len(_stream(store, MY_STREAM_NAME)) == 11
+    app.close()
+
+
+def test_full_queue_must_be_rejected_with_retry_after():
+    store = _BlockingEventStore()
+    app = IngestionApp(
+        store, _my_stream, max_queue_size=1, enqueue_timeout=timedelta(0)
+    )
+    events = iter(dummy_events(3))
+    waiting = [
+        threading.Thread(target=_call, args=(app, _structured(next(events))))
+        for _ in range(2)
+    ]
+    waiting[0].start()
+    while not store.appends:
+        threading.Event().wait(0.001)
+    waiting[1].start()
+    while not app._committer._queue.full():
+        threading.Event().wait(0.001)
+    assert _call(app, _structured(next(events))) == (
+        "503 Service Unavailable",
+        b"venty.IngestionOverloaded",
+    )
+    store.release.set()
+    for thread in waiting:
+        thread.join()
+    app.close()
+
+
+def test_store_failure_must_be_reported_as_server_error():
+    app = IngestionApp(_FailingEventStore(), _my_stream)
+    event = next(iter(dummy_events(1)))
+    assert _call(app, _structured(event))[0] == "500 Internal Server Error"
+    app.close()
+
+
+def test_invalid_requests_must_be_rejected(store):
+    app = IngestionApp(store, _my_stream)
+    assert _call(app, b"{not json")[0] == "400 Bad Request"
+    assert _call(app, b"{}")[0] == "400 Bad Request"
+    assert _call(app, method="GET")[0] == "405 Method Not Allowed"
+    app.close()
+
+
+def test_close_must_write_every_accepted_request(store):
+    app = IngestionApp(store, _my_stream, max_batch_delay=timedelta(seconds=1))
+    events = list(dummy_events(3))
+    done = [app._committer.submit([event]) for event in events]
+    app.close()
+    assert all(future.done() for future in done)
+    assert _stream(store, MY_STREAM_NAME) == events
+
+
+async def _asgi_call(app: IngestionApp, body: bytes) -> int:
+    sent = []
+
+    async def _receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def _send(message):
+        sent.append(message)
+
+    await app.asgi(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": [(b"content-type", b"application/cloudevents+json")],
+        },
+        _receive,
+        _send,
+    )
+    return sent[0]["status"]
+
+
+def test_asgi_app_must_append_events(store):
+    app = IngestionApp(store, _my_stream)
+    body = _structured(next(iter(dummy_events(1))))
+    assert asyncio.run(_asgi_call(app, body)) == 204
+    assert len(_stream(store, MY_STREAM_NAME)) == 1
+    app.close()
+
+
+def test_asgi_app_must_not_block_the_event_loop_when_overloaded():
+    store = _BlockingEventStore()
+    app = IngestionApp(
+        store,
+        _my_stream,
+        max_queue_size=1,
+        enqueue_timeout=timedelta(milliseconds=300),
+    )
+    events = iter(dummy_events(3))
+    app._committer.submit([next(events)])
+    while not store.appends:
+        threading.Event().wait(0.001)
+    app._committer.submit([next(events)])
+
+    async def _overloaded_call() -> Tuple[int, float]:
+        ticks = []
+
+        async def _ticker():
+            while True:
+                ticks.append(asyncio.get_running_loop().time())
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(_ticker())
+        status = await _asgi_call(app, _structured(next(events)))
+        ticker.cancel()
+        return status, max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    status, longest_pause = asyncio.run(_overloaded_call())
+    assert status == 503
+    assert longest_pause < 0.2
+    store.release.set()
+    app.close()
+
+
+def test_limits_must_be_positive(store):
+    with pytest.raises(ValueError, match="venty.InvalidIngestionLimits"):
+        IngestionApp(store, _my_stream, max_queue_size=0)
@@ -0,0 +1,218 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+from fnmatch import fnmatchcase
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from cloudevents.abstract import CloudEvent
+
+from venty.event_channel import EventChannel, _ignore_error, _report_error
+
+
+class DispatchMode(Enum):
+    SYNC = "SYNC"
+    THREAD_POOL = "THREAD_POOL"
+
+
+@dataclass(frozen=True)
+class SubscriptionMetrics:
+    lag: int
+    delivered_events: int
+    dropped_events: int
+    failed_deliveries: int
+
+
+class Subscription:
+    """
+    Events of a single subscriber waiting to be delivered, in a ring buffer of
+    `buffer_size` events. When the subscriber falls behind, its oldest events are
+    dropped so the publisher never waits for it.
+    """
+
+    def __init__(
+        self,
+        broker: "InMemoryBrokerChannel",
+        type_pattern: str,
+        channel: EventChannel,
+        buffer_size: int,
+    ):
+        self.type_pattern = type_pattern
+        self.channel = channel
+        self._broker = broker
+        self._buffer: Deque[CloudEvent] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._delivering = False
+        self._drained = threading.Condition(self._lock)
+        self._delivered = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def _offer(self, events: List[CloudEvent]) -> bool:
+        """
+        :return: whether the caller must start delivering the buffer.
+        """
+        with self._lock:
+            self._dropped += max(
+                len(self._buffer) + len(events) - self._buffer.maxlen, 0
+            )
+            self._buffer.extend(events)
+            if self._delivering:
+                return False
+            self._delivering = True
+            return True
+
+    def _deliver(self, on_error: Callable[[Exception], None]) -> None:
+        """
+        Delivers until the buffer is empty. Only one delivery runs at a time, so
+        the subscriber receives events in publish order.
+        """
+        while True:
+            with self._lock:
+                if not self._buffer:
+                    self._delivering = False
+                    self._drained.notify_all()
+                    return
+                batch = list(self._buffer)
+                self._buffer.clear()
+            try:
+                self.channel.publish(batch)
+            except Exception as e:
+                with self._lock:
+                    self._failed += 1
+                _report_error(on_error, e)
+            else:
+                with self._lock:
+                    self._delivered += len(batch)
+
+    def _wait_drained(self, timeout: Optional[float]) -> bool:
+        with self._lock:
+            return self._drained.wait_for(
+                lambda: not self._buffer and not self._delivering, timeout=timeout
+            )
+
+    @property
+    def metrics(self) -> SubscriptionMetrics:
+        with self._lock:
+            return SubscriptionMetrics(
+                lag=len(self._buffer),
+                delivered_events=self._delivered,
+                dropped_events=self._dropped,
+                failed_deliveries=self._failed,
+            )
+
+    def unsubscribe(self) -> None:
+        self._broker._unsubscribe(self)
+
+
+class InMemoryBrokerChannel(EventChannel):
+    """
+    An in process publish subscribe bus. Every published event is delivered to
+    the channels of all the subscriptions whose type pattern it matches, using
+    `fnmatch` patterns such as `order.*`.
+
+    With `DispatchMode.SYNC` subscribers are called by the publishing thread, one
+    after the other, so a slow subscriber slows down the publisher.
+    With `DispatchMode.THREAD_POOL` subscribers are called by a pool of
+    `max_workers` threads and publishing only buffers the events, a subscriber
+    which falls behind loses its oldest events instead of stalling the publisher.
+
+    Errors of subscribers are passed to `on_error` and never reach the publisher.
+    """
+
+    def __init__(
+        self,
+        *,
+        dispatch_mode: DispatchMode = DispatchMode.THREAD_POOL,
+        buffer_size: int = 1000,
+        max_workers: Optional[int] = None,
+        on_error: Callable[[Exception], None] = _ignore_error,
+    ):
+        if buffer_size <= 0:
+            raise ValueError("venty.InvalidBufferSize")
+        self._buffer_size = buffer_size
+        self._on_error = on_error
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._matching: Dict[str, Tuple[Subscription, ...]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if dispatch_mode == DispatchMode.THREAD_POOL:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="venty-broker"
+            )
+
+    def subscribe(
+        self,
+        type_pattern: str,
+        channel: EventChannel,
+        *,
+        buffer_size: Optional[int] = None,
+    ) -> Subscription:
+        subscription = Subscription(
+            self, type_pattern, channel, buffer_size or self._buffer_size
+        )
+        with self._lock:
+            self._subscriptions += (subscription,)
+            self._matching = {}
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(
+                s for s in self._subscriptions if s is not subscription
+            )
+            self._matching = {}
+
+    def _subscriptions_of(self, type_: str) -> Tuple[Subscription, ...]:
+        matching = self._matching
+        if (result := matching.get(type_)) is None:
+            result = tuple(
+                s for s in self._subscriptions if fnmatchcase(type_, s.type_pattern)
+            )
+            matching[type_] = result
+        return result
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        routed: Dict[Subscription, List[CloudEvent]] = {}
+        for event in events:
+            for subscription in self._subscriptions_of(event["type"]):
+                routed.setdefault(subscription, []).append(event)
+        for subscription, subscription_events in routed.items():
+            if not subscription._offer(subscription_events):
+                continue  # already being delivered, which will pick these up
+            if self._executor is None:
+                subscription._deliver(self._on_error)
+            else:
+                self._executor.submit(subscription._deliver, self._on_error)
+
+    @property
+    def subscriptions(self) -> Tuple[Subscription, ...]:
+        return self._subscriptions
+
+    def flush(self, timeout: Optional[timedelta] = None) -> bool:
+        """
+        Waits until every subscription delivered its buffered events.
+
+        :return: False if the timeout expired first.
+        """
+        deadline = (
+            None if timeout is None else time.monotonic() + timeout.total_seconds()
+        )
+        for subscription in self._subscriptions:
+            remaining = (
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+            if not subscription._wait_drained(remaining):
+                return False
+        return True
+
+    def close(self) -> None:
+        """
+        Delivers the buffered events, then stops the workers.
+        """
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,132 @@
+import threading
+from datetime import timedelta
+from typing import Iterable
+
+import pytest
+from cloudevents.abstract import CloudEvent
+
+from venty.in_memory_broker_channel import (
+    DispatchMode,
+    InMemoryBrokerChannel,
+    SubscriptionMetrics,
+)
+from venty.in_memory_event_channel import InMemoryEventChannel
+from venty.strong_types_test import dummy_events
+
+
+class _GatedEventChannel(InMemoryEventChannel):
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        self.entered.set()
+        self.release.wait(timeout=5)
+        super().publish(events)
+
+
+class _FailingEventChannel(InMemoryEventChannel):
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        raise ConnectionError("subscriber is down")
+
+
+@pytest.mark.parametrize("mode", list(DispatchMode))
+def test_subscribers_must_receive_the_events_matching_their_pattern(mode):
+    broker = InMemoryBrokerChannel(dispatch_mode=mode)
+    orders, everything, none = (InMemoryEventChannel() for _ in range(3))
+    broker.subscribe("order.*", orders)
+    broker.subscribe("*", everything)
+    broker.subscribe("payment.*", none)
+    events = list(dummy_events(2, type_="order.created")) + list(
+        dummy_events(1, type_="shipment.sent")
+    )
+    broker.publish(events)
+    assert broker.flush(timedelta(seconds=5))
+    assert list(orders.published_events) == events[:2]
+    assert list(everything.published_events) == events
+    assert list(none.published_events) == []
+    broker.close()
+
+
+def test_slow_subscriber_must_not_stall_the_publisher_or_other_subscribers():
+    broker = InMemoryBrokerChannel(buffer_size=3)
+    slow = _GatedEventChannel()
+    fast = InMemoryEventChannel()
+    slow_subscription = broker.subscribe("*", slow)
+    broker.subscribe("*", fast, buffer_size=100)
+    events = list(dummy_events(6))
+    broker.publish(events[:1])
+    assert slow.entered.wait(timeout=5)
+    for event in events[1:]:
+        broker.publish([event])
+    broker.subscriptions[1]._wait_drained(timeout=5)
+    assert list(fast.published_events) == events
+    # the slow subscriber kept only the newest events it has room for
+    assert slow_subscription.metrics == SubscriptionMetrics(
+        lag=3, delivered_events=0, dropped_events=2, failed_deliveries=0
+    )
+    slow.release.set()
+    broker.close()
+    assert list(slow.published_events) == events[:1] + events[3:]
+    assert slow_subscription.metrics.delivered_events == 4
+
+
+def test_subscriber_errors_must_be_reported_and_counted():
+    errors = []
+    broker = InMemoryBrokerChannel(
+        dispatch_mode=DispatchMode.SYNC, on_error=errors.append
+    )
+    subscription = broker.subscribe("*", _FailingEventChannel())
+    working = InMemoryEventChannel()
+    broker.subscribe("*", working)
+    broker.publish(dummy_events(2))
+    assert len(errors) == 1
+    assert subscription.metrics.failed_deliveries == 1
+    assert len(working.published_events) == 2
+
+
+class _FailingOnceEventChannel(InMemoryEventChannel):
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        if not self.failed:
+            self.failed = True
+            raise ConnectionError("subscriber is down")
+        super().publish(events)
+
+
+@pytest.mark.parametrize("mode", list(DispatchMode))
+def test_raising_error_handler_must_not_stop_deliveries(mode):
+    def _on_error(error: Exception) -> None:
+        raise RuntimeError("handler failed")
+
+    broker = InMemoryBrokerChannel(dispatch_mode=mode, on_error=_on_error)
+    channel = _FailingOnceEventChannel()
+    subscription = broker.subscribe("*", channel)
+    broker.publish(dummy_events(1))
+    assert broker.flush(timedelta(seconds=5))
+    events = list(dummy_events(2))
+    broker.publish(events)
+    assert broker.flush(timedelta(seconds=5))
+    assert list(channel.published_events) == events
+    assert subscription.metrics.failed_deliveries == 1
+    broker.close()
+
+
+def test_unsubscribed_channel_must_not_receive_events():
+    broker = InMemoryBrokerChannel(dispatch_mode=DispatchMode.SYNC)
+    channel = InMemoryEventChannel()
+    subscription = broker.subscribe("*", channel)
+    broker.publish(dummy_events(1))
+    subscription.unsubscribe()
+    broker.publish(dummy_events(1))
+    assert len(channel.published_events) == 1
+    assert broker.subscriptions == ()
+
+
+def test_buffer_size_must_be_positive():
+    with pytest.raises(ValueError, match="venty.InvalidBufferSize"):
+        InMemoryBrokerChannel(buffer_size=0)
@@ -1,3 +1,4 @@
+import threading
 from datetime import timedelta
 from typing import Iterable, Optional, Dict, List, Sequence, Union, Literal
 
@@ -19,7 +20,6 @@ from venty.strong_types import (
 )
 from more_itertools import take
 
-
 _Streams = Dict[StreamName, List[RecordedEvent]]
 
 
@@ -95,6 +95,7 @@ class InMemoryEventStore(EventStore):
     def __init__(self):
         self._last_commit_position = CommitPosition(-1)
         self._streams: _Streams = {}
+        self._lock = threading.Lock()
 
     def attempt_append_events(
         self,
@@ -104,20 +105,23 @@ class InMemoryEventStore(EventStore):
         events: Iterable[CloudEvent],
         timeout: Optional[timedelta] = None,
     ) -> Optional[CommitPosition]:
-        if not _expected_version_correct(expected_version, stream_name, self._streams):
-            return None
-        consumed_events = list(iterate_with_timeout(events, timeout=timeout))
-        if stream_name not in self._streams:
-            self._streams[stream_name] = []
-        recorded = _recorded_events(
-            consumed_events,
-            self._last_commit_position,
-            _append_start_position(stream_name, self._streams),
-            stream_name,
-        )
-        self._streams[stream_name].extend(recorded)
-        self._last_commit_position += len(recorded)
-        return self._last_commit_position
+        with self._lock:
+            if not _expected_version_correct(
+                expected_version, stream_name, self._streams
+            ):
+                return None
+            consumed_events = list(iterate_with_timeout(events, timeout=timeout))
+            if stream_name not in self._streams:
+                self._streams[stream_name] = []
+            recorded = _recorded_events(
+                consumed_events,
+                self._last_commit_position,
+                _append_start_position(stream_name, self._streams),
+                stream_name,
+            )
+            self._streams[stream_name].extend(recorded)
+            self._last_commit_position += len(recorded)
+            return self._last_commit_position
 
     def read_streams(
         self,
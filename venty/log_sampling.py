@@ -0,0 +1,252 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+from logging import LogRecord
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from venty.event_logger import (
+    _DEFAULT_LOG_TYPE,
+    _DEBUG_SEVERITY_TEXT,
+    _ERROR_SEVERITY_TEXT,
+    _FATAL_SEVERITY_TEXT,
+    _INFO_SEVERITY_TEXT,
+    _TRACE_SEVERITY_TEXT,
+    _WARNING_SEVERITY_TEXT,
+    _severity_number,
+    _severity_text,
+)
+
+_SEVERITY_TEXTS = {
+    _TRACE_SEVERITY_TEXT,
+    _DEBUG_SEVERITY_TEXT,
+    _INFO_SEVERITY_TEXT,
+    _WARNING_SEVERITY_TEXT,
+    _ERROR_SEVERITY_TEXT,
+    _FATAL_SEVERITY_TEXT,
+}
+
+SAMPLING_SUMMARY_TYPE = "venty.LogSampled"
+
+# messages remembered for deduplication, the least recently logged are forgotten
+_MAX_REPEATS = 10_000
+
+
+class RateLimitKey(Enum):
+    LOGGER = "LOGGER"
+    TYPE = "TYPE"
+
+
+def _record_type(record: LogRecord) -> str:
+    """
+    The event type `VentyFormatter` gives the record.
+    """
+    if isinstance(record.msg, dict) and "type" in record.msg:
+        return record.msg["type"]
+    return getattr(record, "type", _DEFAULT_LOG_TYPE)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int, now: float):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = now
+
+    def take(self, now: float) -> bool:
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+@dataclass
+class _Repeats:
+    window_start: float
+    suppressed: int = 0
+
+
+@dataclass
+class _Counters:
+    sampled: int = 0
+    rate_limited: int = 0
+    deduplicated: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.sampled or self.rate_limited or self.deduplicated)
+
+
+class VentySamplingFilter(logging.Filter):
+    """
+    Drops log records before they are formatted, in order:
+
+    * Records of a severity are kept with the probability given in `sample_rates`,
+      keyed by the severity texts of the cloudevents severity extension.
+      Severities without a rate are always kept.
+    * Identical messages of a logger repeated within `dedup_window` are dropped.
+      The first repeat logged after the window carries the amount of repeats
+      dropped in a `repeated` field.
+    * Every logger, or every event type, may log `rate_limit` records per second
+      with bursts of up to `burst` records.
+
+    Once every `summary_interval` the amounts of dropped records are logged to
+    `summary_logger` as a `venty.LogSampled` event, which is never dropped.
+    Add the filter to the venty log handler and close it with the handler.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rates: Optional[Dict[str, float]] = None,
+        dedup_window: Optional[timedelta] = None,
+        rate_limit: Optional[float] = None,
+        burst: int = 10,
+        rate_limit_key: RateLimitKey = RateLimitKey.LOGGER,
+        summary_interval: timedelta = timedelta(minutes=1),
+        summary_logger: Optional[logging.Logger] = None,
+        summary_level: int = logging.WARNING,
+        clock: Callable[[], float] = time.monotonic,
+        random_: Callable[[], float] = random.random,
+    ):
+        super().__init__()
+        sample_rates = sample_rates or {}
+        if not set(sample_rates) <= _SEVERITY_TEXTS or not all(
+            0 <= rate <= 1 for rate in sample_rates.values()
+        ):
+            raise ValueError("venty.InvalidSampleRate")
+        if (rate_limit is not None and rate_limit <= 0) or burst <= 0:
+            raise ValueError("venty.InvalidRateLimit")
+        self._sample_rates = sample_rates
+        self._dedup_window = None
+        if dedup_window is not None:
+            self._dedup_window = dedup_window.total_seconds()
+        self._rate_limit = rate_limit
+        self._burst = burst
+        self._rate_limit_key = rate_limit_key
+        self._summary_interval = summary_interval.total_seconds()
+        self._summary_logger = summary_logger or logging.getLogger("venty.sampling")
+        self._summary_level = summary_level
+        self._clock = clock
+        self._random = random_
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._repeats: Dict[Tuple[Hashable, ...], _Repeats] = {}
+        self._counters = _Counters()
+        self._summary_due = clock() + self._summary_interval
+
+        self._closed = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="venty-sampling-summary", daemon=True
+        )
+        self._worker.start()
+
+    def _sampled_out(self, record: LogRecord) -> bool:
+        rate = self._sample_rates.get(
+            _severity_text(_severity_number(record.levelno)), 1.0
+        )
+        return rate < 1 and self._random() >= rate
+
+    def _duplicate(self, record: LogRecord, now: float) -> bool:
+        try:
+            message: Hashable = record.getMessage()
+        except Exception:
+            # the handler reports the bad format, the arguments may be unhashable
+            message = (str(record.msg), repr(record.args))
+        key = (record.name, record.levelno, message)
+        repeats = self._repeats.pop(key, None)
+        if repeats is not None and now - repeats.window_start < self._dedup_window:
+            repeats.suppressed += 1
+            self._repeats[key] = repeats
+            return True
+        if repeats is not None and repeats.suppressed:
+            record.repeated = repeats.suppressed
+        self._repeats[key] = _Repeats(window_start=now)
+        if len(self._repeats) > _MAX_REPEATS:
+            del self._repeats[next(iter(self._repeats))]
+        return False
+
+    def _rate_limited(self, record: LogRecord, now: float) -> bool:
+        if self._rate_limit_key == RateLimitKey.TYPE:
+            key = _record_type(record)
+        else:
+            key = record.name
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _TokenBucket(
+                self._rate_limit, self._burst, now
+            )
+        return not bucket.take(now)
+
+    def _drop(self, record: LogRecord, now: float) -> bool:
+        if self._sample_rates and self._sampled_out(record):
+            self._counters.sampled += 1
+            return True
+        if self._dedup_window is not None and self._duplicate(record, now):
+            self._counters.deduplicated += 1
+            return True
+        if self._rate_limit is not None and self._rate_limited(record, now):
+            self._counters.rate_limited += 1
+            return True
+        return False
+
+    def _take_summary(self, now: float, force: bool = False) -> Optional[_Counters]:
+        if now < self._summary_due and not force:
+            return None
+        self._summary_due = now + self._summary_interval
+        if self._dedup_window is not None:
+            # forget messages which are no longer repeated, their drops are summarized
+            self._repeats = {
+                k: v
+                for k, v in self._repeats.items()
+                if now - v.window_start < self._dedup_window
+            }
+        counters, self._counters = self._counters, _Counters()
+        return counters or None
+
+    def _log_summary(self, summary: Optional[_Counters]) -> None:
+        if summary is not None:
+            self._summary_logger.log(
+                self._summary_level,
+                "log records were dropped",
+                extra={
+                    "type": SAMPLING_SUMMARY_TYPE,
+                    "sampled": summary.sampled,
+                    "rate_limited": summary.rate_limited,
+                    "deduplicated": summary.deduplicated,
+                },
+            )
+
+    def _run(self) -> None:
+        while not self._closed.wait(self._summary_interval):
+            self.flush()
+
+    def filter(self, record: LogRecord) -> bool:
+        if _record_type(record) == SAMPLING_SUMMARY_TYPE:
+            return True
+        with self._lock:
+            now = self._clock()
+            dropped = self._drop(record, now)
+            summary = self._take_summary(now)
+        self._log_summary(summary)
+        return not dropped
+
+    def flush(self) -> None:
+        """
+        Logs the amounts of records dropped since the last summary.
+        """
+        with self._lock:
+            summary = self._take_summary(self._clock(), force=True)
+        self._log_summary(summary)
+
+    def close(self) -> None:
+        self._closed.set()
+        self._worker.join()
+        self.flush()
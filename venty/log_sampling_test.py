@@ -0,0 +1,172 @@
+import logging
+import time
+from datetime import timedelta
+from typing import List
+
+import pytest
+
+from venty import log_sampling
+from venty.log_sampling import (
+    SAMPLING_SUMMARY_TYPE,
+    RateLimitKey,
+    VentySamplingFilter,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _record(msg: str, level: int = logging.INFO, name: str = "my.logger", **extra):
+    result = logging.LogRecord(name, level, "/my/file.py", 7, msg, (), None)
+    result.__dict__.update(extra)
+    return result
+
+
+def _kept(sampling: VentySamplingFilter, *records: logging.LogRecord) -> List[str]:
+    return [r.getMessage() for r in records if sampling.filter(r)]
+
+
+def test_records_must_be_sampled_by_severity():
+    draws = iter([0.1, 0.6, 0.4, 0.9])
+    sampling = VentySamplingFilter(
+        sample_rates={"DEBUG": 0.5, "INFO": 0.0}, random_=lambda: next(draws)
+    )
+    assert _kept(
+        sampling,
+        _record("debug 1", logging.DEBUG),
+        _record("debug 2", logging.DEBUG),
+        _record("info", logging.INFO),
+        _record("warning", logging.WARNING),
+    ) == ["debug 1", "warning"]
+
+
+def test_repeated_messages_must_be_dropped_within_the_window():
+    clock = _FakeClock()
+    sampling = VentySamplingFilter(dedup_window=timedelta(seconds=10), clock=clock)
+    assert _kept(sampling, *(_record("disk full") for _ in range(4))) == ["disk full"]
+    assert _kept(sampling, _record("other")) == ["other"]
+    clock.now += 11
+    repeated = _record("disk full")
+    assert sampling.filter(repeated)
+    assert repeated.repeated == 3
+
+
+def test_badly_formatted_messages_must_be_deduplicated_by_their_arguments():
+    sampling = VentySamplingFilter(dedup_window=timedelta(seconds=10))
+    records = [_record("%d items", args=("many",)) for _ in range(2)]
+    records.append(_record("%d items", args=({"many": []},)))
+    assert [sampling.filter(r) for r in records] == [True, False, True]
+
+
+def test_repeated_messages_must_be_capped(monkeypatch):
+    monkeypatch.setattr(log_sampling, "_MAX_REPEATS", 2)
+    sampling = VentySamplingFilter(dedup_window=timedelta(seconds=10))
+    assert _kept(sampling, _record("a"), _record("b"), _record("a"), _record("c"))
+    assert _kept(sampling, _record("a"), _record("b")) == ["b"]
+
+
+def test_rate_limit_must_apply_per_logger_or_per_type():
+    clock = _FakeClock()
+    by_logger = VentySamplingFilter(rate_limit=1, burst=2, clock=clock)
+    assert _kept(
+        by_logger,
+        *(_record(f"a {i}", name="a") for i in range(3)),
+        _record("b", name="b"),
+    ) == ["a 0", "a 1", "b"]
+    clock.now += 1
+    assert _kept(by_logger, _record("a 3", name="a"), _record("a 4", name="a")) == [
+        "a 3"
+    ]
+
+    by_type = VentySamplingFilter(
+        rate_limit=1, burst=1, rate_limit_key=RateLimitKey.TYPE, clock=clock
+    )
+    assert _kept(
+        by_type,
+        _record("order 1", name="a", type="order.logged"),
+        _record("order 2", name="b", type="order.logged"),
+        _record("payment", name="a", type="payment.logged"),
+    ) == ["order 1", "payment"]
+
+
+def test_dropped_records_must_be_summarized_periodically():
+    clock = _FakeClock()
+    handler = _RecordingHandler()
+    summary_logger = logging.getLogger("venty.sampling.test")
+    summary_logger.addHandler(handler)
+    summary_logger.propagate = False
+    sampling = VentySamplingFilter(
+        sample_rates={"DEBUG": 0},
+        rate_limit=1,
+        burst=1,
+        summary_interval=timedelta(seconds=60),
+        summary_logger=summary_logger,
+        clock=clock,
+    )
+    handler.addFilter(sampling)
+    _kept(sampling, _record("debug", logging.DEBUG), _record("1"), _record("2"))
+    assert handler.records == []
+    clock.now += 61
+    _kept(sampling, _record("3"))
+    (summary,) = handler.records
+    assert summary.type == SAMPLING_SUMMARY_TYPE
+    assert (summary.sampled, summary.rate_limited, summary.deduplicated) == (1, 1, 0)
+    summary_logger.removeHandler(handler)
+
+
+def test_dropped_records_must_be_summarized_without_later_records():
+    handler = _RecordingHandler()
+    summary_logger = logging.getLogger("venty.sampling.test.idle")
+    summary_logger.addHandler(handler)
+    summary_logger.propagate = False
+    sampling = VentySamplingFilter(
+        sample_rates={"DEBUG": 0},
+        summary_interval=timedelta(milliseconds=10),
+        summary_logger=summary_logger,
+    )
+    _kept(sampling, _record("debug", logging.DEBUG))
+    deadline = time.monotonic() + 5
+    while not handler.records and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sampling.close()
+    (summary,) = handler.records
+    assert summary.sampled == 1
+    summary_logger.removeHandler(handler)
+
+
+def test_dropped_records_must_be_summarized_when_closed():
+    handler = _RecordingHandler()
+    summary_logger = logging.getLogger("venty.sampling.test.closed")
+    summary_logger.addHandler(handler)
+    summary_logger.propagate = False
+    sampling = VentySamplingFilter(
+        dedup_window=timedelta(seconds=10), summary_logger=summary_logger
+    )
+    _kept(sampling, _record("a"), _record("a"), _record("a"))
+    sampling.close()
+    (summary,) = handler.records
+    assert (summary.sampled, summary.rate_limited, summary.deduplicated) == (0, 0, 2)
+    summary_logger.removeHandler(handler)
+
+
+def test_invalid_rates_must_be_rejected():
+    with pytest.raises(ValueError, match="venty.InvalidSampleRate"):
+        VentySamplingFilter(sample_rates={"VERBOSE": 0.5})
+    with pytest.raises(ValueError, match="venty.InvalidSampleRate"):
+        VentySamplingFilter(sample_rates={"INFO": 2})
+    with pytest.raises(ValueError, match="venty.InvalidRateLimit"):
+        VentySamplingFilter(rate_limit=0)
@@ -1,5 +1,11 @@
+import mmap
+import os
+from contextlib import contextmanager
+from enum import Enum
 from hashlib import sha256
 from pathlib import Path
+from typing import ContextManager, Iterable, Iterator
+from uuid import uuid4
 
 
 class ObjectStorage:
@@ -9,18 +15,200 @@ class ObjectStorage:
     def get(self, key: str) -> bytes:
         raise NotImplementedError()
 
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        """
+        Deleting a key which does not exist MUST NOT raise.
+        """
+        raise NotImplementedError()
+
+    def put_stream(self, key: str, chunks: Iterable[bytes]) -> None:
+        """
+        Puts the concatenation of `chunks`, which storages may write without
+        holding the whole value in memory.
+        """
+        self.put(key, b"".join(chunks))
+
+    def open_read(self, key: str) -> ContextManager[memoryview]:
+        """
+        A view of the value, which storages may map instead of reading it into
+        memory. The view is released when the context exits, slices of it stay
+        valid and keep the value in memory until they are released themselves.
+        """
+        return _view_of(self.get(key))
+
+
+class FsLayout(Enum):
+    # every object in the root directory
+    FLAT = "FLAT"
+    # objects in two levels of directories named by the first hex digits of their
+    # file name, such as ab/cd/abcd..., for file systems slow with huge directories
+    SHARDED = "SHARDED"
+
+
+class Durability(Enum):
+    # writes are atomic, a crashed process never leaves a torn object
+    NONE = "NONE"
+    # the object is also flushed to the disk before it becomes visible
+    FILE = "FILE"
+    # the directory entry of the object is flushed to the disk as well, so the
+    # object survives a power loss once put returns
+    FULL = "FULL"
+
+
+@contextmanager
+def _view_of(value: bytes) -> Iterator[memoryview]:
+    with memoryview(value) as view:
+        yield view
+
+
+def _fsync_directory(directory: Path) -> None:
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # pragma: no cover # directories can not be opened on windows
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _object_path(root_dir: Path, name: str, layout: FsLayout) -> Path:
+    if layout == FsLayout.SHARDED:
+        return root_dir / name[:2] / name[2:4] / name
+    return root_dir / name
+
+
+def _object_files(root_dir: Path, layout: FsLayout) -> Iterable[Path]:
+    directories = [root_dir]
+    if layout == FsLayout.SHARDED:
+        directories = [d for s in root_dir.iterdir() if s.is_dir() for d in s.iterdir()]
+    for directory in directories:
+        for entry in os.scandir(directory):
+            # temporary files of unfinished writes start with a dot
+            if entry.is_file() and not entry.name.startswith("."):
+                yield Path(entry.path)
+
+
+def migrate_fs_layout(
+    root_dir: Path, from_layout: FsLayout, to_layout: FsLayout
+) -> int:
+    """
+    Moves the objects of a `FsObjectStorage` to another layout. Objects are moved
+    one by one and stay readable in their new layout, an interrupted migration
+    can be resumed by running it again.
+
+    :return: the amount of objects moved.
+    """
+    if from_layout == to_layout:
+        return 0
+    result = 0
+    for path in list(_object_files(root_dir, from_layout)):
+        target = _object_path(root_dir, path.name, to_layout)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+        result += 1
+    if from_layout == FsLayout.SHARDED:
+        for shard in [s for s in root_dir.iterdir() if s.is_dir()]:
+            for directory in [*shard.iterdir(), shard]:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    pass  # still has temporary files of unfinished writes
+    return result
+
 
 class FsObjectStorage(ObjectStorage):
-    def __init__(self, root_dir: Path):
+    """
+    Stores every object in a file named by the sha256 of its key.
+
+    Objects are written to a temporary file renamed over the object file, so
+    readers see either the previous or the new value, never a partial one.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        *,
+        layout: FsLayout = FsLayout.FLAT,
+        durability: Durability = Durability.NONE,
+    ):
+        """
+        :param layout: changing the layout of existing objects requires
+            `migrate_fs_layout`.
+        """
         self._root_dir = root_dir
         self._root_dir.mkdir(parents=True, exist_ok=True)
+        self._layout = layout
+        self._durability = durability
+
+    def _obj_file(self, key: str) -> Path:
+        return _object_path(
+            self._root_dir, sha256(key.encode()).hexdigest(), self._layout
+        )
 
     def put(self, key: str, value: bytes):
-        obj_file = self._root_dir / sha256(key.encode()).hexdigest()
-        with obj_file.open("wb") as f:
-            f.write(value)
+        self.put_stream(key, (value,))
+
+    def put_stream(self, key: str, chunks: Iterable[bytes]) -> None:
+        path = self._obj_file(key)
+        temporary = path.with_name(f".{path.name}.{uuid4().hex}")
+        try:
+            f = temporary.open("wb")
+        except FileNotFoundError:
+            # the first object of its shard
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = temporary.open("wb")
+        try:
+            with f:
+                for chunk in chunks:
+                    f.write(chunk)
+                if self._durability != Durability.NONE:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temporary, path)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+        if self._durability == Durability.FULL:
+            _fsync_directory(path.parent)
 
     def get(self, key: str) -> bytes:
-        obj_file = self._root_dir / sha256(key.encode()).hexdigest()
-        with obj_file.open("rb") as f:
+        with self._obj_file(key).open("rb") as f:
             return f.read()
+
+    @contextmanager
+    def open_read(self, key: str) -> Iterator[memoryview]:
+        """
+        Maps the object file into memory, so its pages are read on access and
+        are shared with the page cache rather than copied.
+        """
+        with self._obj_file(key).open("rb") as f:
+            # empty files can not be mapped
+            mapped = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if os.fstat(f.fileno()).st_size
+                else None
+            )
+        if mapped is None:
+            with memoryview(b"") as view:
+                yield view
+            return
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                # slices of the view are still alive, the mapping is closed once
+                # they are garbage collected
+                pass
+
+    def exists(self, key: str) -> bool:
+        return self._obj_file(key).is_file()
+
+    def delete(self, key: str) -> None:
+        self._obj_file(key).unlink(missing_ok=True)
@@ -0,0 +1,174 @@
+import mmap
+import os
+from typing import Dict
+
+import pytest
+
+from venty.object_storage import (
+    Durability,
+    FsLayout,
+    FsObjectStorage,
+    ObjectStorage,
+    migrate_fs_layout,
+)
+
+
+@pytest.fixture(params=list(FsLayout))
+def storage(tmp_path, request):
+    return FsObjectStorage(tmp_path / "objects", layout=request.param)
+
+
+def test_get_must_return_put_value(storage):
+    storage.put("my-key", b"hello")
+    assert storage.get("my-key") == b"hello"
+
+
+def test_put_must_overwrite_existing_value(storage):
+    storage.put("my-key", b"hello")
+    storage.put("my-key", b"world")
+    assert storage.get("my-key") == b"world"
+
+
+def test_exists(storage):
+    assert not storage.exists("my-key")
+    storage.put("my-key", b"hello")
+    assert storage.exists("my-key")
+
+
+def test_delete(storage):
+    storage.put("my-key", b"hello")
+    storage.delete("my-key")
+    assert not storage.exists("my-key")
+    storage.delete("my-key")
+
+
+def _files(root):
+    return sorted(p.relative_to(root) for p in root.rglob("*") if p.is_file())
+
+
+def test_sharded_layout_must_nest_objects_by_prefix(tmp_path):
+    storage = FsObjectStorage(tmp_path, layout=FsLayout.SHARDED)
+    storage.put("my-key", b"hello")
+    (path,) = _files(tmp_path)
+    assert path.parts == (path.name[:2], path.name[2:4], path.name)
+
+
+def test_failed_put_must_keep_the_previous_value(storage, tmp_path, monkeypatch):
+    storage.put("my-key", b"hello")
+
+    def _crash(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", _crash)
+    with pytest.raises(OSError, match="disk full"):
+        storage.put("my-key", b"world")
+    monkeypatch.undo()
+    assert storage.get("my-key") == b"hello"
+    assert len(_files(tmp_path)) == 1
+
+
+@pytest.mark.parametrize(
+    "durability, fsyncs",
+    [(Durability.NONE, 0), (Durability.FILE, 1), (Durability.FULL, 2)],
+)
+def test_durability_must_flush_to_disk(tmp_path, monkeypatch, durability, fsyncs):
+    calls = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd) or fsync(fd))
+    storage = FsObjectStorage(tmp_path, durability=durability)
+    storage.put("my-key", b"hello")
+    assert len(calls) == fsyncs
+    assert storage.get("my-key") == b"hello"
+
+
+def test_migration_must_keep_every_object_readable(tmp_path):
+    flat = FsObjectStorage(tmp_path)
+    for i in range(20):
+        flat.put(f"key-{i}", str(i).encode())
+    assert migrate_fs_layout(tmp_path, FsLayout.FLAT, FsLayout.SHARDED) == 20
+    sharded = FsObjectStorage(tmp_path, layout=FsLayout.SHARDED)
+    assert [sharded.get(f"key-{i}") for i in range(20)] == [
+        str(i).encode() for i in range(20)
+    ]
+    assert migrate_fs_layout(tmp_path, FsLayout.FLAT, FsLayout.SHARDED) == 0
+    assert migrate_fs_layout(tmp_path, FsLayout.SHARDED, FsLayout.FLAT) == 20
+    assert [flat.get(f"key-{i}") for i in range(20)] == [
+        str(i).encode() for i in range(20)
+    ]
+    assert all(p.is_file() for p in tmp_path.iterdir())
+
+
+def test_put_stream_must_write_the_chunks(storage):
+    storage.put_stream("my-key", (chunk for chunk in [b"hel", b"", b"lo"]))
+    assert storage.get("my-key") == b"hello"
+
+
+def test_failed_put_stream_must_keep_the_previous_value(storage, tmp_path):
+    storage.put("my-key", b"hello")
+
+    def _chunks():
+        yield b"wor"
+        raise OSError("connection lost")
+
+    with pytest.raises(OSError, match="connection lost"):
+        storage.put_stream("my-key", _chunks())
+    assert storage.get("my-key") == b"hello"
+    assert len(_files(tmp_path)) == 1
+
+
+def test_open_read_must_map_the_object(storage):
+    storage.put_stream("my-key", [b"x" * 4096, b"y" * 4096])
+    with storage.open_read("my-key") as view:
+        assert isinstance(view.obj, mmap.mmap)
+        assert len(view) == 8192
+        assert view[4095:4097] == b"xy"
+    with pytest.raises(ValueError):
+        view[0]
+
+
+def test_slices_of_the_view_must_outlive_the_context(storage):
+    storage.put("my-key", b"hello world")
+    with storage.open_read("my-key") as view:
+        head = view[:5]
+    assert head == b"hello"
+    head.release()
+
+
+def test_open_read_must_propagate_errors_of_the_context(storage):
+    storage.put("my-key", b"hello world")
+    with pytest.raises(KeyError, match="my-error"):
+        with storage.open_read("my-key") as view:
+            head = view[:5]
+            raise KeyError("my-error")
+    assert head == b"hello"
+
+
+def test_open_read_of_empty_object(storage):
+    storage.put("my-key", b"")
+    with storage.open_read("my-key") as view:
+        assert view == b""
+
+
+def test_open_read_of_missing_object_must_raise(storage):
+    with pytest.raises(FileNotFoundError):
+        with storage.open_read("my-key"):
+            pass
+
+
+class _DictObjectStorage(ObjectStorage):
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+
+    def put(self, key: str, value: bytes):
+        self.objects[key] = value
+
+    def get(self, key: str) -> bytes:
+        return self.objects[key]
+
+
+def test_streaming_must_default_to_put_and_get():
+    storage = _DictObjectStorage()
+    storage.put_stream("my-key", [b"hel", b"lo"])
+    assert storage.objects == {"my-key": b"hello"}
+    with storage.open_read("my-key") as view:
+        assert view == b"hello"
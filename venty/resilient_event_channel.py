@@ -0,0 +1,247 @@
+import threading
+import time
+from datetime import timedelta
+from enum import Enum
+from typing import Callable, Iterable, List, Optional, Tuple, Type
+
+from cloudevents.abstract import CloudEvent
+from cloudevents.conversion import from_json
+
+from venty.cloudevent import CloudEvent as PydanticCloudEvent, dump_structured_json
+from venty.event_channel import EventChannel
+from venty.object_storage import ObjectStorage
+
+
+class CircuitState(Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpen(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures, failing fast until
+    `reset_timeout` passed.
+    Then a single trial request is allowed (half open), its success closes the
+    circuit and its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: timedelta = timedelta(seconds=30),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout.total_seconds()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    def _state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at >= self._reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == CircuitState.HALF_OPEN:
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+                return True
+            return state == CircuitState.CLOSED
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state() == CircuitState.HALF_OPEN
+                or self._failures >= self._failure_threshold
+            ):
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        Allows another trial request when the allowed one ended before recording
+        its success or failure.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def _encode_batch(events: List[CloudEvent]) -> bytes:
+    # structured json never contains a raw new line
+    return b"\n".join(dump_structured_json(event) for event in events)
+
+
+def _decode_batch(value: bytes, event_type: Type[CloudEvent]) -> List[CloudEvent]:
+    return [from_json(event_type, line) for line in value.split(b"\n")]
+
+
+class _SpillQueue:
+    """
+    A FIFO of event batches persisted in an object storage, so batches which were
+    rejected survive a restart of the process.
+    """
+
+    def __init__(
+        self, storage: ObjectStorage, prefix: str, event_type: Type[CloudEvent]
+    ):
+        self._storage = storage
+        self._prefix = prefix
+        self._event_type = event_type
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}/{name}"
+
+    def _counter(self, name: str) -> int:
+        key = self._key(name)
+        if not self._storage.exists(key):
+            return 0
+        return int(self._storage.get(key))
+
+    def _set_counter(self, name: str, value: int) -> None:
+        self._storage.put(self._key(name), str(value).encode())
+
+    def __len__(self) -> int:
+        return self._counter("tail") - self._counter("head")
+
+    def push(self, events: List[CloudEvent]) -> None:
+        tail = self._counter("tail")
+        self._storage.put(self._key(str(tail)), _encode_batch(events))
+        self._set_counter("tail", tail + 1)
+
+    def peek(self) -> Optional[Tuple[int, List[CloudEvent]]]:
+        head = self._counter("head")
+        if head >= self._counter("tail"):
+            return None
+        value = self._storage.get(self._key(str(head)))
+        return head, _decode_batch(value, self._event_type)
+
+    def pop(self, index: int) -> None:
+        self._storage.delete(self._key(str(index)))
+        self._set_counter("head", index + 1)
+
+
+class ResilientEventChannel(EventChannel):
+    """
+    Retries failed publishing with exponential backoff, and stops calling the
+    wrapped channel while its circuit breaker is open.
+
+    Without a spill storage, a batch which could not be published raises the last
+    error, or `CircuitOpen` without calling the wrapped channel at all.
+    With a spill storage, such a batch is written to it instead, and spilled
+    batches are replayed in order before the next batch which is allowed through
+    the circuit breaker.
+    Replayed batches are delivered at least once, after newer batches which were
+    published while they were spilled.
+    """
+
+    def __init__(
+        self,
+        channel: EventChannel,
+        *,
+        max_attempts: int = 3,
+        initial_backoff: timedelta = timedelta(milliseconds=100),
+        max_backoff: timedelta = timedelta(seconds=5),
+        backoff_multiplier: float = 2.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        spill_storage: Optional[ObjectStorage] = None,
+        spill_prefix: str = "venty-spill",
+        event_type: Type[CloudEvent] = PydanticCloudEvent,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if max_attempts <= 0:
+            raise ValueError("venty.InvalidMaxAttempts")
+        self._channel = channel
+        self._max_attempts = max_attempts
+        self._initial_backoff = initial_backoff.total_seconds()
+        self._max_backoff = max_backoff.total_seconds()
+        self._backoff_multiplier = backoff_multiplier
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker()
+        self._circuit_breaker = circuit_breaker
+        self._spill: Optional[_SpillQueue] = None
+        if spill_storage is not None:
+            self._spill = _SpillQueue(spill_storage, spill_prefix, event_type)
+        self._spill_lock = threading.Lock()
+        self._sleep = sleep
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self._circuit_breaker
+
+    def spilled_batches(self) -> int:
+        if self._spill is None:
+            return 0
+        with self._spill_lock:
+            return len(self._spill)
+
+    def _publish_with_retries(self, events: List[CloudEvent]) -> None:
+        backoff = self._initial_backoff
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                self._channel.publish(events)
+            except Exception:
+                self._circuit_breaker.record_failure()
+                if (
+                    attempt == self._max_attempts
+                    or self._circuit_breaker.state != CircuitState.CLOSED
+                ):
+                    raise
+                self._sleep(backoff)
+                backoff = min(backoff * self._backoff_multiplier, self._max_backoff)
+            else:
+                self._circuit_breaker.record_success()
+                return
+
+    def _replay_spilled(self) -> None:
+        if self._spill is None:
+            return
+        with self._spill_lock:
+            while (spilled := self._spill.peek()) is not None:
+                index, events = spilled
+                self._publish_with_retries(events)
+                self._spill.pop(index)
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        batch = list(events)
+        if not batch:
+            return
+        try:
+            if not self._circuit_breaker.allow_request():
+                raise CircuitOpen()
+            try:
+                self._replay_spilled()
+                self._publish_with_retries(batch)
+            finally:
+                # such as when the spill storage failed
+                self._circuit_breaker.release_trial()
+        except Exception:
+            if self._spill is None:
+                raise
+            with self._spill_lock:
+                self._spill.push(batch)
@@ -0,0 +1,225 @@
+import time
+from datetime import timedelta
+from typing import Iterable
+
+import pytest
+from cloudevents.abstract import CloudEvent
+
+from venty.cloudevent import dump_structured_json
+from venty.event_channel import best_effort_publish_events
+from venty.in_memory_event_channel import InMemoryEventChannel
+from venty.object_storage import FsObjectStorage
+from venty.resilient_event_channel import (
+    CircuitBreaker,
+    CircuitOpen,
+    CircuitState,
+    ResilientEventChannel,
+)
+from venty.strong_types_test import dummy_events
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FlakyEventChannel(InMemoryEventChannel):
+    def __init__(self, failures: int = 0, delay: float = 0):
+        super().__init__()
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sink is down")
+        super().publish(events)
+
+
+@pytest.fixture
+def clock():
+    return _FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        failure_threshold=3, reset_timeout=timedelta(seconds=10), clock=clock
+    )
+
+
+def test_breaker_must_open_after_failure_threshold(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_success_must_reset_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_breaker_must_allow_a_single_trial_once_reset_timeout_passed(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_breaker_trial_success_must_close_the_circuit(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_breaker_trial_failure_must_open_the_circuit_again(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    clock.now += 9
+    assert breaker.state == CircuitState.OPEN
+    clock.now += 1
+    assert breaker.state == CircuitState.HALF_OPEN
+
+
+def test_must_retry_with_exponential_backoff():
+    sink = _FlakyEventChannel(failures=3)
+    sleeps = []
+    channel = ResilientEventChannel(
+        sink,
+        max_attempts=4,
+        initial_backoff=timedelta(seconds=1),
+        max_backoff=timedelta(seconds=3),
+        circuit_breaker=CircuitBreaker(failure_threshold=10),
+        sleep=sleeps.append,
+    )
+    events = list(dummy_events(3))
+    channel.publish(events)
+    assert sleeps == [1, 2, 3]
+    assert list(sink.published_events) == events
+
+
+def test_must_raise_last_error_once_attempts_exhausted():
+    sink = _FlakyEventChannel(failures=5)
+    channel = ResilientEventChannel(
+        sink,
+        max_attempts=2,
+        circuit_breaker=CircuitBreaker(failure_threshold=10),
+        sleep=lambda _: None,
+    )
+    with pytest.raises(ConnectionError):
+        channel.publish(dummy_events(1))
+    assert sink.calls == 2
+
+
+def test_must_fail_fast_while_circuit_is_open(breaker):
+    sink = _FlakyEventChannel(failures=100)
+    channel = ResilientEventChannel(
+        sink, max_attempts=5, circuit_breaker=breaker, sleep=lambda _: None
+    )
+    with pytest.raises(ConnectionError):
+        channel.publish(dummy_events(1))
+    assert sink.calls == 3
+    with pytest.raises(CircuitOpen):
+        channel.publish(dummy_events(1))
+    assert sink.calls == 3
+
+
+def test_open_circuit_must_not_pay_the_sink_latency(breaker):
+    sink = _FlakyEventChannel(failures=3, delay=0.1)
+    channel = ResilientEventChannel(sink, circuit_breaker=breaker, sleep=lambda _: None)
+    errors = []
+    events = list(dummy_events(1))
+    for _ in range(2):
+        best_effort_publish_events(events, channel, on_error=errors.append)
+    start = time.monotonic()
+    for _ in range(10000):
+        best_effort_publish_events(events, channel, on_error=errors.append)
+    assert time.monotonic() - start < 1
+    assert sink.calls == 3
+    assert all(isinstance(e, CircuitOpen) for e in errors[1:])
+
+
+def test_rejected_batches_must_be_spilled_and_replayed_on_recovery(
+    tmp_path, breaker, clock
+):
+    sink = _FlakyEventChannel(failures=3)
+    channel = ResilientEventChannel(
+        sink,
+        circuit_breaker=breaker,
+        spill_storage=FsObjectStorage(tmp_path),
+        sleep=lambda _: None,
+    )
+    events = list(dummy_events(9))
+    channel.publish(events[:3])
+    channel.publish(events[3:6])
+    assert channel.spilled_batches() == 2
+    assert sink.published_events == ()
+
+    clock.now += 10
+    channel.publish(events[6:])
+    assert channel.spilled_batches() == 0
+    assert list(sink.published_events) == events
+
+
+def test_spilled_batches_must_survive_a_new_channel(tmp_path, breaker):
+    events = list(dummy_events(3))
+    ResilientEventChannel(
+        _FlakyEventChannel(failures=3),
+        circuit_breaker=breaker,
+        spill_storage=FsObjectStorage(tmp_path),
+        sleep=lambda _: None,
+    ).publish(events)
+
+    sink = _FlakyEventChannel()
+    channel = ResilientEventChannel(sink, spill_storage=FsObjectStorage(tmp_path))
+    assert channel.spilled_batches() == 1
+    channel.publish([])
+    channel.publish(events[:1])
+    assert list(sink.published_events) == events + events[:1]
+
+
+def test_spill_storage_failure_must_not_keep_the_trial(tmp_path, breaker, clock):
+    storage = FsObjectStorage(tmp_path)
+    sink = _FlakyEventChannel(failures=3)
+    channel = ResilientEventChannel(
+        sink, circuit_breaker=breaker, spill_storage=storage, sleep=lambda _: None
+    )
+    events = list(dummy_events(3))
+    channel.publish(events[:1])
+    storage.put("venty-spill/0", b"not json")
+
+    clock.now += 10
+    channel.publish(events[1:2])
+    assert channel.spilled_batches() == 2
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    storage.put("venty-spill/0", dump_structured_json(events[0]))
+    channel.publish(events[2:])
+    assert list(sink.published_events) == events
+
+
+def test_max_attempts_must_be_positive():
+    with pytest.raises(ValueError, match="venty.InvalidMaxAttempts"):
+        ResilientEventChannel(InMemoryEventChannel(), max_attempts=0)
@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cloudevents.abstract import CloudEvent
+
+from venty.event_channel import EventChannel
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    All the given criteria must match for an event to be routed to the channel.
+    A route without criteria matches every event.
+    """
+
+    channel: EventChannel
+    type: Optional[str] = None
+    type_prefix: Optional[str] = None
+    subject: Optional[str] = None
+
+    def matches(self, type_: str, subject: Optional[str]) -> bool:
+        return (
+            (self.type is None or self.type == type_)
+            and (self.type_prefix is None or type_.startswith(self.type_prefix))
+            and (self.subject is None or self.subject == subject)
+        )
+
+
+class RoutingPublishError(Exception):
+    def __init__(self, failures: Dict[EventChannel, BaseException]):
+        super().__init__(f"publishing to {len(failures)} channels failed")
+        self.failures = failures
+
+
+_IndexedRoutes = Dict[str, List[Tuple[int, Route]]]
+
+
+def _index(
+    routes: Iterable[Tuple[int, Route]], key: str
+) -> Tuple[_IndexedRoutes, List[Tuple[int, Route]]]:
+    indexed: _IndexedRoutes = {}
+    rest = []
+    for i, route in routes:
+        value = getattr(route, key)
+        if value is None:
+            rest.append((i, route))
+        else:
+            indexed.setdefault(value, []).append((i, route))
+    return indexed, rest
+
+
+class _RoutingTable:
+    """
+    Every route is indexed by its most selective criterion, so looking up the
+    channels of an event costs a few dictionary lookups regardless of the amount
+    of routes. The remaining criteria are checked on the few candidates found.
+    """
+
+    def __init__(self, routes: Sequence[Route]):
+        self._by_type, rest = _index(enumerate(routes), "type")
+        self._by_prefix, rest = _index(rest, "type_prefix")
+        self._by_subject, self._catch_all = _index(rest, "subject")
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._by_prefix})
+
+    def _candidates(
+        self, type_: str, subject: Optional[str]
+    ) -> Iterable[Tuple[int, Route]]:
+        yield from self._by_type.get(type_, ())
+        for length in self._prefix_lengths:
+            if length > len(type_):
+                break
+            yield from self._by_prefix.get(type_[:length], ())
+        if subject is not None:
+            yield from self._by_subject.get(subject, ())
+        yield from self._catch_all
+
+    def channels(self, type_: str, subject: Optional[str]) -> Tuple[EventChannel, ...]:
+        matching = sorted(
+            (i, route.channel)
+            for i, route in self._candidates(type_, subject)
+            if route.matches(type_, subject)
+        )
+        # a channel matched by many routes receives the event once
+        return tuple(dict.fromkeys(channel for _, channel in matching))
+
+
+class RoutingEventChannel(EventChannel):
+    """
+    Routes every event to the channels of all the routes it matches, or to the
+    `default` channel when it matches none. Events matching no route without a
+    default channel are dropped.
+
+    Every channel receives its events in a single `publish` call, and channels
+    are published to in parallel. Failures of all channels are raised together as
+    a `RoutingPublishError` once every channel completed.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[Route],
+        *,
+        default: Optional[EventChannel] = None,
+        max_workers: Optional[int] = None,
+        cache_size: int = 4096,
+    ):
+        self._table = _RoutingTable(routes)
+        self._channels = lru_cache(maxsize=cache_size)(self._table.channels)
+        self._default: Tuple[EventChannel, ...] = ()
+        if default is not None:
+            self._default = (default,)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="venty-routing"
+        )
+
+    def _sub_batches(
+        self, events: Iterable[CloudEvent]
+    ) -> Dict[EventChannel, List[CloudEvent]]:
+        result: Dict[EventChannel, List[CloudEvent]] = {}
+        for event in events:
+            channels = self._channels(event["type"], event.get("subject"))
+            for channel in channels or self._default:
+                if channel not in result:
+                    result[channel] = []
+                result[channel].append(event)
+        return result
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        sub_batches = self._sub_batches(events)
+        failures: Dict[EventChannel, BaseException] = {}
+        if len(sub_batches) == 1:
+            # no need to pay for a thread switch
+            ((channel, batch),) = sub_batches.items()
+            try:
+                channel.publish(batch)
+            except Exception as e:
+                failures[channel] = e
+        else:
+            futures = {
+                channel: self._executor.submit(channel.publish, batch)
+                for channel, batch in sub_batches.items()
+            }
+            for channel, future in futures.items():
+                if (error := future.exception()) is not None:
+                    failures[channel] = error
+        if failures:
+            raise RoutingPublishError(failures)
+
+    def close(self) -> None:
+        self._executor.shutdown()
@@ -0,0 +1,135 @@
+import threading
+from typing import Iterable
+
+import pytest
+from cloudevents.abstract import CloudEvent
+from mock import Mock
+
+from venty.in_memory_event_channel import InMemoryEventChannel
+from venty.routing_event_channel import (
+    Route,
+    RoutingEventChannel,
+    RoutingPublishError,
+    _RoutingTable,
+)
+from venty.strong_types_test import dummy_events
+
+
+def _event(type_: str, subject: str = None) -> CloudEvent:
+    event = next(iter(dummy_events(1, type_=type_)))
+    if subject is not None:
+        event.subject = subject
+    return event
+
+
+class _BarrierEventChannel(InMemoryEventChannel):
+    """
+    Publishing completes only once all the channels sharing the barrier publish
+    at the same time.
+    """
+
+    def __init__(self, barrier: threading.Barrier):
+        super().__init__()
+        self._barrier = barrier
+
+    def publish(self, events: Iterable[CloudEvent]) -> None:
+        self._barrier.wait(timeout=5)
+        super().publish(events)
+
+
+def test_routing_table_must_match_exact_type_prefix_and_subject():
+    orders, payments, vip, everything = Mock(), Mock(), Mock(), Mock()
+    table = _RoutingTable(
+        [
+            Route(orders, type="order.created"),
+            Route(payments, type_prefix="payment."),
+            Route(vip, subject="vip"),
+            Route(everything),
+        ]
+    )
+    assert table.channels("order.created", None) == (orders, everything)
+    assert table.channels("order.deleted", None) == (everything,)
+    assert table.channels("payment.failed", "vip") == (payments, vip, everything)
+    assert table.channels("payment", None) == (everything,)
+
+
+def test_routing_table_must_require_all_criteria_of_a_route():
+    channel = Mock()
+    table = _RoutingTable([Route(channel, type_prefix="order.", subject="vip")])
+    assert table.channels("order.created", "vip") == (channel,)
+    assert table.channels("order.created", "regular") == ()
+    assert table.channels("payment.failed", "vip") == ()
+
+
+def test_routing_table_must_return_a_channel_once_and_in_route_order():
+    first, second = Mock(), Mock()
+    table = _RoutingTable(
+        [
+            Route(first, type_prefix="order."),
+            Route(second, type="order.created"),
+            Route(first, type_prefix="order.c"),
+        ]
+    )
+    assert table.channels("order.created", None) == (first, second)
+
+
+def test_every_channel_must_receive_its_events_in_one_publish_call():
+    orders = Mock()
+    payments = Mock()
+    channel = RoutingEventChannel(
+        [Route(orders, type_prefix="order."), Route(payments, type_prefix="payment.")]
+    )
+    events = [
+        _event("order.created"),
+        _event("payment.created"),
+        _event("order.deleted"),
+        _event("shipment.created"),
+    ]
+    channel.publish(events)
+    orders.publish.assert_called_once_with([events[0], events[2]])
+    payments.publish.assert_called_once_with([events[1]])
+
+
+def test_unmatched_events_must_go_to_the_default_channel():
+    orders = InMemoryEventChannel()
+    default = InMemoryEventChannel()
+    channel = RoutingEventChannel(
+        [Route(orders, type="order.created")], default=default
+    )
+    events = [_event("order.created"), _event("shipment.created")]
+    channel.publish(events)
+    assert list(orders.published_events) == events[:1]
+    assert list(default.published_events) == events[1:]
+
+
+def test_channels_must_be_published_to_in_parallel():
+    barrier = threading.Barrier(3)
+    sinks = [_BarrierEventChannel(barrier) for _ in range(3)]
+    channel = RoutingEventChannel(
+        [Route(sink, type=f"type-{i}") for i, sink in enumerate(sinks)]
+    )
+    channel.publish([_event(f"type-{i}") for i in range(3)])
+    assert all(len(sink.published_events) == 1 for sink in sinks)
+    channel.close()
+
+
+def test_failures_must_be_reported_per_channel():
+    failing = Mock()
+    error = ConnectionError("sink is down")
+    failing.publish.side_effect = error
+    working = InMemoryEventChannel()
+    channel = RoutingEventChannel([Route(failing, type="a"), Route(working, type="b")])
+    with pytest.raises(RoutingPublishError) as e:
+        channel.publish([_event("a"), _event("b")])
+    assert e.value.failures == {failing: error}
+    assert len(working.published_events) == 1
+
+
+def test_failure_of_a_single_channel_must_be_reported():
+    failing = Mock()
+    error = ConnectionError("sink is down")
+    failing.publish.side_effect = error
+    channel = RoutingEventChannel([Route(failing)])
+    with pytest.raises(RoutingPublishError) as e:
+        channel.publish([_event("a")])
+    assert e.value.failures == {failing: error}
@@ -6,3 +6,13 @@ SQL_RECORDED_EVENTS_TABLE_NAME_DEFAULT = "venty_recorded_events_v2"
 SQL_RECORDED_EVENTS_TABLE_NAME = os.environ.get(
     SQL_RECORDED_EVENTS_TABLE_NAME_KEY, SQL_RECORDED_EVENTS_TABLE_NAME_DEFAULT
 )
+
+SQL_OUTBOX_TABLE_NAME_KEY = "VENTY_SQL_OUTBOX_TABLE_NAME"
+SQL_OUTBOX_TABLE_NAME_DEFAULT = "venty_outbox"
+SQL_OUTBOX_TABLE_NAME = os.environ.get(
+    SQL_OUTBOX_TABLE_NAME_KEY, SQL_OUTBOX_TABLE_NAME_DEFAULT
+)
+
+JSON_BACKEND_KEY = "VENTY_JSON_BACKEND"
+JSON_BACKEND_DEFAULT = "pydantic"
+JSON_BACKEND = os.environ.get(JSON_BACKEND_KEY, JSON_BACKEND_DEFAULT)
@@ -1,10 +1,13 @@
 import json
+import sys
+import time
+from functools import partial
 from uuid import uuid5, UUID
 
 from pydantic import BaseModel
 from sqlalchemy.exc import IntegrityError
 
-from venty.settings import SQL_RECORDED_EVENTS_TABLE_NAME
+from venty.settings import SQL_RECORDED_EVENTS_TABLE_NAME, SQL_OUTBOX_TABLE_NAME
 from venty.timing import assert_timeout_not_supported
 
 try:
@@ -16,7 +19,8 @@ except ImportError:  # pragma: no cover # hard to test
 
 
 from datetime import timedelta
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, select
+from sqlalchemy.sql.expression import ColumnElement
 from typing import (
     Iterable,
     Optional,
@@ -27,22 +31,27 @@ from typing import (
     Tuple,
     Dict,
     Type,
+    List,
 )
 
-from venty.cloudevent import CloudEvent
-from cloudevents.conversion import from_json, to_json
+from venty.cloudevent import CloudEvent, dump_event_json
+from cloudevents.conversion import from_json
 from sqlalchemy import (
     Column,
     Integer,
     BINARY,
     Text,
     UniqueConstraint,
+    Float,
+    ForeignKey,
+    String,
 )
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from venty import EventStore
 from venty.event_store import (
+    AppendRequest,
     ExpectedVersion,
     is_stream_version_correct,
     StreamState,
@@ -58,6 +67,8 @@ from venty.strong_types import (
 
 Base = declarative_base()
 
+EventDecoder = Callable[[Union[str, bytes]], CloudEvent]
+
 
 class RecordedEventRow(Base):
     __tablename__ = SQL_RECORDED_EVENTS_TABLE_NAME
@@ -74,6 +85,23 @@ class RecordedEventRow(Base):
     )
 
 
+class OutboxRow(Base):
+    """
+    An event waiting to be published, written in the same transaction as the
+    recorded event itself.
+    """
+
+    __tablename__ = SQL_OUTBOX_TABLE_NAME
+    id: int = Column(Integer, primary_key=True)
+    recorded_event_id: CommitPosition = Column(
+        Integer, ForeignKey(RecordedEventRow.id), nullable=False
+    )
+    created_at: float = Column(Float, nullable=False)
+    claim_token: Optional[str] = Column(String(32), nullable=True)
+    claimed_until: Optional[float] = Column(Float, nullable=True)
+    delivered_at: Optional[float] = Column(Float, nullable=True, index=True)
+
+
 _uuid_base = UUID("c3569d87-e091-4757-92e6-e2da40e00129")
 
 
@@ -114,7 +142,7 @@ def _record_event_rows(
         RecordedEventRow(
             stream_id=stream_id,
             stream_position=last_stream_position + 1 + i,
-            event=event.json(exclude_none=True),
+            event=dump_event_json(event),
         )
         for i, event in enumerate(events)
     ]
@@ -123,7 +151,7 @@ def _record_event_rows(
 def _row_to_recorded_event(
     event_row: RecordedEventRow,
     stream_name_map: Dict[bytes, StreamName],
-    event_type: Type[CloudEvent],
+    event_decoder: EventDecoder,
 ) -> RecordedEvent:
     return RecordedEvent(
         commit_position=CommitPosition(
@@ -133,26 +161,48 @@ def _row_to_recorded_event(
             event_row.stream_position,
         ),
         stream_name=stream_name_map[bytes(event_row.stream_id)],
-        event=from_json(
-            event_type,
-            event_row.event,
-        ),
+        event=event_decoder(event_row.event),
     )
 
 
+def _stream_conditions(
+    stream_name: StreamName, instruction: ReadInstruction, backwards: bool
+) -> List[ColumnElement]:
+    """
+    The stream position is inclusive and the limit is the amount of events read,
+    matching the in memory event store: backwards reads return the last events
+    from the stream position on.
+    """
+    stream_id = _stream_id(stream_name)
+    start = max(int(instruction.stream_position_or_default), 0)
+    result = [
+        RecordedEventRow.stream_id == stream_id,
+        RecordedEventRow.stream_position >= start,
+    ]
+    if instruction.limit >= sys.maxsize - start:
+        # an unbounded limit would overflow the sql integer type
+        return result
+    if backwards:
+        row = aliased(RecordedEventRow)
+        last = (
+            select(func.max(row.stream_position))
+            .where(row.stream_id == stream_id)
+            .scalar_subquery()
+        )
+        result.append(RecordedEventRow.stream_position > last - instruction.limit)
+    else:
+        result.append(RecordedEventRow.stream_position < start + instruction.limit)
+    return result
+
+
 def _query_streams(
     session: Session,
     instructions: Dict[StreamName, ReadInstruction],
     backwards: bool,
-    event_type: Type[CloudEvent],
+    event_decoder: EventDecoder,
 ) -> Iterable[RecordedEvent]:
     or_conditions = [
-        and_(
-            RecordedEventRow.stream_id == _stream_id(stream_name),
-            RecordedEventRow.stream_position >= instruction.stream_position_or_default,
-            RecordedEventRow.stream_position
-            <= instruction.stream_position_or_default + instruction.limit,
-        )
+        and_(*_stream_conditions(stream_name, instruction, backwards))
         for stream_name, instruction in instructions.items()
     ]
     stream_name_map = {
@@ -163,7 +213,7 @@ def _query_streams(
         _row_to_recorded_event(
             recorded_row,  # noqa
             stream_name_map,
-            event_type,
+            event_decoder,
         )
         for recorded_row in session.query(RecordedEventRow)
         .filter(or_(*or_conditions))
@@ -187,11 +237,20 @@ def _last_stream_position(
     return stream_position  # type: ignore
 
 
+def _outbox_rows(row_records: Sequence[RecordedEventRow]) -> Sequence[OutboxRow]:
+    created_at = time.time()
+    return [
+        OutboxRow(recorded_event_id=row.id, created_at=created_at)
+        for row in row_records
+    ]
+
+
 def _commit_append_events(
     stream_name: StreamName,
     expected_version: ExpectedVersion,
     events: Sequence[CloudEvent],
     session: Session,
+    outbox: bool,
 ) -> Optional[CommitPosition]:
     stream_version, stream_id = _stream_metadata(stream_name, session)
     if not is_stream_version_correct(expected_version, lambda: stream_version):
@@ -205,17 +264,79 @@ def _commit_append_events(
         stream_id=stream_id,
     )
     session.add_all(row_records)
+    if outbox:
+        session.flush()  # assigns the ids the outbox rows refer to
+        session.add_all(_outbox_rows(row_records))
     session.commit()
     return _highest_commit_position(row_records)
 
 
+_StreamVersion = Union[StreamVersion, Literal[StreamState.NO_STREAM]]
+
+
+def _commit_append_batch(
+    requests: Sequence[AppendRequest],
+    session: Session,
+    outbox: bool,
+) -> List[Optional[CommitPosition]]:
+    versions: Dict[StreamName, _StreamVersion] = {}
+    appended: List[Optional[Sequence[RecordedEventRow]]] = []
+    for request in requests:
+        if request.stream_name not in versions:
+            versions[request.stream_name], _ = _stream_metadata(
+                request.stream_name, session
+            )
+        stream_version = versions[request.stream_name]
+        if not request.events or not is_stream_version_correct(
+            request.expected_version, lambda: stream_version
+        ):
+            appended.append(None)
+            continue
+        last_stream_position = _last_stream_position(stream_version)
+        row_records = _record_event_rows(
+            events=request.events,
+            last_stream_position=last_stream_position,
+            stream_id=_stream_id(request.stream_name),
+        )
+        # later requests of the batch are checked against this append
+        versions[request.stream_name] = StreamVersion(
+            last_stream_position + len(row_records)
+        )
+        session.add_all(row_records)
+        appended.append(row_records)
+    session.flush()  # assigns the commit positions
+    if outbox:
+        session.add_all(
+            _outbox_rows([row for rows in appended if rows is not None for row in rows])
+        )
+    session.commit()
+    return [
+        None if rows is None else _highest_commit_position(rows) for rows in appended
+    ]
+
+
 class SqlEventStore(EventStore):
 
     def __init__(
-        self, session_factory: Callable[[], Session], event_type: Type[CloudEvent]
+        self,
+        session_factory: Callable[[], Session],
+        event_type: Type[CloudEvent],
+        *,
+        outbox: bool = False,
+        event_decoder: Optional[EventDecoder] = None,
     ):
+        """
+        :param outbox: when set, every appended event is also written to the outbox
+            table in the same transaction, to be published by a `SqlOutboxRelay`.
+        :param event_decoder: decodes the stored json of every read event, such as
+            `EventTypeRegistry.decode` to read every event as its own subclass.
+            Defaults to decoding every event as `event_type`.
+        """
         self._session_factory = session_factory
-        self._event_type = event_type
+        if event_decoder is None:
+            event_decoder = partial(from_json, event_type)
+        self._event_decoder = event_decoder
+        self._outbox = outbox
 
     def attempt_append_events(
         self,
@@ -233,11 +354,37 @@ class SqlEventStore(EventStore):
             with self._session_factory() as session:
                 try:
                     return _commit_append_events(
-                        stream_name, expected_version, consumed_events, session
+                        stream_name,
+                        expected_version,
+                        consumed_events,
+                        session,
+                        self._outbox,
                     )
                 except IntegrityError as e:
                     session.rollback()
 
+    def attempt_append_batch(
+        self,
+        requests: Sequence[AppendRequest],
+        *,
+        timeout: Optional[timedelta] = None,
+    ) -> List[Optional[CommitPosition]]:
+        """
+        All the successful requests are committed in a single transaction.
+        """
+        assert_timeout_not_supported(timeout)
+        requests = [
+            AppendRequest(r.stream_name, r.expected_version, list(r.events))
+            for r in requests
+        ]
+        while True:
+            with self._session_factory() as session:
+                try:
+                    return _commit_append_batch(requests, session, self._outbox)
+                except IntegrityError:
+                    # a concurrent append took some of the stream positions
+                    session.rollback()
+
     def read_streams(
         self,
         instructions: Dict[StreamName, ReadInstruction],
@@ -246,8 +393,18 @@ class SqlEventStore(EventStore):
         timeout: Optional[timedelta] = None,
     ) -> Iterable[RecordedEvent]:
         assert_timeout_not_supported(timeout)
+        return self._read_streams(instructions, backwards)
+
+    def _read_streams(
+        self, instructions: Dict[StreamName, ReadInstruction], backwards: bool
+    ) -> Iterable[RecordedEvent]:
+        # the session stays open while the events are iterated, so its connection
+        # is back in the pool once they are consumed rather than once it is
+        # garbage collected
         with self._session_factory() as session:
-            return _query_streams(session, instructions, backwards, self._event_type)
+            yield from _query_streams(
+                session, instructions, backwards, self._event_decoder
+            )
 
     def commit_position(self) -> CommitPosition:
         with self._session_factory() as session:
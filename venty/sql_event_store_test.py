@@ -1,4 +1,5 @@
-from typing import Callable, Any
+import sys
+from typing import Callable, Any, Dict, Literal
 from uuid import UUID
 
 import pytest
@@ -7,8 +8,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from venty import attempt_append_events
-from venty.event_store import append_events, StreamState, read_stream_no_metadata
-from venty.sql_event_store import Base, SqlEventStore
+from venty.classification import EventTypeRegistry
+from venty.event_store import (
+    AppendRequest,
+    append_events,
+    StreamState,
+    read_stream,
+    read_stream_no_metadata,
+)
+from venty.in_memory_event_store import InMemoryEventStore
+from venty.sql_event_store import Base, OutboxRow, SqlEventStore
 from venty.strong_types import NO_EVENT_VERSION, StreamVersion
 from venty.strong_types_test import dummy_events, MY_STREAM_NAME, YOUR_STREAM_NAME
 
@@ -244,3 +253,121 @@ def test_append_event_must_return_none_even_if_during_operation_some_other_trans
         )
         is None
     )
+
+
+def test_read_with_limit_must_read_exactly_limit_events_from_position(
+    session_factory,
+):
+    store = SqlEventStore(session_factory, CloudEvent)
+    events = list(dummy_events(10))
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.NO_STREAM, events=events
+    )
+    assert (
+        list(
+            read_stream_no_metadata(
+                store, MY_STREAM_NAME, stream_position=None, limit=3
+            )
+        )
+        == events[:3]
+    )
+    assert (
+        list(
+            read_stream_no_metadata(
+                store, MY_STREAM_NAME, stream_position=StreamVersion(4), limit=3
+            )
+        )
+        == events[4:7]
+    )
+    assert (
+        list(
+            read_stream_no_metadata(
+                store, MY_STREAM_NAME, stream_position=StreamVersion(8)
+            )
+        )
+        == events[8:]
+    )
+
+
+def test_append_batch_must_check_versions_within_the_batch(session_factory):
+    store = SqlEventStore(session_factory, CloudEvent, outbox=True)
+    events = list(dummy_events(6))
+    results = store.attempt_append_batch(
+        [
+            AppendRequest(MY_STREAM_NAME, StreamState.NO_STREAM, events[:2]),
+            AppendRequest(MY_STREAM_NAME, StreamState.NO_STREAM, events[2:3]),
+            AppendRequest(YOUR_STREAM_NAME, StreamState.ANY, events[3:4]),
+            AppendRequest(MY_STREAM_NAME, StreamVersion(1), events[4:]),
+        ]
+    )
+    assert results == [2, None, 3, 5]
+    assert (
+        list(read_stream_no_metadata(store, MY_STREAM_NAME, stream_position=None))
+        == events[:2] + events[4:]
+    )
+    with session_factory() as session:
+        assert session.query(OutboxRow).count() == 5
+
+
+class OrderCreated(CloudEvent):
+    type: Literal["order.created"] = "order.created"
+    data: Dict[str, int]
+
+
+def test_event_decoder_must_decode_every_read_event(session_factory):
+    registry = EventTypeRegistry([OrderCreated])
+    store = SqlEventStore(session_factory, CloudEvent, event_decoder=registry.decode)
+    events = [
+        CloudEvent.create({"type": "order.created", "source": "s"}, {"order": 1}),
+        CloudEvent.create({"type": "other", "source": "s"}, {"order": 2}),
+    ]
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=events
+    )
+    stored = list(read_stream_no_metadata(store, MY_STREAM_NAME, stream_position=None))
+    assert [type(e) for e in stored] == [OrderCreated, CloudEvent]
+    assert stored == [registry.classify(e) for e in events]
+
+
+def test_read_events_must_return_the_connection_once_consumed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+    Base.metadata.create_all(engine)
+    store = SqlEventStore(sessionmaker(engine), CloudEvent)
+    events = list(dummy_events(3))
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=events
+    )
+    read = list(read_stream_no_metadata(store, MY_STREAM_NAME, stream_position=None))
+    assert read == events
+    assert engine.pool.checkedout() == 0
+
+
+@pytest.mark.parametrize("backwards", [False, True])
+@pytest.mark.parametrize("stream_position", [None, StreamVersion(4)])
+@pytest.mark.parametrize("limit", [3, sys.maxsize])
+def test_reads_must_match_the_in_memory_event_store(
+    session_factory, backwards, stream_position, limit
+):
+    stores = [SqlEventStore(session_factory, CloudEvent), InMemoryEventStore()]
+    events = list(dummy_events(10))
+    for store in stores:
+        append_events(
+            store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=events
+        )
+        append_events(
+            store, YOUR_STREAM_NAME, expected_version=StreamState.ANY, events=events
+        )
+    sql, in_memory = [
+        [
+            e.stream_position
+            for e in read_stream(
+                store,
+                MY_STREAM_NAME,
+                stream_position=stream_position,
+                limit=limit,
+                backwards=backwards,
+            )
+        ]
+        for store in stores
+    ]
+    assert sql == in_memory
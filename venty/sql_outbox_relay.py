@@ -0,0 +1,147 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Optional, Type
+from uuid import uuid4
+
+from cloudevents.conversion import from_json
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from venty.cloudevent import CloudEvent
+from venty.event_channel import EventChannel, _ignore_error, _report_error
+from venty.sql_event_store import OutboxRow, RecordedEventRow
+
+
+@dataclass(frozen=True)
+class OutboxLag:
+    pending_events: int
+    oldest_pending_age: Optional[timedelta]
+
+
+class SqlOutboxRelay:
+    """
+    Publishes the events of the outbox table written by a `SqlEventStore` with an
+    outbox, and marks them as delivered.
+
+    Many relays may run against the same table, every batch is claimed by a single
+    relay at a time. A claimed batch which was not delivered within
+    `claim_timeout`, for example because its relay crashed or failed publishing,
+    is claimed again, so events are delivered at least once.
+    With many relays, events are no longer published in commit order.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        channel: EventChannel,
+        event_type: Type[CloudEvent],
+        *,
+        batch_size: int = 100,
+        poll_interval: timedelta = timedelta(seconds=1),
+        claim_timeout: timedelta = timedelta(seconds=30),
+        on_error: Callable[[Exception], None] = _ignore_error,
+        clock: Callable[[], float] = time.time,
+    ):
+        if batch_size <= 0:
+            raise ValueError("venty.InvalidBatchSize")
+        self._session_factory = session_factory
+        self._channel = channel
+        self._event_type = event_type
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._claim_timeout = claim_timeout
+        self._on_error = on_error
+        self._clock = clock
+
+    def _claim(self, session: Session) -> str:
+        token = uuid4().hex
+        now = self._clock()
+        claimable = and_(
+            OutboxRow.delivered_at.is_(None),
+            or_(OutboxRow.claimed_until.is_(None), OutboxRow.claimed_until < now),
+        )
+        # selected first, as backends such as mysql reject a limited subquery on
+        # the updated table
+        candidates = (
+            session.execute(
+                select(OutboxRow.id)
+                .where(claimable)
+                .order_by(OutboxRow.id)
+                .limit(self._batch_size)
+            )
+            .scalars()
+            .all()
+        )
+        if not candidates:
+            session.commit()
+            return token
+        # the claimable condition is repeated on the updated rows themselves, so a
+        # row claimed concurrently by another relay is skipped
+        session.execute(
+            update(OutboxRow)
+            .where(OutboxRow.id.in_(candidates), claimable)
+            .values(
+                claim_token=token,
+                claimed_until=now + self._claim_timeout.total_seconds(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        return token
+
+    def relay_once(self) -> int:
+        """
+        :return: the amount of events published.
+        """
+        with self._session_factory() as session:
+            token = self._claim(session)
+            claimed = (
+                session.query(RecordedEventRow.event)
+                .join(OutboxRow, OutboxRow.recorded_event_id == RecordedEventRow.id)
+                .filter(OutboxRow.claim_token == token)
+                .order_by(OutboxRow.id)
+                .all()
+            )
+            if not claimed:
+                return 0
+            self._channel.publish(
+                [from_json(self._event_type, event) for event, in claimed]
+            )
+            session.execute(
+                update(OutboxRow)
+                .where(OutboxRow.claim_token == token)
+                .values(delivered_at=self._clock())
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            return len(claimed)
+
+    def run(self, stop: threading.Event) -> None:
+        """
+        Relays batches until `stop` is set, waiting `poll_interval` whenever the
+        outbox is drained or relaying failed.
+        """
+        while not stop.is_set():
+            try:
+                relayed = self.relay_once()
+            except Exception as e:
+                _report_error(self._on_error, e)
+                relayed = 0
+            if relayed < self._batch_size:
+                stop.wait(self._poll_interval.total_seconds())
+
+    def lag(self) -> OutboxLag:
+        with self._session_factory() as session:
+            pending, oldest = (
+                session.query(func.count(OutboxRow.id), func.min(OutboxRow.created_at))
+                .filter(OutboxRow.delivered_at.is_(None))
+                .one()
+            )
+        if oldest is None:
+            return OutboxLag(pending_events=pending, oldest_pending_age=None)
+        return OutboxLag(
+            pending_events=pending,
+            oldest_pending_age=timedelta(seconds=max(self._clock() - oldest, 0)),
+        )
@@ -0,0 +1,223 @@
+import threading
+from collections import Counter
+from datetime import timedelta
+from typing import Iterable
+
+import pytest
+from cloudevents.abstract import CloudEvent as AbstractCloudEvent
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from venty.cloudevent import CloudEvent
+from venty.event_store import StreamState, append_events
+from venty.in_memory_event_channel import InMemoryEventChannel
+from venty.sql_event_store import Base, OutboxRow, SqlEventStore
+from venty.sql_outbox_relay import SqlOutboxRelay
+from venty.strong_types_test import MY_STREAM_NAME, YOUR_STREAM_NAME, dummy_events
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FailingEventChannel(InMemoryEventChannel):
+    def publish(self, events: Iterable[AbstractCloudEvent]) -> None:
+        raise ConnectionError("sink is down")
+
+
+class _LockedEventChannel(InMemoryEventChannel):
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def publish(self, events: Iterable[AbstractCloudEvent]) -> None:
+        with self._lock:
+            super().publish(events)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(engine)
+
+
+@pytest.fixture
+def store(session_factory):
+    return SqlEventStore(session_factory, CloudEvent, outbox=True)
+
+
+def test_store_without_outbox_must_not_write_outbox_rows(session_factory):
+    store = SqlEventStore(session_factory, CloudEvent)
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=dummy_events(3)
+    )
+    with session_factory() as session:
+        assert session.query(OutboxRow).count() == 0
+
+
+def test_relay_must_publish_appended_events_in_commit_order(session_factory, store):
+    events = list(dummy_events(10))
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=events[:5]
+    )
+    append_events(
+        store, YOUR_STREAM_NAME, expected_version=StreamState.ANY, events=events[5:]
+    )
+    channel = InMemoryEventChannel()
+    relay = SqlOutboxRelay(session_factory, channel, CloudEvent, batch_size=4)
+    assert relay.lag().pending_events == 10
+    assert [relay.relay_once() for _ in range(4)] == [4, 4, 2, 0]
+    assert list(channel.published_events) == events
+    assert relay.lag().pending_events == 0
+    assert relay.lag().oldest_pending_age is None
+
+
+def test_lag_must_report_the_age_of_the_oldest_pending_event(session_factory, store):
+    clock = _FakeClock()
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=dummy_events(1)
+    )
+    relay = SqlOutboxRelay(
+        session_factory, InMemoryEventChannel(), CloudEvent, clock=clock
+    )
+    with session_factory() as session:
+        created_at = session.query(OutboxRow.created_at).scalar()
+    clock.now = created_at + 5
+    assert relay.lag().oldest_pending_age == timedelta(seconds=5)
+
+
+def test_failed_batch_must_be_claimed_again_after_claim_timeout(session_factory, store):
+    clock = _FakeClock()
+    events = list(dummy_events(3))
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=events
+    )
+    failing = SqlOutboxRelay(
+        session_factory,
+        _FailingEventChannel(),
+        CloudEvent,
+        claim_timeout=timedelta(seconds=30),
+        clock=clock,
+    )
+    with pytest.raises(ConnectionError):
+        failing.relay_once()
+
+    channel = InMemoryEventChannel()
+    relay = SqlOutboxRelay(session_factory, channel, CloudEvent, clock=clock)
+    assert relay.relay_once() == 0
+    clock.now += 31
+    assert relay.relay_once() == 3
+    assert list(channel.published_events) == events
+
+
+def test_concurrent_relays_must_not_publish_an_event_twice(session_factory, store):
+    events = list(dummy_events(200))
+    for i in range(0, 200, 10):
+        append_events(
+            store,
+            MY_STREAM_NAME,
+            expected_version=StreamState.ANY,
+            events=events[i : i + 10],
+        )
+    channel = _LockedEventChannel()
+    stop = threading.Event()
+    errors = []
+    relays = [
+        SqlOutboxRelay(
+            session_factory,
+            channel,
+            CloudEvent,
+            batch_size=7,
+            poll_interval=timedelta(milliseconds=10),
+            on_error=errors.append,
+        )
+        for _ in range(4)
+    ]
+    threads = [threading.Thread(target=r.run, args=(stop,)) for r in relays]
+    for thread in threads:
+        thread.start()
+    while relays[0].lag().pending_events:
+        stop.wait(0.01)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    published_ids = Counter(e["id"] for e in channel.published_events)
+    assert set(published_ids) == {e["id"] for e in events}
+    assert set(published_ids.values()) == {1}
+
+
+def test_run_must_report_errors_and_keep_running(session_factory, store):
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=dummy_events(1)
+    )
+    stop = threading.Event()
+    errors = []
+
+    def _on_error(e: Exception):
+        errors.append(e)
+        if len(errors) == 2:
+            stop.set()
+
+    SqlOutboxRelay(
+        session_factory,
+        _FailingEventChannel(),
+        CloudEvent,
+        poll_interval=timedelta(0),
+        claim_timeout=timedelta(0),
+        on_error=_on_error,
+    ).run(stop)
+    assert len(errors) == 2
+
+
+def test_raising_error_handler_must_not_stop_the_relay(session_factory, store):
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=dummy_events(1)
+    )
+    stop = threading.Event()
+    errors = []
+
+    def _on_error(e: Exception):
+        errors.append(e)
+        if len(errors) == 2:
+            stop.set()
+        raise RuntimeError("handler is broken")
+
+    SqlOutboxRelay(
+        session_factory,
+        _FailingEventChannel(),
+        CloudEvent,
+        poll_interval=timedelta(0),
+        claim_timeout=timedelta(0),
+        on_error=_on_error,
+    ).run(stop)
+    assert len(errors) == 2
+
+
+def test_claim_must_not_update_from_a_subquery(session_factory, store):
+    append_events(
+        store, MY_STREAM_NAME, expected_version=StreamState.ANY, events=dummy_events(3)
+    )
+    statements = []
+    engine = session_factory.kw["bind"]
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    relay = SqlOutboxRelay(session_factory, InMemoryEventChannel(), CloudEvent)
+    assert relay.relay_once() == 3
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+    assert updates
+    assert not any("SELECT" in s.upper() for s in updates)
+
+
+def test_batch_size_must_be_positive(session_factory):
+    with pytest.raises(ValueError, match="venty.InvalidBatchSize"):
+        SqlOutboxRelay(
+            session_factory, InMemoryEventChannel(), CloudEvent, batch_size=0
+        )
@@ -0,0 +1,149 @@
+import base64
+import os
+import threading
+import time
+from typing import Callable, List
+
+_TIMESTAMP_BITS = 48
+_TIMESTAMP_SHIFT = 128 - _TIMESTAMP_BITS
+_UUID7_RANDOM_BITS = 74
+_ULID_RANDOM_BITS = 80
+_UUID7_VERSION = 0x7 << 76
+_UUID7_VARIANT = 0b10 << 62
+_UUID7_RAND_B = (1 << 62) - 1
+_CROCKFORD = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+)
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class _TimeOrderedIds:
+    """
+    Allocates (milliseconds, counter) pairs which only ever increase.
+    In a new millisecond the counter starts at a random value, within the same
+    millisecond it is incremented. When the clock goes backwards, or the counter
+    overflows, the last millisecond is kept or moved forward by one.
+    """
+
+    def __init__(
+        self,
+        random_bits: int,
+        *,
+        clock_ms: Callable[[], int] = _now_ms,
+        random_bytes: Callable[[int], bytes] = os.urandom,
+    ):
+        self._random_bits = random_bits
+        self._clock_ms = clock_ms
+        self._random_bytes = random_bytes
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def _random_start(self) -> int:
+        # the top bit is left clear, so a millisecond has room for many more ids
+        raw = self._random_bytes((self._random_bits + 7) // 8)
+        return int.from_bytes(raw, "big") & ((1 << (self._random_bits - 1)) - 1)
+
+    def _allocate(self, amount: int) -> List[int]:
+        """
+        :return: `amount` increasing 128 bit values, the milliseconds in the top
+            48 bits and the counter in the lowest `random_bits` bits.
+        """
+        result: List[int] = []
+        limit = 1 << self._random_bits
+        now = self._clock_ms()
+        with self._lock:
+            if now > self._last_ms:
+                self._last_ms = now
+                next_ = self._random_start()
+            else:
+                next_ = self._counter + 1
+            while amount:
+                if next_ >= limit:
+                    self._last_ms += 1
+                    next_ = self._random_start()
+                available = min(amount, limit - next_)
+                first = (self._last_ms << _TIMESTAMP_SHIFT) | next_
+                result.extend(range(first, first + available))
+                next_ += available
+                amount -= available
+            self._counter = next_ - 1
+        return result
+
+
+class Uuid7Selection(_TimeOrderedIds):
+    """
+    UUID version 7 ids (RFC 9562), whose text sorts by creation time.
+    Ids of the same millisecond use the 74 random bits as a counter, so every
+    instance produces strictly increasing ids, also across threads.
+
+    An instance is an id selection algorithm, and its `bulk` method a bulk id
+    selection algorithm.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock_ms: Callable[[], int] = _now_ms,
+        random_bytes: Callable[[int], bytes] = os.urandom,
+    ):
+        super().__init__(
+            _UUID7_RANDOM_BITS, clock_ms=clock_ms, random_bytes=random_bytes
+        )
+
+    def __call__(self) -> str:
+        return self.bulk(1)[0]
+
+    def bulk(self, amount: int) -> List[str]:
+        result = []
+        for value in self._allocate(amount):
+            h = "%032x" % (
+                (value >> _TIMESTAMP_SHIFT << _TIMESTAMP_SHIFT)
+                | _UUID7_VERSION
+                | ((value >> 62) & 0xFFF) << 64
+                | _UUID7_VARIANT
+                | (value & _UUID7_RAND_B)
+            )
+            result.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+        return result
+
+
+class UlidSelection(_TimeOrderedIds):
+    """
+    ULID ids (https://github.com/ulid/spec), 26 characters of Crockford's
+    base32 which sort by creation time.
+    Ids of the same millisecond use the 80 random bits as a counter, so every
+    instance produces strictly increasing ids, also across threads.
+
+    An instance is an id selection algorithm, and its `bulk` method a bulk id
+    selection algorithm.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock_ms: Callable[[], int] = _now_ms,
+        random_bytes: Callable[[int], bytes] = os.urandom,
+    ):
+        super().__init__(
+            _ULID_RANDOM_BITS, clock_ms=clock_ms, random_bytes=random_bytes
+        )
+
+    def __call__(self) -> str:
+        return self.bulk(1)[0]
+
+    def bulk(self, amount: int) -> List[str]:
+        # 26 characters hold 130 bits, left aligned in 20 bytes they encode
+        # as the first 26 of 32 base32 characters
+        raw = b"".join(
+            (value << 30).to_bytes(20, "big") for value in self._allocate(amount)
+        )
+        encoded = base64.b32encode(raw).decode().translate(_CROCKFORD)
+        return [encoded[i : i + 26] for i in range(0, 32 * amount, 32)]
+
+
+uuid7 = Uuid7Selection()
+ulid = UlidSelection()
@@ -0,0 +1,84 @@
+import threading
+from typing import List
+from uuid import RFC_4122, UUID
+
+from venty.event_producer import SimpleEventProducer
+from venty.event_producer_test import MyType
+from venty.time_ordered_ids import UlidSelection, Uuid7Selection, ulid, uuid7
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _clock(*values: int):
+    ticks = iter(values)
+    return lambda: next(ticks)
+
+
+def _ulid_value(id_: str) -> int:
+    result = 0
+    for character in id_:
+        result = result * 32 + _CROCKFORD.index(character)
+    return result
+
+
+def test_uuid7_must_be_a_valid_uuid_with_the_millisecond_timestamp():
+    ids = Uuid7Selection(clock_ms=_clock(1_700_000_000_123)).bulk(3)
+    for id_ in ids:
+        parsed = UUID(id_)
+        assert str(parsed) == id_
+        assert parsed.version == 7
+        assert parsed.variant == RFC_4122
+        assert parsed.int >> 80 == 1_700_000_000_123
+
+
+def test_ulid_must_be_crockford_base32_with_the_millisecond_timestamp():
+    ids = UlidSelection(clock_ms=_clock(1_700_000_000_123)).bulk(3)
+    for id_ in ids:
+        assert len(id_) == 26
+        assert set(id_) <= set(_CROCKFORD)
+        assert _ulid_value(id_) >> 80 == 1_700_000_000_123
+
+
+def test_ids_must_increase_within_a_millisecond_and_when_the_clock_goes_back():
+    for selection in (
+        Uuid7Selection(clock_ms=_clock(5, 5, 5, 4, 6)),
+        UlidSelection(clock_ms=_clock(5, 5, 5, 4, 6)),
+    ):
+        ids = [selection(), selection()] + selection.bulk(10) + [selection()]
+        ids += selection.bulk(2)
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+
+def test_counter_overflow_must_move_to_the_next_millisecond():
+    selection = UlidSelection(clock_ms=lambda: 5)
+    # as if the millisecond already used almost all of its counter
+    selection._last_ms, selection._counter = 5, (1 << 80) - 2
+    ids = selection.bulk(3)
+    assert ids == sorted(ids)
+    assert [_ulid_value(id_) >> 80 for id_ in ids] == [5, 6, 6]
+
+
+def test_ids_must_be_unique_across_threads():
+    results: List[List[str]] = [[] for _ in range(8)]
+
+    def _generate(i: int):
+        for _ in range(200):
+            results[i].append(uuid7())
+            results[i].extend(ulid.bulk(3))
+
+    threads = [threading.Thread(target=_generate, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id_ for ids in results for id_ in ids}) == 8 * 200 * 4
+    for ids in results:
+        assert [i for i in ids if "-" in i] == sorted(i for i in ids if "-" in i)
+
+
+def test_event_producer_must_use_the_bulk_selection():
+    producer = SimpleEventProducer(id_selection_algorithm=Uuid7Selection())
+    events = producer.produce_events(MyType, range(5))
+    assert [e.id for e in events] == sorted(e.id for e in events)
+    assert all(UUID(e.id).version == 7 for e in events)
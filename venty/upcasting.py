@@ -0,0 +1,218 @@
+import threading
+from dataclasses import replace
+from datetime import timedelta
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import pydantic_core
+from cloudevents.abstract import CloudEvent
+from pydantic import BaseModel
+
+from venty.cloudevent import CloudEvent as PydanticCloudEvent
+from venty.cloudevent import from_structured_dict, structured_dict
+from venty.event_store import (
+    AppendRequest,
+    EventStore,
+    ExpectedVersion,
+    ReadInstruction,
+    RecordedEvent,
+    StreamState,
+)
+from venty.strong_types import CommitPosition, StreamName, StreamVersion
+
+SCHEMA_VERSION_EXTENSION = "schemaversion"
+INITIAL_SCHEMA_VERSION = 1
+
+# changes a structured content mode dict of one schema version to the next one
+Upcaster = Callable[[Dict[str, Any]], Dict[str, Any]]
+_Chain = Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+
+def _compile(steps: List[Upcaster], version: int) -> _Chain:
+    def _chain(value: Mapping[str, Any]) -> Dict[str, Any]:
+        result = dict(value)
+        for i, step in enumerate(steps):
+            result = step(result)
+            result[SCHEMA_VERSION_EXTENSION] = version + i + 1
+        return result
+
+    return _chain
+
+
+def _event_type_and_version(event: CloudEvent) -> Tuple[str, Any]:
+    if isinstance(event, BaseModel):
+        # item access of pydantic events builds all of their attributes
+        extra = event.__pydantic_extra__ or {}
+        return event.type, extra.get(SCHEMA_VERSION_EXTENSION)
+    return event["type"], event.get(SCHEMA_VERSION_EXTENSION)
+
+
+class UpcasterRegistry:
+    """
+    Upcasters by the event type and the schema version they upgrade from, which
+    events carry in their `schemaversion` extension, 1 when they have none.
+
+    Upcasting an event applies every upcaster from its version to the latest
+    one, chained into a single function the first time that version is read.
+    Upcasters work on the structured content mode dict of the event, before an
+    event is constructed from it. They may change the dict they receive, but
+    must not change its data in place, which may be shared with stored events.
+    """
+
+    def __init__(self):
+        self._upcasters: Dict[str, Dict[int, Upcaster]] = {}
+        self._chains: Dict[Tuple[str, int], Optional[_Chain]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self, type_: str, version: int, upcaster: Optional[Upcaster] = None
+    ) -> Any:
+        """
+        Registers the upcaster of `type_` events from `version` to `version + 1`.
+        Without an upcaster, returns a decorator registering the function it
+        decorates.
+        """
+        if upcaster is None:
+            return partial(self.register, type_, version)
+        if version < INITIAL_SCHEMA_VERSION:
+            raise ValueError("venty.InvalidSchemaVersion")
+        with self._lock:
+            if (
+                self._upcasters.setdefault(type_, {}).setdefault(version, upcaster)
+                is not upcaster
+            ):
+                raise ValueError("venty.DuplicateUpcaster")
+            self._chains = {}
+        return upcaster
+
+    def latest_version(self, type_: str) -> int:
+        versions = self._upcasters.get(type_)
+        if not versions:
+            return INITIAL_SCHEMA_VERSION
+        return max(versions) + 1
+
+    def _chain(self, type_: str, version: Any) -> Optional[_Chain]:
+        """
+        :return: None when the version needs no upcasting.
+        """
+        version = INITIAL_SCHEMA_VERSION if version is None else int(version)
+        chains = self._chains
+        key = (type_, version)
+        if key not in chains:
+            upcasters = self._upcasters[type_]
+            steps = []
+            while (step := upcasters.get(version + len(steps))) is not None:
+                steps.append(step)
+            chains[key] = _compile(steps, version) if steps else None
+        return chains[key]
+
+    def upcast_dict(self, value: Mapping[str, Any]) -> Mapping[str, Any]:
+        """
+        :return: the value itself when it needs no upcasting.
+        """
+        type_ = value.get("type")
+        if type_ not in self._upcasters:
+            return value
+        chain = self._chain(type_, value.get(SCHEMA_VERSION_EXTENSION))
+        return value if chain is None else chain(value)
+
+    def upcast(self, event: CloudEvent) -> CloudEvent:
+        """
+        :return: the event itself when it needs no upcasting, else a new event of
+            the same class.
+        """
+        type_, version = _event_type_and_version(event)
+        if type_ not in self._upcasters:
+            return event
+        chain = self._chain(type_, version)
+        if chain is None:
+            return event
+        return from_structured_dict(type(event), chain(structured_dict(event)))
+
+    def decoder(
+        self,
+        from_dict: Callable[[Mapping[str, Any]], CloudEvent] = partial(
+            from_structured_dict, PydanticCloudEvent
+        ),
+    ) -> Callable[[Union[str, bytes]], CloudEvent]:
+        """
+        Decodes structured content mode json, upcasting it before constructing
+        the event, for example as the `event_decoder` of a `SqlEventStore`.
+
+        :param from_dict: constructs the upcast event, such as
+            `EventTypeRegistry.from_dict`.
+        """
+
+        def _decode(value: Union[str, bytes]) -> CloudEvent:
+            return from_dict(self.upcast_dict(pydantic_core.from_json(value)))
+
+        return _decode
+
+
+class UpcastingEventStore(EventStore):
+    """
+    Upcasts the events read from the wrapped event store as they are iterated.
+    Appends go to the wrapped event store as they are.
+    """
+
+    def __init__(self, event_store: EventStore, upcasters: UpcasterRegistry):
+        self._event_store = event_store
+        self._upcasters = upcasters
+
+    def attempt_append_events(
+        self,
+        stream_name: StreamName,
+        *,
+        expected_version: ExpectedVersion,
+        events: Iterable[CloudEvent],
+        timeout: Optional[timedelta] = None,
+    ) -> Optional[CommitPosition]:
+        return self._event_store.attempt_append_events(
+            stream_name,
+            expected_version=expected_version,
+            events=events,
+            timeout=timeout,
+        )
+
+    def attempt_append_batch(
+        self,
+        requests: Sequence[AppendRequest],
+        *,
+        timeout: Optional[timedelta] = None,
+    ) -> List[Optional[CommitPosition]]:
+        return self._event_store.attempt_append_batch(requests, timeout=timeout)
+
+    def read_streams(
+        self,
+        instructions: Dict[StreamName, ReadInstruction],
+        *,
+        backwards: bool = False,
+        timeout: Optional[timedelta] = None,
+    ) -> Iterable[RecordedEvent]:
+        for recorded in self._event_store.read_streams(
+            instructions, backwards=backwards, timeout=timeout
+        ):
+            event = self._upcasters.upcast(recorded.event)
+            yield (
+                recorded if event is recorded.event else replace(recorded, event=event)
+            )
+
+    def commit_position(self) -> CommitPosition:
+        return self._event_store.commit_position()
+
+    def current_version(
+        self, stream_name: StreamName, *, timeout: Optional[timedelta] = None
+    ) -> Optional[Union[StreamVersion, Literal[StreamState.NO_STREAM]]]:
+        return self._event_store.current_version(stream_name, timeout=timeout)
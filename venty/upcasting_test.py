@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Literal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from venty.classification import EventTypeRegistry
+from venty.cloudevent import CloudEvent, dump_structured_json
+from venty.event_store import StreamState, append_events, read_stream_no_metadata
+from venty.in_memory_event_store import InMemoryEventStore
+from venty.sql_event_store import Base, SqlEventStore
+from venty.strong_types_test import MY_STREAM_NAME
+from venty.upcasting import UpcasterRegistry, UpcastingEventStore
+
+
+class OrderCreated(CloudEvent):
+    type: Literal["order.created"] = "order.created"
+    data: Dict[str, Any]
+
+
+def _registry(calls: List[str]) -> UpcasterRegistry:
+    result = UpcasterRegistry()
+
+    @result.register("order.created", 1)
+    def _rename_amount(value: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append("v1")
+        data = dict(value["data"])
+        data["total"] = data.pop("amount")
+        return {**value, "data": data}
+
+    @result.register("order.created", 2)
+    def _add_currency(value: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append("v2")
+        value["data"] = {**value["data"], "currency": "EUR"}
+        return value
+
+    return result
+
+
+def _order(data: Dict[str, Any], **attributes: Any) -> CloudEvent:
+    return CloudEvent.create(
+        {"type": "order.created", "source": "orders", **attributes}, data
+    )
+
+
+def test_upcast_must_chain_from_the_event_version_to_the_latest():
+    calls: List[str] = []
+    upcasters = _registry(calls)
+    assert upcasters.latest_version("order.created") == 3
+    v1 = _order({"amount": 10})
+    v2 = _order({"total": 10}, schemaversion=2)
+    v3 = _order({"total": 10, "currency": "USD"}, schemaversion=3)
+    assert upcasters.upcast(v1).data == {"total": 10, "currency": "EUR"}
+    assert upcasters.upcast(v1)["schemaversion"] == 3
+    assert upcasters.upcast(v2).data == {"total": 10, "currency": "EUR"}
+    assert calls == ["v1", "v2", "v1", "v2", "v2"]
+    assert upcasters.upcast(v3) is v3
+    assert v1.data == {"amount": 10}
+
+
+def test_events_of_other_types_must_not_be_upcast():
+    upcasters = _registry([])
+    other = CloudEvent.create({"type": "order.paid", "source": "orders"}, {"a": 1})
+    assert upcasters.upcast(other) is other
+    value = {"type": "order.paid", "data": {}}
+    assert upcasters.upcast_dict(value) is value
+
+
+def test_schema_version_may_be_a_string():
+    upcasters = _registry([])
+    assert upcasters.upcast(_order({"total": 1}, schemaversion="2")).data == {
+        "total": 1,
+        "currency": "EUR",
+    }
+
+
+def test_upcasting_event_store_must_upcast_lazily_on_read():
+    calls: List[str] = []
+    store = UpcastingEventStore(InMemoryEventStore(), _registry(calls))
+    append_events(
+        store,
+        MY_STREAM_NAME,
+        expected_version=StreamState.ANY,
+        events=[_order({"amount": 1}), _order({"total": 2}, schemaversion=3)],
+    )
+    read = iter(read_stream_no_metadata(store, MY_STREAM_NAME, stream_position=None))
+    assert calls == []
+    assert next(read).data == {"total": 1, "currency": "EUR"}
+    assert next(read).data == {"total": 2}
+    assert calls == ["v1", "v2"]
+
+
+def test_decoder_must_upcast_before_constructing_the_event():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    decoder = _registry([]).decoder(EventTypeRegistry([OrderCreated]).from_dict)
+    store = SqlEventStore(sessionmaker(engine), CloudEvent, event_decoder=decoder)
+    append_events(
+        store,
+        MY_STREAM_NAME,
+        expected_version=StreamState.ANY,
+        events=[_order({"amount": 1})],
+    )
+    (event,) = read_stream_no_metadata(store, MY_STREAM_NAME, stream_position=None)
+    assert isinstance(event, OrderCreated)
+    assert event.data == {"total": 1, "currency": "EUR"}
+    assert decoder(dump_structured_json(event)) == event
+
+
+def test_upcasters_must_not_be_registered_twice():
+    upcasters = _registry([])
+    with pytest.raises(ValueError, match="venty.DuplicateUpcaster"):
+        upcasters.register("order.created", 1, lambda value: value)
+    with pytest.raises(ValueError, match="venty.InvalidSchemaVersion"):
+        upcasters.register("order.created", 0, lambda value: value)